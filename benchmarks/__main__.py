@@ -0,0 +1,40 @@
+"""
+Command-line entry point for the benchmark suite.
+
+    python -m benchmarks run [-k KEYWORD] [--rounds N]
+    python -m benchmarks compare [--threshold PERCENT] [--baseline INDEX]
+"""
+import argparse
+import sys
+
+from benchmarks import harness
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="PyQt6ify Pro benchmarks")
+    parser.add_argument('--history', default=harness.DEFAULT_HISTORY_FILE, help="JSON history file")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Run benchmarks and append results to the history")
+    run_parser.add_argument('-k', '--keyword', help="Only run benchmarks whose name contains KEYWORD")
+    run_parser.add_argument('--rounds', type=int, default=20, help="Timed rounds per benchmark")
+    run_parser.add_argument('--log', action='store_true', help="Keep application INFO logging enabled")
+
+    compare_parser = subparsers.add_parser('compare', help="Compare two runs and flag regressions")
+    compare_parser.add_argument('--threshold', type=float, default=harness.DEFAULT_THRESHOLD_PERCENT,
+                                help="Median slowdown in percent treated as a regression")
+    compare_parser.add_argument('--baseline', type=int, default=-2,
+                                help="History index of the baseline run (default: previous run)")
+    compare_parser.add_argument('--current', type=int, default=-1,
+                                help="History index of the run to check (default: latest run)")
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        harness.run(args.keyword, rounds=args.rounds, history_file=args.history, quiet_logging=not args.log)
+        return 0
+    regressions = harness.compare(args.history, args.threshold, args.baseline, args.current)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
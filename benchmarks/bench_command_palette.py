@@ -0,0 +1,107 @@
+"""Per-keystroke search latency of the command palette index."""
+import random
+
+from benchmarks.harness import parametrize
+
+WORDS = ['open', 'save', 'recent', 'theme', 'dark', 'light', 'window', 'panel', 'toggle', 'export',
+         'import', 'format', 'select', 'line', 'search', 'replace', 'settings', 'logging', 'level',
+         'file', 'folder', 'project', 'reload', 'preview', 'split', 'editor', 'terminal', 'debug']
+
+# Queries typed one character at a time, so every keystroke is a search
+TYPED_QUERIES = ['theme dark', 'save', 'tgl', 'logging level', 'xyz']
+
+
+def _is_subsequence(chars, text):
+    """Whether chars appear in text in order."""
+    remaining = iter(text)
+    return all(char in remaining for char in chars)
+
+
+def _brute_force_search(entries, query, limit):
+    """Rank every entry by its best tier (see query_tiers) without an index."""
+    from modules.command_palette import normalize_query, word_initials, word_suffixes
+    query = normalize_query(query)
+    chars = query.replace(' ', '')
+    ranked = []
+    for entry in entries:
+        label = normalize_query(entry.label)
+        tiers = [
+            label.startswith(query),
+            any(suffix.startswith(query) for suffix in word_suffixes(label)),
+            query in label,
+            _is_subsequence(chars, word_initials(label)),
+            _is_subsequence(chars, label),
+            _is_subsequence(chars, normalize_query(f'{entry.category} {entry.detail}')),
+        ]
+        if any(tiers):
+            ranked.append((tiers.index(True), label, entry.id))
+    return [entry_id for _, _, entry_id in sorted(ranked)[:limit]]
+
+
+def _synthetic_index(entry_count):
+    """Build a search index with entry_count entries made of random words."""
+    from modules.command_palette import PaletteEntry, SearchIndex
+    rng = random.Random(entry_count)
+    index = SearchIndex()
+    for number in range(entry_count):
+        label = ' '.join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(2, 4)))
+        index.add(PaletteEntry(id=f'action:{number}', label=f'{label} {number}', category='Action',
+                               detail=f'Ctrl+Shift+{number % 10}'))
+    return index
+
+
+@parametrize('entry_count', [100, 1000, 5000])
+def bench_palette_keystroke(benchmark, entry_count):
+    """Time typing a few queries; reports the mean time per keystroke."""
+    index = _synthetic_index(entry_count)
+    keystrokes = sum(len(query) for query in TYPED_QUERIES)
+
+    def type_queries():
+        for query in TYPED_QUERIES:
+            for length in range(1, len(query) + 1):
+                index.search(query[:length])
+
+    benchmark(type_queries)
+    benchmark.extra_info['keystrokes'] = keystrokes
+    benchmark.extra_info['ms_per_keystroke'] = benchmark.stats['median'] / keystrokes
+
+
+@parametrize('limit', [5, 50])
+def bench_palette_ranking(benchmark, limit):
+    """
+    Type random queries into a 1000-entry index, checking every keystroke's
+    results against a brute-force ranking of all entries.
+    """
+    index = _synthetic_index(1000)
+    entries = [index.get(entry_id) for entry_id in index.ids()]
+    rng = random.Random(limit)
+    queries = [' '.join(rng.choice(WORDS)[:rng.randint(1, 4)] for _ in range(rng.randint(1, 2)))
+               for _ in range(60)]
+
+    for query in queries:
+        for length in range(1, len(query) + 1):
+            found = [entry.id for entry in index.search(query[:length], limit=limit)]
+            expected = _brute_force_search(entries, query[:length], limit)
+            assert found == expected, f"search({query[:length]!r}, limit={limit}) returned {found}, expected {expected}"
+
+    def type_queries():
+        for query in queries:
+            for length in range(1, len(query) + 1):
+                index.search(query[:length], limit=limit)
+
+    benchmark(type_queries)
+
+
+@parametrize('entry_count', [1000, 5000])
+def bench_palette_add_entry(benchmark, entry_count):
+    """Adding an entry followed by a search, as when a theme is installed."""
+    from modules.command_palette import PaletteEntry
+    index = _synthetic_index(entry_count)
+    index.search('theme')
+    counter = iter(range(10 ** 9))
+
+    def add_and_search():
+        index.add(PaletteEntry(id=f'theme:new_{next(counter)}', label='Theme: New Theme', category='Theme'))
+        return index.search('new theme')
+
+    benchmark(add_and_search)
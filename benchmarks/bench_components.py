@@ -0,0 +1,113 @@
+"""Build time of the menu bar, the toolbar and the Settings dialog."""
+import json
+import os
+import shutil
+import tempfile
+
+from PyQt6.QtWidgets import QMainWindow
+
+from benchmarks.harness import REPO_ROOT, get_app, parametrize, process_events
+
+
+def _make_window():
+    window = QMainWindow()
+    window.app = get_app()
+    return window
+
+
+def _dispose(window):
+    window.deleteLater()
+    process_events()
+
+
+def bench_create_menu(benchmark):
+    from config.app_config import Config
+    from modules import menu
+    config = Config()
+
+    def build():
+        window = _make_window()
+        menu.create_menu(window, config)
+        return window
+
+    benchmark.pedantic(build, teardown=_dispose, rounds=benchmark.rounds, warmup_rounds=2)
+
+
+def bench_create_toolbar(benchmark):
+    from modules import toolbar
+
+    def build():
+        window = _make_window()
+        toolbar.create_toolbar(window)
+        return window
+
+    benchmark.pedantic(build, teardown=_dispose, rounds=benchmark.rounds, warmup_rounds=2)
+
+
+def _synthetic_theme_index(theme_count):
+    """Build a theme index over a temporary directory holding theme_count copies of a theme."""
+    from modules.theme_index import ThemeIndex
+    styles_dir = tempfile.mkdtemp(prefix='pyqt6ify-themes-')
+    with open(os.path.join(REPO_ROOT, 'resources', 'styles', 'light_theme.json')) as file:
+        theme = json.load(file)
+    for number in range(theme_count):
+        with open(os.path.join(styles_dir, f'theme_{number:04d}.json'), 'w') as file:
+            json.dump(dict(theme, name=f'Theme {number}'), file)
+    index = ThemeIndex(styles_path=styles_dir, manifest_file=os.path.join(styles_dir, 'manifest.json'))
+    index.refresh()
+    return index, styles_dir
+
+
+@parametrize('theme_count', [10, 100, 1000])
+def bench_create_menu_theme_count(benchmark, theme_count):
+    """Menu build time should not grow with the number of installed themes."""
+    from config.app_config import Config
+    from modules import menu, theme_index
+    config = Config()
+    index, styles_dir = _synthetic_theme_index(theme_count)
+    original_index, theme_index.index = theme_index.index, index
+
+    def build():
+        window = _make_window()
+        menu.create_menu(window, config)
+        return window
+
+    try:
+        benchmark.pedantic(build, teardown=_dispose, rounds=benchmark.rounds, warmup_rounds=2)
+    finally:
+        theme_index.index = original_index
+        shutil.rmtree(styles_dir, ignore_errors=True)
+
+
+def bench_create_menu_and_toolbar(benchmark):
+    from config.app_config import Config
+    from modules import menu, toolbar
+    config = Config()
+
+    def build():
+        window = _make_window()
+        menu.create_menu(window, config)
+        toolbar.create_toolbar(window)
+        return window
+
+    def dispose(window):
+        benchmark.extra_info['shared_actions'] = window.action_registry.created_count()
+        _dispose(window)
+
+    benchmark.pedantic(build, teardown=dispose, rounds=benchmark.rounds, warmup_rounds=2)
+
+
+def bench_settings_dialog_open(benchmark):
+    from config.settings_dialog import SettingsDialog
+    get_app()
+
+    def open_dialog():
+        dialog = SettingsDialog()
+        dialog.show()
+        return dialog
+
+    def close(dialog):
+        dialog.close()
+        _dispose(dialog)
+
+    benchmark.pedantic(open_dialog, teardown=close, rounds=benchmark.rounds, warmup_rounds=1)
@@ -0,0 +1,51 @@
+"""Cost of reading settings: configparser strings parsed per call versus the typed snapshot."""
+import configparser
+
+from benchmarks.harness import parametrize
+
+READS = 10000
+
+
+def _parser():
+    import config.settings as app_settings
+    parser = configparser.ConfigParser()
+    parser['APP'] = app_settings.app_defaults
+    parser['LOGGING'] = app_settings.logging_defaults
+    parser['DATABASE'] = app_settings.database_defaults
+    return parser
+
+
+@parametrize('source', ['configparser', 'snapshot'])
+def bench_config_read(benchmark, source):
+    """Read the window settings the way MainWindow.init_ui does, READS times."""
+    import config.settings as app_settings
+    from config.schema import parse_settings
+    parser = _parser()
+    settings = parse_settings(parser, app_settings)
+
+    def read_configparser():
+        for _ in range(READS):
+            int(parser.get('APP', 'screen_width', fallback=800))
+            int(parser.get('APP', 'screen_height', fallback=600))
+            parser.get('APP', 'start_maximized', fallback='True') == 'True'
+            parser.get('APP', 'dark_mode', fallback='False') == 'True'
+
+    def read_snapshot():
+        for _ in range(READS):
+            app = settings.app
+            app.screen_width
+            app.screen_height
+            app.start_maximized
+            app.dark_mode
+
+    benchmark(read_configparser if source == 'configparser' else read_snapshot)
+    benchmark.extra_info['ns_per_read'] = benchmark.stats['median'] * 1e6 / (READS * 4)
+
+
+def bench_config_parse(benchmark):
+    """Parse and validate every section into a snapshot (done once per load or reload)."""
+    import config.settings as app_settings
+    from config.schema import diff_settings, parse_settings
+    parser = _parser()
+    previous = parse_settings(parser, app_settings)
+    benchmark(lambda: diff_settings(previous, parse_settings(parser, app_settings)))
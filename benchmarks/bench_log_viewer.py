@@ -0,0 +1,52 @@
+"""Line indexing and level filtering of a large log file for the log viewer."""
+import os
+import shutil
+import tempfile
+
+LINE_COUNT = 1_000_000
+LEVELS = ['DEBUG', 'INFO', 'INFO', 'INFO', 'WARNING', 'ERROR']
+
+
+def _write_log(path):
+    with open(path, 'w') as log:
+        for number in range(LINE_COUNT):
+            log.write(f"2024-01-01 12:00:00,000 - root - {LEVELS[number % len(LEVELS)]} - "
+                      f"Status bar updated with message: 'Progress {number}' [in status_bar.py:118]\n")
+            if number % 1000 == 0:
+                log.write("Traceback (most recent call last):\n  File \"main.py\", line 1, in <module>\n")
+
+
+def _index_file(path):
+    from modules.log_viewer import INDEX_CHUNK_BYTES, _map_file, index_lines
+    levels = bytearray()
+    with _map_file(path) as buffer:
+        position, previous_level = 0, 0
+        while position < len(buffer):
+            _, chunk_levels, position = index_lines(
+                buffer, position, min(len(buffer), position + INDEX_CHUNK_BYTES), previous_level)
+            if not chunk_levels:
+                break
+            levels.extend(chunk_levels)
+            previous_level = chunk_levels[-1]
+    return levels
+
+
+def bench_log_viewer_index(benchmark):
+    """Full line index of a 1M-line log (runs on a worker thread in the viewer)."""
+    log_dir = tempfile.mkdtemp(prefix='pyqt6ify-logs-')
+    path = os.path.join(log_dir, 'app.log')
+    try:
+        _write_log(path)
+        levels = benchmark.pedantic(_index_file, args=(path,), rounds=min(benchmark.rounds, 3))
+        benchmark.extra_info['lines'] = len(levels)
+        benchmark.extra_info['mb'] = round(os.path.getsize(path) / 1e6, 1)
+    finally:
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+
+def bench_log_viewer_level_filter(benchmark):
+    """Rows shown at WARNING and above for a 1M-line log (runs on the GUI thread)."""
+    from modules.log_viewer import rows_at_level
+    levels = bytearray(([1, 2, 2, 2, 3, 4] * (LINE_COUNT // 6 + 1))[:LINE_COUNT])
+    rows = benchmark(rows_at_level, levels, 3)
+    benchmark.extra_info['rows'] = len(rows)
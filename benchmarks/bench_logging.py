@@ -0,0 +1,150 @@
+"""Per-call cost of logging.info on the calling (GUI) thread, synchronous versus async."""
+import logging
+import os
+import shutil
+import tempfile
+from logging.handlers import RotatingFileHandler
+
+from benchmarks.harness import parametrize
+
+CALLS = 2000
+
+
+def _log_status_messages():
+    for number in range(CALLS):
+        logging.info("Status bar updated with message: '%s'", number)
+
+
+def _run_logging(benchmark, async_mode, overflow='block', log_format='text', log_calls=_log_status_messages,
+                 log_filter=None):
+    from modules import error_handling
+    log_dir = tempfile.mkdtemp(prefix='pyqt6ify-logs-')
+    file_handler = RotatingFileHandler(os.path.join(log_dir, 'app.log'), maxBytes=1024 * 1024, backupCount=3)
+    file_handler.setFormatter(error_handling.JsonFormatter() if log_format == 'json' else error_handling.TextFormatter())
+
+    # The harness disables INFO logging while timing; re-enable it on a clean root logger,
+    # without the handlers and filters (e.g. LogSuppressionFilter) an earlier Config() installed
+    was_async = error_handling.async_logging_stats() is not None
+    error_handling.disable_async_logging()
+    root = logging.getLogger()
+    saved_handlers, saved_filters = list(root.handlers), list(root.filters)
+    saved_level, saved_disable = root.level, root.manager.disable
+    for handler in saved_handlers:
+        root.removeHandler(handler)
+    for saved_filter in saved_filters:
+        root.removeFilter(saved_filter)
+    root.addHandler(file_handler)
+    if log_filter is not None:
+        root.addFilter(log_filter)
+    root.setLevel(logging.INFO)
+    logging.disable(logging.NOTSET)
+    if async_mode:
+        error_handling.enable_async_logging(overflow=overflow)
+
+    try:
+        benchmark.pedantic(log_calls, rounds=benchmark.rounds, warmup_rounds=1)
+        benchmark.extra_info['us_per_call'] = benchmark.stats['median'] * 1000 / CALLS
+        if async_mode:
+            benchmark.extra_info.update(error_handling.async_logging_stats())
+    finally:
+        error_handling.disable_async_logging()
+        root.removeHandler(file_handler)
+        if log_filter is not None:
+            root.removeFilter(log_filter)
+        file_handler.close()
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        for saved_filter in saved_filters:
+            root.addFilter(saved_filter)
+        root.setLevel(saved_level)
+        logging.disable(saved_disable)
+        if was_async:
+            error_handling.enable_async_logging()
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+
+def bench_logging_sync(benchmark):
+    _run_logging(benchmark, async_mode=False)
+
+
+@parametrize('overflow', ['block', 'drop_oldest', 'sample'])
+def bench_logging_async(benchmark, overflow):
+    _run_logging(benchmark, async_mode=True, overflow=overflow)
+
+
+def _log_repeated_error():
+    for _ in range(CALLS):
+        logging.error("Failed to apply theme: resources/styles/broken.json")
+
+
+@parametrize('suppression', ['off', 'on'])
+def bench_logging_repeated_error(benchmark, suppression):
+    """The same error logged on every click, with and without the LogSuppressionFilter."""
+    from modules.error_handling import LogSuppressionFilter
+    log_filter = None
+    if suppression == 'on':
+        log_filter = LogSuppressionFilter(dedup_window_s=10, rate_limit_per_s=20, rate_limit_burst=100,
+                                          sample_threshold=200)
+    _run_logging(benchmark, async_mode=False, log_calls=_log_repeated_error, log_filter=log_filter)
+    if log_filter is not None:
+        benchmark.extra_info.update(log_filter.stats())
+
+
+def _log_theme_metrics():
+    from modules.error_handling import log_info
+    for number in range(CALLS):
+        log_info("Theme applied", theme='dark', duration_ms=number / 10)
+
+
+@parametrize('log_format', ['text', 'json'])
+def bench_logging_structured(benchmark, log_format):
+    """log_info with structured fields, written synchronously as text or NDJSON."""
+    _run_logging(benchmark, async_mode=False, log_format=log_format, log_calls=_log_theme_metrics)
+
+
+def bench_logging_disabled_fields(benchmark):
+    """log_debug with structured fields while DEBUG is disabled: no record or message is built."""
+    from modules.error_handling import log_debug
+
+    def log_calls():
+        for number in range(CALLS):
+            log_debug("Menu action %s triggered", number, action='file.open', duration_ms=0.1)
+
+    benchmark(log_calls)
+    benchmark.extra_info['us_per_call'] = benchmark.stats['median'] * 1000 / CALLS
+
+
+ROLLOVER_LOG_BYTES = 5 * 1024 * 1024
+
+
+def _inline_gzip_rotator(source, dest):
+    """Rotator compressing on the logging thread, the alternative to background compression."""
+    from modules.log_rotation import compress_file
+    os.replace(source, dest)
+    compress_file(dest, 'gzip')
+
+
+@parametrize('mode', ['background_gzip', 'inline_gzip'])
+def bench_log_rollover(benchmark, mode):
+    """Time spent on the logging thread rotating a 5 MB log file."""
+    from modules.log_rotation import CompressingRotatingFileHandler
+    log_dir = tempfile.mkdtemp(prefix='pyqt6ify-logs-')
+    log_file = os.path.join(log_dir, 'app.log')
+    line = "2024-01-01 12:00:00,000 - root - INFO - Status bar updated with message: 'Progress' [in menu.py:1]\n"
+    if mode == 'background_gzip':
+        handler = CompressingRotatingFileHandler(log_file, max_bytes=ROLLOVER_LOG_BYTES, backup_count=3)
+    else:
+        handler = RotatingFileHandler(log_file, maxBytes=ROLLOVER_LOG_BYTES, backupCount=3)
+        handler.rotator = _inline_gzip_rotator
+
+    def fill_log():
+        if mode == 'background_gzip':
+            handler.wait_idle()
+        handler.stream.write(line * (ROLLOVER_LOG_BYTES // len(line)))
+        handler.stream.flush()
+
+    try:
+        benchmark.pedantic(handler.doRollover, setup=fill_log, rounds=min(benchmark.rounds, 5))
+    finally:
+        handler.close()
+        shutil.rmtree(log_dir, ignore_errors=True)
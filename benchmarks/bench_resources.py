@@ -0,0 +1,69 @@
+"""Cold start with resources read from the packed bundle versus individual files."""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.harness import REPO_ROOT
+
+# Counts read syscalls from /proc/self/io (Linux) and Python-level file opens
+# via an audit hook while the main window is built.
+COLD_START_SCRIPT = """
+import json, logging, os, sys, time
+opens = [0]
+sys.addaudithook(lambda event, args: event == 'open' and opens.__setitem__(0, opens[0] + 1))
+
+def read_syscalls():
+    try:
+        with open('/proc/self/io') as io:
+            return int(next(line for line in io if line.startswith('syscr')).split()[1])
+    except OSError:
+        return 0
+
+start_ns = time.perf_counter_ns()
+start_syscalls, start_opens = read_syscalls(), opens[0]
+from PyQt6.QtWidgets import QApplication
+import main
+logging.disable(logging.INFO)
+app = QApplication([])
+window = main.MainWindow(main.Config(), app)
+window.startup.run_until_complete()
+elapsed_ms = (time.perf_counter_ns() - start_ns) / 1e6
+print(json.dumps({'elapsed_ms': elapsed_ms, 'read_syscalls': read_syscalls() - start_syscalls,
+                  'file_opens': opens[0] - start_opens}))
+"""
+
+_bundle_file = None
+
+
+def _bundle():
+    """Build a bundle in a temporary directory for the benchmark run."""
+    global _bundle_file
+    if _bundle_file is None:
+        from modules import resources
+        _bundle_file = os.path.join(tempfile.mkdtemp(prefix='pyqt6ify-bench-'), 'resources.pak')
+        resources.build_bundle(_bundle_file)
+    return _bundle_file
+
+
+def _cold_start(benchmark, mode, rounds=5):
+    env = dict(os.environ, PYQT6IFY_RESOURCES=mode, PYQT6IFY_BUNDLE=_bundle())
+    runs = []
+    for _ in range(rounds):
+        result = subprocess.run([sys.executable, '-c', COLD_START_SCRIPT], cwd=REPO_ROOT, env=env,
+                                capture_output=True, text=True, check=True)
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    benchmark.record([run['elapsed_ms'] for run in runs])
+    benchmark.extra_info['read_syscalls'] = min(run['read_syscalls'] for run in runs)
+    benchmark.extra_info['file_opens'] = min(run['file_opens'] for run in runs)
+    print(f"  {mode}: {benchmark.extra_info['read_syscalls']} read syscalls, "
+          f"{benchmark.extra_info['file_opens']} Python file opens")
+
+
+def bench_cold_start_filesystem(benchmark):
+    _cold_start(benchmark, 'fs')
+
+
+def bench_cold_start_bundle(benchmark):
+    _cold_start(benchmark, 'bundle')
@@ -0,0 +1,81 @@
+"""Cold and warm construction of the MainWindow."""
+import json
+import subprocess
+import sys
+
+from benchmarks.harness import REPO_ROOT, get_app, process_events
+
+# Run in a fresh interpreter so imports, Qt plugin loading and first-use
+# caches are all included in the measurement.
+COLD_START_SCRIPT = """
+import json, logging, time
+start_ns = time.perf_counter_ns()
+from PyQt6.QtWidgets import QApplication
+import main
+logging.disable(logging.INFO)
+app = QApplication([])
+window = main.MainWindow(main.Config(), app)
+window.startup.run_until_complete()
+print(json.dumps({'elapsed_ms': (time.perf_counter_ns() - start_ns) / 1e6}))
+"""
+
+# Runs the staged startup from the event loop with the stall watchdog, so
+# stages that block the loop for longer than the threshold are reported.
+EVENT_LOOP_START_SCRIPT = """
+import json, logging, time
+start_ns = time.perf_counter_ns()
+from PyQt6.QtWidgets import QApplication
+import main
+from modules import watchdog
+logging.disable(logging.WARNING)
+app = QApplication([])
+stall_watchdog = watchdog.start_watchdog(threshold_ms=%d)
+window = main.MainWindow(main.Config(), app)
+window.startup.finished.connect(app.quit)
+app.exec()
+elapsed_ms = (time.perf_counter_ns() - start_ns) / 1e6
+print(json.dumps(dict(stall_watchdog.stats(), elapsed_ms=elapsed_ms)))
+"""
+
+STALL_THRESHOLD_MS = 50
+
+
+def bench_main_window_cold(benchmark, rounds=5):
+    timings = []
+    for _ in range(rounds):
+        result = subprocess.run([sys.executable, '-c', COLD_START_SCRIPT], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True)
+        timings.append(json.loads(result.stdout.strip().splitlines()[-1])['elapsed_ms'])
+    benchmark.record(timings)
+
+
+def bench_main_window_warm(benchmark):
+    import main
+    app = get_app()
+    config = main.Config()
+
+    def construct():
+        window = main.MainWindow(config, app)
+        window.startup.run_until_complete()
+        return window
+
+    def teardown(window):
+        window.close()
+        window.deleteLater()
+        process_events()
+
+    benchmark.pedantic(construct, teardown=teardown, rounds=benchmark.rounds, warmup_rounds=1)
+
+
+def bench_main_window_event_loop_stalls(benchmark, rounds=5):
+    """Cold start through the event loop; records GUI-thread stalls seen by the watchdog."""
+    runs = []
+    for _ in range(rounds):
+        result = subprocess.run([sys.executable, '-c', EVENT_LOOP_START_SCRIPT % STALL_THRESHOLD_MS],
+                                cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    benchmark.record([run['elapsed_ms'] for run in runs])
+    benchmark.extra_info['stall_threshold_ms'] = STALL_THRESHOLD_MS
+    benchmark.extra_info['stalls'] = max(run['stalls'] for run in runs)
+    benchmark.extra_info['max_stall_ms'] = max(run['max_stall_ms'] for run in runs)
+    benchmark.extra_info['stall_histogram'] = runs[-1]['histogram']
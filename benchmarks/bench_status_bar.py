@@ -0,0 +1,76 @@
+"""Status bar repaints under a flood of progress messages."""
+import threading
+import time
+
+from PyQt6.QtWidgets import QMainWindow
+
+from benchmarks.harness import get_app, process_events
+
+MESSAGE_COUNT = 100_000
+SOURCES = ['download', 'indexer', 'export', 'sync']
+
+
+def _make_service(max_rate_hz=30):
+    from modules.status_bar import create_status_bar
+    get_app()
+    window = QMainWindow()
+    create_status_bar(window)
+    service = window.statusBar().message_service
+    service.min_interval_ms = 1000.0 / max_rate_hz
+    return window, service
+
+
+def _record_repaints(benchmark, service, elapsed_s):
+    # At most one repaint per interval, plus the immediate first one
+    bound = int(elapsed_s * 1000.0 / service.min_interval_ms) + 1
+    benchmark.extra_info.update({
+        'posted': service.posted_count,
+        'repaints': service.repaint_count,
+        'repaint_bound': bound,
+        'messages_per_second': round(service.posted_count / elapsed_s),
+    })
+    print(f"  {service.posted_count} messages in {elapsed_s:.2f}s, "
+          f"{service.repaint_count} repaints (bound {bound})")
+
+
+def bench_status_flood_gui_thread(benchmark):
+    """100k messages posted from the GUI thread, with the event loop running in between."""
+    window, service = _make_service()
+
+    def flood():
+        for number in range(MESSAGE_COUNT):
+            service.post(f"Progress {number}", source=SOURCES[number % len(SOURCES)])
+            if number % 1000 == 0:
+                process_events()
+        process_events()
+
+    start = time.perf_counter()
+    benchmark.pedantic(flood, rounds=3)
+    _record_repaints(benchmark, service, time.perf_counter() - start)
+    window.deleteLater()
+    process_events()
+
+
+def bench_status_flood_worker_threads(benchmark):
+    """100k messages posted from worker threads while the GUI thread processes events."""
+    window, service = _make_service()
+
+    def worker(source, count):
+        for number in range(count):
+            service.post(f"{source}: {number}", source=source)
+
+    def flood():
+        threads = [threading.Thread(target=worker, args=(source, MESSAGE_COUNT // len(SOURCES)))
+                   for source in SOURCES]
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            process_events()
+            time.sleep(0.001)
+        process_events()
+
+    start = time.perf_counter()
+    benchmark.pedantic(flood, rounds=3)
+    _record_repaints(benchmark, service, time.perf_counter() - start)
+    window.deleteLater()
+    process_events()
@@ -0,0 +1,75 @@
+"""Theme switch latency against widget count: full re-apply versus diff-based engine."""
+import json
+import os
+import tempfile
+
+from PyQt6.QtWidgets import QLabel, QMainWindow, QPushButton, QWidget
+
+from benchmarks.harness import REPO_ROOT, get_app, parametrize, process_events
+
+WIDGET_COUNTS = [100, 1000, 10000]
+
+_theme_files = None
+
+
+def _variant_theme_files():
+    """
+    Write two copies of the dark theme that differ only in the menu colour,
+    the typical edit when a designer tweaks a theme.
+    """
+    global _theme_files
+    if _theme_files is None:
+        with open(os.path.join(REPO_ROOT, 'resources', 'styles', 'dark_theme.json')) as f:
+            theme_data = json.load(f)
+        directory = tempfile.mkdtemp(prefix='pyqt6ify-bench-')
+        _theme_files = []
+        for index, menu_background in enumerate(['#0a111f', '#1f0a11']):
+            path = os.path.join(directory, f'variant_{index}.json')
+            with open(path, 'w') as f:
+                json.dump(dict(theme_data, menu_background=menu_background), f)
+            _theme_files.append(path)
+    return _theme_files
+
+
+def _build_window(widget_count):
+    """Create a main window with a menu bar, a toolbar and synthetic widgets."""
+    window = QMainWindow()
+    window.menuBar().addMenu('File').addAction('New')
+    window.addToolBar('Main Toolbar').addAction('Save')
+    central = QWidget(window)
+    for index in range(widget_count):
+        widget = QPushButton(f'Button {index}', central) if index % 2 else QLabel(f'Label {index}', central)
+        widget.move((index % 40) * 20, (index // 40) % 600)
+    window.setCentralWidget(central)
+    return window
+
+
+def _run(benchmark, widget_count, switch):
+    from modules import themes
+    app = get_app()
+    first, second = (themes.registry.get(path) for path in _variant_theme_files())
+    window = _build_window(widget_count)
+    try:
+        themes.engine.apply(app, first, force=True)
+        benchmark.pedantic(switch, args=(app, second), setup=lambda: switch(app, first),
+                           rounds=benchmark.rounds, warmup_rounds=1)
+        benchmark.extra_info['widget_count'] = widget_count
+    finally:
+        window.deleteLater()
+        process_events()
+
+
+@parametrize('widget_count', WIDGET_COUNTS)
+def bench_theme_switch_full(benchmark, widget_count):
+    """Baseline: set the palette and the whole application stylesheet."""
+    def switch(app, theme):
+        app.setPalette(theme.palette)
+        app.setStyleSheet(theme.stylesheet)
+    _run(benchmark, widget_count, switch)
+
+
+@parametrize('widget_count', WIDGET_COUNTS)
+def bench_theme_switch_diff(benchmark, widget_count):
+    """Diff-based engine: the menu change restyles only the menu bar, its menus and the toolbar."""
+    from modules import themes
+    _run(benchmark, widget_count, themes.engine.apply)
@@ -0,0 +1,36 @@
+"""Latency of switching to each bundled JSON theme on a fully built window."""
+import glob
+import os
+
+from benchmarks.harness import REPO_ROOT, get_app, parametrize
+
+THEME_FILES = sorted(glob.glob(os.path.join(REPO_ROOT, 'resources', 'styles', '*.json')))
+BASELINE_THEME = os.path.join('resources', 'styles', 'light_theme.json')
+ALTERNATE_THEME = os.path.join('resources', 'styles', 'dark_theme.json')
+
+_window = None
+
+
+def _ensure_window():
+    """Build one MainWindow so theme switches re-polish a realistic widget tree."""
+    global _window
+    if _window is None:
+        import main
+        _window = main.MainWindow(main.Config(), get_app())
+        _window.startup.run_until_complete()
+    return _window
+
+
+@parametrize('theme_file', [os.path.relpath(path, REPO_ROOT) for path in THEME_FILES],
+             ids=[os.path.splitext(os.path.basename(path))[0] for path in THEME_FILES])
+def bench_apply_theme(benchmark, theme_file):
+    from modules import themes
+    app = get_app()
+    _ensure_window()
+
+    # Switch away first (untimed) so every timed call is a real theme change
+    previous = ALTERNATE_THEME if os.path.normpath(theme_file) == BASELINE_THEME else BASELINE_THEME
+
+    benchmark.pedantic(themes.apply_theme, args=(app, theme_file), kwargs={'show_message': False},
+                       setup=lambda: themes.apply_theme(app, previous, show_message=False),
+                       rounds=benchmark.rounds, warmup_rounds=1)
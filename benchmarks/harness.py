@@ -0,0 +1,287 @@
+"""
+Minimal pytest-benchmark style harness for headless PyQt6ify Pro benchmarks.
+
+Benchmark modules live next to this file as ``bench_*.py`` and define
+``bench_*`` functions that take a ``benchmark`` fixture and call it with the
+code to time::
+
+    def bench_create_menu(benchmark):
+        benchmark(menu.create_menu, window, config)
+
+Results are appended to a JSON history file that ``compare`` reads to flag
+regressions between runs.
+"""
+import gc
+import glob
+import importlib
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_HISTORY_FILE = os.path.join(BENCH_DIR, 'results', 'history.json')
+DEFAULT_THRESHOLD_PERCENT = 10.0
+
+_app = None
+
+
+def prepare_environment():
+    """
+    Run headless from the repository root so the relative resource paths
+    used by the application resolve, and make the application importable.
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    os.chdir(REPO_ROOT)
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+
+
+def get_app():
+    """
+    Return the shared QApplication, creating it on first use.
+
+    :return: The QApplication instance.
+    """
+    global _app
+    if _app is None:
+        from PyQt6.QtWidgets import QApplication
+        _app = QApplication.instance() or QApplication([])
+    return _app
+
+
+def process_events():
+    """Let Qt process pending events such as deferred deletes and polish requests."""
+    from PyQt6.QtCore import QCoreApplication, QEvent
+    app = get_app()
+    app.processEvents()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+
+
+def parametrize(argname, values, ids=None):
+    """
+    Run a benchmark once per value, like pytest.mark.parametrize.
+
+    :param argname: Name of the keyword argument passed to the benchmark.
+    :param values: The values to run the benchmark with.
+    :param ids: Optional display names for the values.
+    """
+    def decorator(func):
+        func.bench_params = (argname, list(values), list(ids) if ids else [str(v) for v in values])
+        return func
+    return decorator
+
+
+class Benchmark:
+    """
+    Callable fixture that times a function over several rounds and keeps
+    summary statistics in milliseconds.
+    """
+
+    def __init__(self, name, rounds=20, warmup_rounds=2):
+        """
+        Initialize the fixture.
+
+        :param name: Name of the benchmark being run.
+        :param rounds: Number of timed rounds.
+        :param warmup_rounds: Number of untimed rounds run first.
+        """
+        self.name = name
+        self.rounds = rounds
+        self.warmup_rounds = warmup_rounds
+        self.stats = None
+        self.extra_info = {}
+
+    def __call__(self, func, *args, **kwargs):
+        """
+        Time func(*args, **kwargs) and return the result of the last call.
+        """
+        return self.pedantic(func, args=args, kwargs=kwargs,
+                             rounds=self.rounds, warmup_rounds=self.warmup_rounds)
+
+    def pedantic(self, func, args=(), kwargs=None, setup=None, teardown=None, rounds=1, warmup_rounds=0):
+        """
+        Time func with explicit rounds and optional per-round setup/teardown,
+        which are not included in the measurement.
+
+        :return: The result of the last call.
+        """
+        kwargs = kwargs or {}
+        result = None
+        timings = []
+        for round_index in range(warmup_rounds + rounds):
+            if setup is not None:
+                setup()
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                start_ns = time.perf_counter_ns()
+                result = func(*args, **kwargs)
+                elapsed_ns = time.perf_counter_ns() - start_ns
+            finally:
+                if gc_enabled:
+                    gc.enable()
+            if teardown is not None:
+                teardown(result)
+            if round_index >= warmup_rounds:
+                timings.append(elapsed_ns / 1e6)
+        self.record(timings)
+        return result
+
+    def record(self, timings_ms):
+        """
+        Store statistics for timings measured outside of the fixture
+        (for example in a subprocess).
+
+        :param timings_ms: Per-round timings in milliseconds.
+        """
+        self.stats = {
+            'rounds': len(timings_ms),
+            'min': min(timings_ms),
+            'max': max(timings_ms),
+            'mean': statistics.fmean(timings_ms),
+            'median': statistics.median(timings_ms),
+            'stddev': statistics.stdev(timings_ms) if len(timings_ms) > 1 else 0.0,
+        }
+
+
+def discover(keyword=None):
+    """
+    Collect benchmark functions from bench_*.py modules.
+
+    :param keyword: Optional substring that benchmark names must contain.
+    :return: A list of (name, func, kwargs) tuples.
+    """
+    collected = []
+    for path in sorted(glob.glob(os.path.join(BENCH_DIR, 'bench_*.py'))):
+        module_name = os.path.splitext(os.path.basename(path))[0]
+        module = importlib.import_module(f'benchmarks.{module_name}')
+        for attr in sorted(vars(module)):
+            func = getattr(module, attr)
+            if not attr.startswith('bench_') or not callable(func):
+                continue
+            base_name = f'{module_name}::{attr}'
+            params = getattr(func, 'bench_params', None)
+            if params:
+                argname, values, ids = params
+                items = [(f'{base_name}[{id_}]', {argname: value}) for value, id_ in zip(values, ids)]
+            else:
+                items = [(base_name, {})]
+            for name, kwargs in items:
+                if keyword is None or keyword in name:
+                    collected.append((name, func, kwargs))
+    return collected
+
+
+def run(keyword=None, rounds=20, history_file=DEFAULT_HISTORY_FILE, quiet_logging=True):
+    """
+    Run the discovered benchmarks and append the results to the history file.
+
+    :param keyword: Optional substring filter for benchmark names.
+    :param rounds: Default number of timed rounds per benchmark.
+    :param history_file: JSON file the run is appended to.
+    :param quiet_logging: Suppress application INFO logging while timing.
+    :return: The run record that was saved.
+    """
+    prepare_environment()
+    if quiet_logging:
+        logging.disable(logging.INFO)
+
+    results = {}
+    for name, func, kwargs in discover(keyword):
+        benchmark = Benchmark(name, rounds=rounds)
+        try:
+            func(benchmark, **kwargs)
+        except Exception as e:
+            print(f"{name:<64} ERROR: {e}")
+            continue
+        finally:
+            process_events()
+        if benchmark.stats is None:
+            continue
+        results[name] = dict(benchmark.stats, **benchmark.extra_info)
+        stats = benchmark.stats
+        print(f"{name:<64} median {stats['median']:>9.3f} ms  "
+              f"min {stats['min']:>9.3f} ms  (n={stats['rounds']})")
+
+    run_record = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': _git_commit(),
+        'machine': platform.node(),
+        'python': platform.python_version(),
+        'results': results,
+    }
+    history = load_history(history_file)
+    history.append(run_record)
+    os.makedirs(os.path.dirname(history_file), exist_ok=True)
+    with open(history_file, 'w') as f:
+        json.dump(history, f, indent=2)
+    print(f"Saved {len(results)} results to {os.path.relpath(history_file, REPO_ROOT)}")
+    return run_record
+
+
+def load_history(history_file=DEFAULT_HISTORY_FILE):
+    """
+    Load all saved benchmark runs.
+
+    :param history_file: JSON history file.
+    :return: A list of run records, oldest first.
+    """
+    if not os.path.exists(history_file):
+        return []
+    with open(history_file) as f:
+        return json.load(f)
+
+
+def compare(history_file=DEFAULT_HISTORY_FILE, threshold_percent=DEFAULT_THRESHOLD_PERCENT,
+            baseline_index=-2, current_index=-1):
+    """
+    Compare two runs from the history and report regressions.
+
+    :param history_file: JSON history file.
+    :param threshold_percent: Median slowdown (in percent) treated as a regression.
+    :param baseline_index: History index of the baseline run (default: previous run).
+    :param current_index: History index of the run to check (default: latest run).
+    :return: A list of benchmark names that regressed.
+    """
+    history = load_history(history_file)
+    if len(history) < 2:
+        print("Need at least two runs in the history to compare.")
+        return []
+    baseline, current = history[baseline_index], history[current_index]
+    print(f"Baseline: {baseline['timestamp']} ({baseline.get('commit') or 'unknown commit'})")
+    print(f"Current:  {current['timestamp']} ({current.get('commit') or 'unknown commit'})")
+    print(f"{'Benchmark':<64} {'Baseline':>10} {'Current':>10} {'Change':>8}")
+
+    regressions = []
+    for name, stats in sorted(current['results'].items()):
+        base_stats = baseline['results'].get(name)
+        if base_stats is None:
+            print(f"{name:<64} {'-':>10} {stats['median']:>10.3f}      new")
+            continue
+        change = (stats['median'] - base_stats['median']) / base_stats['median'] * 100 if base_stats['median'] else 0.0
+        flag = ''
+        if change > threshold_percent:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(f"{name:<64} {base_stats['median']:>10.3f} {stats['median']:>10.3f} {change:>+7.1f}%{flag}")
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {threshold_percent:.1f}%")
+    else:
+        print(f"No regressions beyond {threshold_percent:.1f}%")
+    return regressions
+
+
+def _git_commit():
+    """Return the current git commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
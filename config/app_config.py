@@ -1,19 +1,42 @@
 import configparser
 import os
 import logging
+import time
+import types
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
 from modules.error_handling import setup_logging
-from config.settings_dialog import SettingsDialog  
+from config.schema import diff_settings, parse_settings
 import config.settings as app_settings  # Import settings from the config folder
 
-class Config:
-    def __init__(self, config_file='config/config.ini'):
+# Names defined by settings.py, replaced when it is reloaded
+SETTINGS_NAMES = ('about_info', 'modules', 'app_defaults', 'logging_defaults', 'database_defaults')
+
+class Config(QObject):
+    """
+    Application configuration: config.ini on top of the defaults in settings.py.
+
+    The configuration is parsed and validated once into an immutable
+    snapshot, self.settings (see config/schema.py), e.g.
+    config.settings.app.dark_mode. When reload() finds different values,
+    the snapshot is replaced and changed is emitted with a dict of
+    'section.option' to (old value, new value). Logging is reconfigured
+    by the Config itself; other subsystems connect to changed.
+    """
+
+    changed = pyqtSignal(object)
+
+    def __init__(self, config_file='config/config.ini', parent=None):
         """
         Initialize the Config class.
         
         :param config_file: Path to the configuration file.
+        :param parent: Parent QObject.
         """
+        super().__init__(parent)
         self.config_file = config_file
         self.config = configparser.ConfigParser()
+        self.watcher = None
+        self._settings_mtime_ns = _mtime_ns(app_settings.__file__)
 
         # Load About and Module info from settings.py
         self.about_info = app_settings.about_info
@@ -30,10 +53,10 @@ class Config:
             self.create_default_config()
 
         self.load_config()
+        self.settings = parse_settings(self.config, app_settings)
 
-        # Setup logging if the logging module is enabled
-        if self.is_module_enabled('logging'):
-            self.setup_logging()
+        # Logging is configured once, as soon as its settings are known
+        self.setup_logging()
 
     def load_config(self):
         """
@@ -43,15 +66,97 @@ class Config:
             self.config.read(self.config_file)
             logging.info(f"Configuration loaded from {os.path.normpath(self.config_file)}")
         except Exception as e:
-            logging.error(f"Failed to load config file: {e}")
+            # A partially read file can leave unusable values behind; use the defaults
+            logging.error(f"Failed to load config file, using the default settings: {e}")
+            self.config = configparser.ConfigParser()
+
+    def reload(self):
+        """
+        Re-read config.ini and the settings.py defaults into a new snapshot,
+        reconfiguring logging if its settings changed and emitting changed if
+        any value differs. Nothing is replaced unless both files load and
+        parse; otherwise the error is logged and the current settings are kept,
+        so a half-written or broken file cannot take the application down.
+
+        :return: The dict of changed values (empty if nothing changed or the reload failed).
+        """
+        try:
+            settings_file = self.read_settings_module()
+            defaults = types.SimpleNamespace(**{name: getattr(app_settings, name) for name in SETTINGS_NAMES})
+            if settings_file is not None:
+                vars(defaults).update(settings_file[1])
+            parser = configparser.ConfigParser()
+            parser.read(self.config_file)
+            settings = parse_settings(parser, defaults)
+        except Exception as e:
+            logging.error(f"Failed to reload the configuration, keeping the current settings: {e}")
+            return {}
+
+        if settings_file is not None:
+            self._settings_mtime_ns = settings_file[0]
+            for name in SETTINGS_NAMES:
+                setattr(app_settings, name, getattr(defaults, name))
+            self.about_info = app_settings.about_info
+            self.modules = app_settings.modules
+            logging.info(f"Settings reloaded from {os.path.normpath(app_settings.__file__)}")
+        self.config = parser
+        logging.info(f"Configuration loaded from {os.path.normpath(self.config_file)}")
+
+        changes = diff_settings(self.settings, settings)
+        self.settings = settings
+        if changes:
+            logging.info(f"Configuration changed: {', '.join(changes)}")
+            if any(key.startswith('logging.') or key == 'modules.logging' for key in changes):
+                self.setup_logging()
+            self.changed.emit(changes)
+        return changes
+
+    def read_settings_module(self):
+        """
+        Execute settings.py if it changed on disk since it was loaded, e.g.
+        after the Settings dialog saved it. Its source is executed directly, so
+        a stale bytecode cache cannot hide an edit.
+
+        :return: None if settings.py is unchanged, otherwise a tuple of its
+                 modification time and a dict of the names in SETTINGS_NAMES
+                 (names it does not define keep their current values).
+        :raises Exception: If settings.py cannot be read or executed.
+        """
+        path = app_settings.__file__
+        mtime_ns = _mtime_ns(path)
+        if mtime_ns is None or mtime_ns == self._settings_mtime_ns:
+            return None
+        with open(path) as settings_file:
+            namespace = {}
+            exec(compile(settings_file.read(), path, 'exec'), namespace)
+        return mtime_ns, {name: namespace[name] for name in SETTINGS_NAMES if name in namespace}
+
+    def enable_hot_reload(self, debounce_ms=250):
+        """
+        Reload the configuration whenever config.ini or settings.py is edited.
+
+        :param debounce_ms: Quiet period after the last change before reloading.
+        :return: The ConfigWatcher.
+        """
+        if self.watcher is None:
+            self.watcher = ConfigWatcher(self, debounce_ms=debounce_ms, parent=self)
+        return self.watcher
+
+    def disable_hot_reload(self):
+        """Stop watching the configuration files."""
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher.deleteLater()
+            self.watcher = None
 
     def create_default_config(self):
         """
-        Creates a default configuration file with APP and LOGGING sections.
+        Creates a default configuration file with APP, LOGGING and DATABASE sections.
         """
         try:
             self.config['APP'] = app_settings.app_defaults
             self.config['LOGGING'] = app_settings.logging_defaults
+            self.config['DATABASE'] = app_settings.database_defaults
             with open(self.config_file, 'w') as configfile:
                 self.config.write(configfile)
             logging.info(f"Default config created at: {self.config_file}")
@@ -61,17 +166,36 @@ class Config:
     def setup_logging(self):
         """
         Setup logging configuration based on settings loaded from config.ini.
+        Logs go to the console only if the logging module is disabled.
+        Calling this again only reconfigures logging if the settings changed.
         """
+        settings = self.settings.logging
+        log_file = settings.log_file if self.settings.modules.logging else None
         try:
-            log_file = self.get_logging_setting('log_file', app_settings.logging_defaults['log_file'])
-            max_bytes = int(self.get_logging_setting('max_bytes', app_settings.logging_defaults['max_bytes']))
-            backup_count = int(self.get_logging_setting('backup_count', app_settings.logging_defaults['backup_count']))
-            logging_level = self.get_logging_setting('level', app_settings.logging_defaults['level']).upper()
-
-            setup_logging(log_file=log_file, max_bytes=max_bytes, backup_count=backup_count)
-            logging.info(f"Logging setup with level: {logging_level}, log file: {log_file}")
+            setup_logging(
+                log_file=log_file,
+                max_bytes=settings.max_bytes,
+                backup_count=settings.backup_count,
+                compression=settings.compression,
+                max_age_days=settings.max_age_days,
+                max_total_bytes=settings.max_total_bytes,
+                level=settings.level,
+                module_levels=dict(settings.module_levels),
+                # Write log records from a background thread instead of the GUI thread
+                async_logging=settings.async_,
+                queue_size=settings.queue_size,
+                overflow=settings.overflow,
+                log_format=settings.format,
+                dedup_window_s=settings.dedup_window_s,
+                rate_limit_per_s=settings.rate_limit_per_s,
+                rate_limit_burst=settings.rate_limit_burst,
+                sample_threshold=settings.sample_threshold,
+                sample_every=settings.sample_every,
+            )
         except Exception as e:
+            # Fall back to the default configuration rather than losing the log
             logging.error(f"Failed to setup logging: {e}")
+            setup_logging(log_file=log_file)
 
     def get_about_info(self, key):
         """
@@ -84,7 +208,8 @@ class Config:
 
     def get_app_setting(self, option, fallback=None):
         """
-        Retrieves a setting from the APP section in config.ini.
+        Retrieves a setting from the APP section in config.ini as a string.
+        Prefer the typed value, e.g. config.settings.app.screen_width.
         
         :param option: The option name (e.g., start_maximized, screen_width).
         :param fallback: Fallback value if the option is not found.
@@ -94,7 +219,8 @@ class Config:
 
     def get_logging_setting(self, option, fallback=None):
         """
-        Retrieves a setting from the LOGGING section in config.ini.
+        Retrieves a setting from the LOGGING section in config.ini as a string.
+        Prefer the typed value, e.g. config.settings.logging.max_bytes.
         
         :param option: The option name (e.g., log_file, max_bytes, level).
         :param fallback: Fallback value if the option is not found.
@@ -109,7 +235,7 @@ class Config:
         :param module: The module to check (e.g., logging, database).
         :return: True if the module is enabled, False otherwise.
         """
-        return self.modules.get(module, False)
+        return getattr(self.settings.modules, module, False)
 
     def get(self, section, option, fallback=None):
         """
@@ -127,3 +253,87 @@ class Config:
         except configparser.NoOptionError:
             logging.error(f"Option '{option}' not found in section '{section}' of config file.")
         return fallback
+
+
+class ConfigWatcher(QObject):
+    """
+    Watches config.ini and settings.py and reloads the Config after they are
+    edited. Rapid successive saves are debounced into a single reload, and
+    the directories are watched too, so files replaced by an atomic save are
+    noticed.
+    """
+
+    def __init__(self, config, debounce_ms=250, parent=None):
+        """
+        Initialize the watcher and start watching.
+
+        :param config: The Config to reload.
+        :param debounce_ms: Quiet period after the last change before reloading.
+        :param parent: Parent QObject.
+        """
+        super().__init__(parent)
+        self.config = config
+        self.files = [os.path.abspath(config.config_file), os.path.abspath(app_settings.__file__)]
+        self.reload_count = 0
+        self._pending_since_ns = None
+        self._mtimes = self._current_mtimes()
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_changed)
+        self._watcher.directoryChanged.connect(self._on_changed)
+        self._watch_paths()
+
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(debounce_ms)
+        self._debounce_timer.timeout.connect(self.reload)
+        logging.info(f"Hot reload watching configuration files: {', '.join(self.files)}")
+
+    def _current_mtimes(self):
+        """Return the modification times of the watched files (None for a missing file)."""
+        return [_mtime_ns(path) for path in self.files]
+
+    def _watch_paths(self):
+        """Watch the files and their directories; editors that replace a file drop it from the watcher."""
+        watched = set(self._watcher.files() + self._watcher.directories())
+        paths = [path for path in self.files if os.path.exists(path)]
+        paths += [os.path.dirname(path) for path in paths]
+        missing = [path for path in dict.fromkeys(paths) if path not in watched]
+        if missing:
+            self._watcher.addPaths(missing)
+
+    def _on_changed(self, path):
+        """Restart the debounce timer when a watched file (or its directory entry) changes."""
+        if os.path.normpath(path) not in self.files and self._current_mtimes() == self._mtimes:
+            return  # Another file in the directory changed
+        if self._pending_since_ns is None:
+            self._pending_since_ns = time.perf_counter_ns()
+        self._debounce_timer.start()
+
+    def reload(self):
+        """Reload the configuration if a watched file changed."""
+        start_ns = self._pending_since_ns or time.perf_counter_ns()
+        self._pending_since_ns = None
+        self._watch_paths()
+        mtimes = self._current_mtimes()
+        if mtimes == self._mtimes:
+            return
+        self._mtimes = mtimes
+        changes = self.config.reload()
+        self.reload_count += 1
+        logging.info(f"Configuration hot-reloaded (reload #{self.reload_count}, {len(changes)} changed values, "
+                     f"{(time.perf_counter_ns() - start_ns) / 1e6:.0f} ms since change)")
+
+    def stop(self):
+        """Stop watching."""
+        self._debounce_timer.stop()
+        watched = self._watcher.files() + self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
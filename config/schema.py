@@ -0,0 +1,203 @@
+import configparser
+import logging
+from dataclasses import dataclass, field, fields
+from modules.error_handling import LOG_FORMATS, OVERFLOW_POLICIES, parse_level, parse_module_levels
+from modules.log_rotation import COMPRESSIONS
+
+
+def parse_bool(value):
+    """
+    Parse a boolean setting ('True'/'False', or any of configparser's yes/no, on/off, 1/0).
+
+    :param value: The raw value.
+    :return: The value as a bool.
+    """
+    if isinstance(value, bool):
+        return value
+    try:
+        return configparser.ConfigParser.BOOLEAN_STATES[str(value).strip().lower()]
+    except KeyError:
+        raise ValueError(f"'{value}' is not a boolean") from None
+
+
+def parse_log_level(value):
+    """Validate a level name (or number) and return it as written in the configuration."""
+    parse_level(value)
+    return str(value).strip().upper()
+
+
+def parse_level_overrides(value):
+    """Parse 'module=LEVEL, ...' into a tuple of (name, level) pairs, validating every level."""
+    overrides = parse_module_levels(value)
+    for level in overrides.values():
+        parse_level(level)
+    return tuple(overrides.items())
+
+
+def setting(parse=str, choices=None, minimum=None, default=None):
+    """
+    Declare a field of a settings section.
+
+    :param parse: Converts the raw (string) value, raising ValueError if it is invalid.
+    :param choices: Optional tuple of allowed values.
+    :param minimum: Optional lowest allowed value.
+    :param default: Built-in raw value, used when neither config.ini nor settings.py sets
+                    the option or sets it to a valid value; it must be valid itself.
+    """
+    return field(metadata={'parse': parse, 'choices': choices, 'minimum': minimum, 'default': default})
+
+
+@dataclass(frozen=True, slots=True)
+class AppSettings:
+    """Typed [APP] section: window, theme and diagnostics settings."""
+    start_maximized: bool = setting(parse_bool, default='True')
+    screen_width: int = setting(int, minimum=1, default='800')
+    screen_height: int = setting(int, minimum=1, default='600')
+    dark_mode: bool = setting(parse_bool, default='False')
+    theme: str = setting(default='')
+    theme_hot_reload: bool = setting(parse_bool, default='False')
+    config_hot_reload: bool = setting(parse_bool, default='True')
+    status_max_rate: float = setting(float, minimum=0, default='30')
+    performance_hud: bool = setting(parse_bool, default='False')
+    stall_threshold_ms: int = setting(int, minimum=0, default='250')
+
+
+@dataclass(frozen=True, slots=True)
+class LoggingSettings:
+    """Typed [LOGGING] section, as passed to error_handling.setup_logging."""
+    log_file: str = setting(default='logs/app.log')
+    max_bytes: int = setting(int, minimum=0, default='5242880')
+    backup_count: int = setting(int, minimum=0, default='10')
+    compression: str = setting(choices=COMPRESSIONS, default='gzip')
+    max_age_days: float = setting(float, minimum=0, default='30')
+    max_total_bytes: int = setting(int, minimum=0, default='104857600')
+    level: str = setting(parse_log_level, default='INFO')
+    format: str = setting(choices=LOG_FORMATS, default='text')
+    module_levels: tuple = setting(parse_level_overrides, default='')
+    async_: bool = setting(parse_bool, default='False')
+    queue_size: int = setting(int, minimum=1, default='10000')
+    overflow: str = setting(choices=OVERFLOW_POLICIES, default='block')
+    dedup_window_s: float = setting(float, minimum=0, default='0')
+    rate_limit_per_s: float = setting(float, minimum=0, default='0')
+    rate_limit_burst: int = setting(int, minimum=1, default='100')
+    sample_threshold: int = setting(int, minimum=0, default='0')
+    sample_every: int = setting(int, minimum=1, default='10')
+
+
+@dataclass(frozen=True, slots=True)
+class DatabaseSettings:
+    """Typed [DATABASE] section."""
+    path: str = setting(default='my_pyqt_app.db')
+    timeout_s: float = setting(float, minimum=0, default='5')
+
+
+@dataclass(frozen=True, slots=True)
+class ModuleSettings:
+    """Which optional modules are enabled (the modules dict of settings.py)."""
+    logging: bool = setting(parse_bool, default=False)
+    database: bool = setting(parse_bool, default=False)
+    menu: bool = setting(parse_bool, default=False)
+    toolbar: bool = setting(parse_bool, default=False)
+    status_bar: bool = setting(parse_bool, default=False)
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """
+    Immutable, validated snapshot of the whole configuration.
+
+    Values are parsed once when the configuration is loaded, so reading
+    one (e.g. settings.app.dark_mode) is a plain attribute lookup.
+    """
+    app: AppSettings
+    logging: LoggingSettings
+    database: DatabaseSettings
+    modules: ModuleSettings
+
+
+def option_name(field_name):
+    """Return the config.ini option of a field; trailing underscores avoid Python keywords (async_)."""
+    return field_name.rstrip('_')
+
+
+def parse_section(section_type, values, defaults, section_name):
+    """
+    Parse and validate one section. An invalid value is logged and replaced by
+    its settings.py default or, if that is invalid too (e.g. a typo saved from
+    the Settings dialog), by the field's built-in default.
+
+    :param section_type: The settings dataclass of the section, e.g. AppSettings.
+    :param values: Mapping of option to raw value (e.g. a configparser section), or None.
+    :param defaults: Mapping of option to default raw value (from settings.py).
+    :param section_name: Name of the section, used in warnings.
+    :return: An instance of section_type.
+    """
+    values = values if values is not None else {}
+    parsed = {}
+    for spec in fields(section_type):
+        option = option_name(spec.name)
+        # The configured value, then the settings.py default, then the built-in default
+        raws = list(dict.fromkeys(raw for raw in (values.get(option), defaults.get(option), spec.metadata['default'])
+                                  if raw is not None))
+        for number, raw in enumerate(raws):
+            try:
+                parsed[spec.name] = _parse_value(spec, raw)
+                break
+            except ValueError as e:
+                if number == len(raws) - 1:
+                    raise ValueError(f"Invalid {section_name} setting {option} = '{raw}': {e}") from None
+                logging.warning(f"Invalid {section_name} setting {option} = '{raw}' ({e}); using '{raws[number + 1]}'.")
+    return section_type(**parsed)
+
+
+def _parse_value(spec, raw):
+    """Convert a raw value with a field's parser and check its constraints."""
+    if raw is None:
+        raise ValueError("missing value")
+    metadata = spec.metadata
+    value = metadata['parse'](raw.strip() if isinstance(raw, str) else raw)
+    if metadata['choices'] is not None and value not in metadata['choices']:
+        raise ValueError(f"expected one of {', '.join(metadata['choices'])}")
+    if metadata['minimum'] is not None and value < metadata['minimum']:
+        raise ValueError(f"must be at least {metadata['minimum']}")
+    return value
+
+
+def parse_settings(parser, app_settings):
+    """
+    Build a settings snapshot from config.ini and the settings.py defaults.
+
+    :param parser: The ConfigParser config.ini was read into.
+    :param app_settings: The config.settings module (defaults and module switches).
+    :return: A Settings snapshot.
+    """
+    def section(name):
+        return parser[name] if parser.has_section(name) else None
+
+    return Settings(
+        app=parse_section(AppSettings, section('APP'), app_settings.app_defaults, 'APP'),
+        logging=parse_section(LoggingSettings, section('LOGGING'), app_settings.logging_defaults, 'LOGGING'),
+        database=parse_section(DatabaseSettings, section('DATABASE'), app_settings.database_defaults, 'DATABASE'),
+        modules=parse_section(ModuleSettings, app_settings.modules, {}, 'modules'),
+    )
+
+
+def diff_settings(old, new):
+    """
+    Compare two snapshots.
+
+    :param old: The previous Settings.
+    :param new: The new Settings.
+    :return: A dict of 'section.option' (e.g. 'app.dark_mode') to (old value, new value)
+             for every value that differs.
+    """
+    changes = {}
+    for part in fields(Settings):
+        old_section, new_section = getattr(old, part.name), getattr(new, part.name)
+        if old_section == new_section:
+            continue
+        for spec in fields(old_section):
+            old_value, new_value = getattr(old_section, spec.name), getattr(new_section, spec.name)
+            if old_value != new_value:
+                changes[f'{part.name}.{option_name(spec.name)}'] = (old_value, new_value)
+    return changes
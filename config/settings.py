@@ -1,4 +1,5 @@
 about_info = {'name': 'PyQt6ify Pro', 'version': '1.0', 'author': 'Your Name', 'website': 'https://www.yourwebsite.com', 'icon': 'resources/icons/app_icon.png'}
 modules = {'logging': True, 'database': True, 'menu': True, 'toolbar': True, 'status_bar': True}
-app_defaults = {'start_maximized': 'True', 'screen_width': '800', 'screen_height': '600', 'dark_mode': 'False'}
-logging_defaults = {'log_file': 'logs/app.log', 'max_bytes': '5242880', 'backup_count': '3', 'level': 'INFO'}
+app_defaults = {'start_maximized': 'True', 'screen_width': '800', 'screen_height': '600', 'dark_mode': 'False', 'theme_hot_reload': 'False', 'config_hot_reload': 'True', 'status_max_rate': '30', 'performance_hud': 'False', 'stall_threshold_ms': '250'}
+logging_defaults = {'log_file': 'logs/app.log', 'max_bytes': '5242880', 'backup_count': '10', 'compression': 'gzip', 'max_age_days': '30', 'max_total_bytes': '104857600', 'level': 'INFO', 'format': 'text', 'module_levels': '', 'async': 'False', 'queue_size': '10000', 'overflow': 'block', 'dedup_window_s': '0', 'rate_limit_per_s': '0', 'rate_limit_burst': '100', 'sample_threshold': '0', 'sample_every': '10'}
+database_defaults = {'path': 'my_pyqt_app.db', 'timeout_s': '5'}
@@ -19,12 +19,36 @@ modules = {
 app_defaults = {
     'start_maximized': 'True',
     'screen_width': '800',
-    'screen_height': '600'
+    'screen_height': '600',
+    'dark_mode': 'False',
+    'theme_hot_reload': 'False',  # Re-apply the active theme when its file is edited
+    'config_hot_reload': 'True',  # Re-apply config.ini and settings.py when they are edited
+    'status_max_rate': '30',  # Maximum status bar updates per second
+    'performance_hud': 'False',  # Show event loop latency, FPS and memory in the status bar
+    'stall_threshold_ms': '250'  # Log the GUI thread's stack when the event loop stalls this long (0 disables)
 }
 
 logging_defaults = {
     'log_file': 'logs/app.log',
     'max_bytes': '5242880',  # 5MB
-    'backup_count': '3',
-    'level': 'INFO'
+    'backup_count': '10',  # Compressed backups kept (0 for no limit)
+    'compression': 'gzip',  # gzip, zstd (pip install zstandard) or none
+    'max_age_days': '30',  # Remove older backups (0 keeps them)
+    'max_total_bytes': '104857600',  # 100MB disk budget for the log and its backups (0 for no limit)
+    'level': 'INFO',
+    'format': 'text',  # text, or json for one JSON object per line (NDJSON) in the log file
+    'module_levels': '',  # Per-module levels, e.g. menu=WARNING, status_bar=WARNING
+    'async': 'False',  # Write log records from a background thread (records still queued at a crash are lost)
+    'queue_size': '10000',  # Maximum queued records in async mode
+    'overflow': 'block',  # block, drop_oldest or sample when the queue is full
+    'dedup_window_s': '0',  # Write identical records once per window, then "repeated N times" (0 disables, e.g. 10)
+    'rate_limit_per_s': '0',  # Records per second per call site below ERROR (0 disables, e.g. 20)
+    'rate_limit_burst': '100',  # Records a call site may log at once when rate limiting
+    'sample_threshold': '0',  # Records per second per module before sampling below ERROR (0 disables, e.g. 200)
+    'sample_every': '10'  # Keep one in this many records while sampling
+}
+
+database_defaults = {
+    'path': 'my_pyqt_app.db',  # SQLite database file
+    'timeout_s': '5'  # Seconds to wait for a locked database
 }
@@ -1,11 +1,35 @@
 from PyQt6.QtWidgets import (QDialog, QLabel, QLineEdit, QCheckBox, QPushButton, 
                              QVBoxLayout, QHBoxLayout, QFormLayout, QTabWidget, 
                              QComboBox, QWidget, QSpacerItem, QSizePolicy, QFileDialog)
-from PyQt6.QtGui import QPixmap
 from PyQt6.QtCore import Qt
 import config.settings as app_settings
 import logging
-from PIL import Image  # Ensure Pillow is installed: pip install pillow
+from modules import icons
+from modules.lazy_loader import get_subsystem
+
+# App defaults stored as 'True'/'False' strings and shown as checkboxes
+BOOLEAN_APP_DEFAULTS = {
+    'dark_mode': "Enable Dark Mode",
+    'theme_hot_reload': "Reload Theme Files When Edited",
+    'config_hot_reload': "Apply Configuration Files When Edited",
+    'performance_hud': "Show Performance HUD in Status Bar",
+}
+
+# Logging settings stored as 'True'/'False' strings and shown as checkboxes
+BOOLEAN_LOGGING_DEFAULTS = {
+    'async': "Write Log Files from a Background Thread",
+}
+
+# Logging settings chosen from a fixed list
+LOGGING_CHOICES = {
+    'level': ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+    'overflow': ["block", "drop_oldest", "sample"],
+    'compression': ["gzip", "zstd", "none"],
+    'format': ["text", "json"],
+}
+
+# Pillow is only needed to validate a newly chosen icon (pip install pillow)
+Image = get_subsystem('pillow')
 
 class SettingsDialog(QDialog):
     def __init__(self, parent=None):
@@ -24,6 +48,7 @@ class SettingsDialog(QDialog):
         self.add_module_tab("Modules", app_settings.modules)
         self.add_app_defaults_tab("App Defaults", app_settings.app_defaults)
         self.add_logging_tab("Logging Settings", app_settings.logging_defaults)
+        self.add_database_tab("Database", app_settings.database_defaults)
 
         # Add tabs to the main layout
         self.layout.addWidget(self.tabs)
@@ -45,7 +70,7 @@ class SettingsDialog(QDialog):
         for key, value in settings_dict.items():
             if key == 'icon':
                 self.icon_label = QLabel(alignment=Qt.AlignmentFlag.AlignCenter)
-                pixmap = QPixmap(value).scaled(256, 256, Qt.AspectRatioMode.KeepAspectRatio)
+                pixmap = icons.get_pixmap(value, 256)
                 self.icon_label.setPixmap(pixmap)
                 self.icon_label.setFixedSize(256, 256)
 
@@ -75,7 +100,7 @@ class SettingsDialog(QDialog):
                         raise ValueError("Image dimensions must be 256x256 pixels.")
                 
                 # If valid, update the icon
-                pixmap = QPixmap(file_path).scaled(256, 256, Qt.AspectRatioMode.KeepAspectRatio)
+                pixmap = icons.get_pixmap(file_path, 256)
                 self.icon_label.setPixmap(pixmap)
                 app_settings.about_info['icon'] = file_path  # Update the icon path in settings
                 logging.info(f"Icon updated to {file_path}")
@@ -124,8 +149,8 @@ class SettingsDialog(QDialog):
                 field = QComboBox()
                 field.addItems(["True", "False"])
                 field.setCurrentText("True" if value else "False")
-            elif key == "dark_mode":
-                field = QCheckBox("Enable Dark Mode")
+            elif key in BOOLEAN_APP_DEFAULTS:
+                field = QCheckBox(BOOLEAN_APP_DEFAULTS[key])
                 field.setChecked(value == "True")
             elif isinstance(value, bool):
                 field = QCheckBox()
@@ -145,10 +170,13 @@ class SettingsDialog(QDialog):
         layout = QFormLayout()
 
         for key, value in logging_dict.items():
-            if key == "level":
+            if key in LOGGING_CHOICES:
                 field = QComboBox()
-                field.addItems(["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"])
+                field.addItems(LOGGING_CHOICES[key])
                 field.setCurrentText(str(value))
+            elif key in BOOLEAN_LOGGING_DEFAULTS:
+                field = QCheckBox(BOOLEAN_LOGGING_DEFAULTS[key])
+                field.setChecked(value == "True")
             elif isinstance(value, bool):
                 field = QCheckBox()
                 field.setChecked(value)
@@ -161,6 +189,29 @@ class SettingsDialog(QDialog):
         tab.setLayout(layout)
         self.tabs.addTab(tab, tab_title)
 
+    def add_database_tab(self, tab_title, database_dict):
+        """ Add a tab for the 'Database' section with text fields. """
+        tab = QWidget()
+        layout = QFormLayout()
+
+        for key, value in database_dict.items():
+            field = QLineEdit(str(value))
+            self.fields[(tab_title, key)] = field
+            layout.addRow(QLabel(key.capitalize()), field)
+
+        tab.setLayout(layout)
+        self.tabs.addTab(tab, tab_title)
+
+    def focus_field(self, tab_title, key=None):
+        """ Switch to a tab and focus one of its fields, e.g. when opened from the command palette. """
+        for index in range(self.tabs.count()):
+            if self.tabs.tabText(index) == tab_title:
+                self.tabs.setCurrentIndex(index)
+                break
+        field = self.fields.get((tab_title, key))
+        if field is not None:
+            field.setFocus()
+
     def create_buttons(self):
         """ Add Save and Cancel buttons at the bottom of the dialog. """
         buttons_layout = QHBoxLayout()
@@ -187,7 +238,7 @@ class SettingsDialog(QDialog):
 
             for key in app_settings.app_defaults:
                 field = self.fields[("App Defaults", key)]
-                if key == "dark_mode":
+                if key in BOOLEAN_APP_DEFAULTS:
                     app_settings.app_defaults[key] = "True" if field.isChecked() else "False"
                 elif isinstance(field, QComboBox):
                     app_settings.app_defaults[key] = field.currentText()
@@ -196,26 +247,37 @@ class SettingsDialog(QDialog):
 
             for key in app_settings.logging_defaults:
                 field = self.fields[("Logging Settings", key)]
-                if isinstance(field, QComboBox):
-                    if key == "level":
+                if key in BOOLEAN_LOGGING_DEFAULTS:
+                    app_settings.logging_defaults[key] = "True" if field.isChecked() else "False"
+                elif isinstance(field, QComboBox):
+                    if key in LOGGING_CHOICES:
                         app_settings.logging_defaults[key] = field.currentText()
                     else:
                         app_settings.logging_defaults[key] = field.currentText() == "True"
                 else:
                     app_settings.logging_defaults[key] = field.text().strip()
 
+            for key in app_settings.database_defaults:
+                app_settings.database_defaults[key] = self.fields[("Database", key)].text().strip()
+
             self.save_to_file()
             logging.info("Settings successfully saved.")
+
+            # Apply the new settings to the running application
+            config = getattr(self.parent(), 'config', None)
+            if config is not None:
+                config.reload()
             self.close()
 
         except Exception as e:
             logging.error(f"Failed to save settings: {e}", exc_info=True)
 
     def save_to_file(self):
-        """ Write the updated settings back to the settings.py file. """
+        """ Write the updated settings back to the settings.py file (applied by Config.reload). """
         with open('config/settings.py', 'w') as f:
             f.write(f"about_info = {app_settings.about_info}\n")
             f.write(f"modules = {app_settings.modules}\n")
             f.write(f"app_defaults = {app_settings.app_defaults}\n")
             f.write(f"logging_defaults = {app_settings.logging_defaults}\n")
+            f.write(f"database_defaults = {app_settings.database_defaults}\n")
         logging.info("Settings file updated.")
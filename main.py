@@ -1,26 +1,32 @@
 import sys
-import os
 import logging
 import time
-from PyQt6.QtWidgets import QApplication, QMainWindow
-from PyQt6.QtGui import QIcon
+from modules import tracing  # Imported first so module import time can be traced
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication, QMainWindow, QMenuBar, QStatusBar, QToolBar
 from config.app_config import Config
-from config.settings_dialog import SettingsDialog
-from modules import error_handling, database, menu, status_bar, toolbar, about
+from modules import actions, error_handling, icons, menu, status_bar, themes, toolbar, watchdog
+from modules.lazy_loader import get_subsystem
+from modules.startup import StartupScheduler
 from modules.themes import apply_theme
 
-# Ensure the logs directory exists before configuring logging
-os.makedirs('logs', exist_ok=True)
+# Optional subsystems are imported on first use rather than at startup
+database = get_subsystem('database')
 
-# Configure logging to output to both a file and console
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s:%(levelname)s:%(message)s',
-    handlers=[
-        logging.FileHandler(os.path.normpath("logs/app.log")),
-        logging.StreamHandler()
-    ]
-)
+# Keep records logged before the configuration is loaded until logging is set up from it
+error_handling.capture_early_logging()
+
+# Widget of each optional UI component, shown or hidden when its module is toggled
+COMPONENT_WIDGETS = {'menu': QMenuBar, 'status_bar': QStatusBar, 'toolbar': QToolBar}
+
+# Settings re-applied while the application runs (logging is reconfigured by the Config);
+# changes to other settings take effect at the next start
+LIVE_SETTINGS = {
+    'app.dark_mode', 'app.theme_hot_reload', 'app.config_hot_reload', 'app.start_maximized',
+    'app.screen_width', 'app.screen_height', 'app.stall_threshold_ms',
+    'modules.logging', 'modules.database', 'modules.menu', 'modules.status_bar', 'modules.toolbar',
+    'database.path', 'database.timeout_s',
+}
 
 def format_elapsed_time(elapsed_time):
     """
@@ -34,15 +40,15 @@ def format_elapsed_time(elapsed_time):
     return f"{int(hours)}h {int(minutes)}m {seconds:.2f}s"
 
 
-def setup_logging_if_enabled(config):
+def start_watchdog_if_enabled(config):
     """
-    Setup logging if the logging module is enabled in the configuration.
+    Start the GUI-thread stall watchdog unless its threshold is set to 0.
 
     :param config: The application configuration object.
     """
-    if config.is_module_enabled('logging'):
-        error_handling.setup_logging()
-        logging.info("Logging initialized.")
+    threshold_ms = config.settings.app.stall_threshold_ms
+    if threshold_ms > 0:
+        watchdog.start_watchdog(threshold_ms)
 
 
 def apply_dark_mode_if_enabled(app, config):
@@ -52,8 +58,7 @@ def apply_dark_mode_if_enabled(app, config):
     :param app: The QApplication instance.
     :param config: The configuration object.
     """
-    dark_mode = config.get_app_setting('dark_mode', 'False') == 'True'
-    if dark_mode:
+    if config.settings.app.dark_mode:
         logging.info("Applying dark mode.")
         apply_theme(app, 'resources/styles/dark_theme.json', show_message=False)
     else:
@@ -70,7 +75,7 @@ def initialize_database_if_enabled(config):
     if config.is_module_enabled('database'):
         logging.info("Initializing database.")
         try:
-            database.main()
+            database.main(config.settings.database.path, config.settings.database.timeout_s)
             logging.info("Database initialized successfully.")
         except Exception as db_error:
             logging.error(f"Failed to initialize database: {db_error}", exc_info=True)
@@ -89,6 +94,9 @@ class MainWindow(QMainWindow):
         self.app = app        # Store the app reference for future use
         self.init_ui()
 
+        # Re-apply settings edited while the application runs
+        self.config.changed.connect(self.apply_config_changes)
+
     def init_ui(self):
         """
         Initializes the main user interface elements of the window 
@@ -98,53 +106,162 @@ class MainWindow(QMainWindow):
         logging.info("Initializing UI.")
 
         # Set window title and icon from the configuration
-        self.setWindowTitle(self.config.get_about_info('name'))  # Fetch from app_config.py
-        self.setWindowIcon(QIcon(self.config.get_about_info('icon')))  # Fetch from app_config.py
+        with tracing.span('window.title_and_icon'):
+            self.setWindowTitle(self.config.get_about_info('name'))  # Fetch from app_config.py
+            self.setWindowIcon(icons.get_icon(self.config.get_about_info('icon')))  # Fetch from app_config.py
 
         # Fetch window settings
-        screen_width = int(self.config.get_app_setting('screen_width', 800))
-        screen_height = int(self.config.get_app_setting('screen_height', 600))
-        start_maximized = self.config.get_app_setting('start_maximized', 'True') == 'True'
+        settings = self.config.settings.app
+        screen_width, screen_height = settings.screen_width, settings.screen_height
+        start_maximized = settings.start_maximized
+
+        # Apply the theme before the window is shown so the first paint is
+        # already themed and no visible widgets have to be re-polished
+        with tracing.span('theme.apply_dark_mode'):
+            apply_dark_mode_if_enabled(self.app, self.config)
+
+        # Re-apply the active theme whenever its file is edited, if enabled
+        if settings.theme_hot_reload:
+            themes.enable_hot_reload(self.app)
+
+        # Show the themed skeleton window, maximized or in the configured size
+        with tracing.span('window.show', maximized=start_maximized):
+            if start_maximized:
+                logging.info("Maximizing window as per configuration.")
+                self.showMaximized()  # Maximize the window if the setting is True
+            else:
+                logging.info(f"Setting window size to {screen_width}x{screen_height}.")
+                self.setGeometry(100, 100, screen_width, screen_height)
+                self.show()  # Show window in defined size if maximization is False
+
+        # Build the menu, status bar, and toolbar as stages from the event loop
+        self.startup = StartupScheduler(window=self)
+        self.schedule_components(self.startup)
+        self.startup.start()
 
-        # Set window size or maximize based on configuration
-        if start_maximized:
-            logging.info("Maximizing window as per configuration.")
-            self.showMaximized()  # Maximize the window if the setting is True
-        else:
-            logging.info(f"Setting window size to {screen_width}x{screen_height}.")
-            self.setGeometry(100, 100, screen_width, screen_height)
-            self.show()  # Show window in defined size if maximization is False
+        end_time = time.time()
+        logging.info(f"UI skeleton initialized in {format_elapsed_time(end_time - start_time)}")
+
+    def component_builders(self):
+        """
+        Lists the optional UI components in the order they should be built.
 
-        # Apply dark mode if enabled in settings
-        apply_dark_mode_if_enabled(self.app, self.config)
+        :return: A dict of component name to the callback building it.
+        """
+        return {
+            'menu': lambda: menu.create_menu(self, self.config),
+            'status_bar': lambda: status_bar.create_status_bar(self),
+            'toolbar': lambda: toolbar.create_toolbar(self),
+        }
 
-        # Initialize the menu, status bar, and toolbar based on configuration
-        self.initialize_components()
+    def component_stages(self):
+        """
+        Lists the enabled UI components in the order they should be built.
 
-        self.statusBar().showMessage("Status bar is visible.")
-        end_time = time.time()
-        logging.info(f"UI initialized in {format_elapsed_time(end_time - start_time)}")
+        :return: A list of (name, callback) tuples.
+        """
+        return [(name, callback) for name, callback in self.component_builders().items()
+                if self.config.is_module_enabled(name)]
 
-    def initialize_components(self):
+    def schedule_components(self, scheduler):
         """
-        Initializes components like menu, status bar, and toolbar
-        based on the configuration settings.
+        Registers the enabled UI components as startup stages.
+
+        :param scheduler: The StartupScheduler that runs the stages.
+        """
+        for priority, (name, callback) in enumerate(self.component_stages()):
+            scheduler.add_stage(name, callback, priority=priority)
+
+        # The initial status message needs the status bar (if it is enabled)
+        scheduler.add_stage(
+            'status_message',
+            lambda: status_bar.update_status_bar(self.statusBar(), "Status bar is visible.", log_level=None),
+            priority=len(scheduler.stages),
+            depends_on=[name for name in ('status_bar',) if name in scheduler.stages]
+        )
+
+        # Window-wide shortcuts such as Ctrl+Shift+P for the command palette
+        scheduler.add_stage(
+            'shortcuts',
+            lambda: self.addActions(actions.get_registry(self).group('window')),
+            priority=len(scheduler.stages)
+        )
+
+    def apply_config_changes(self, changes):
+        """
+        Re-applies the settings that changed while the application runs
+        (connected to Config.changed), touching only the affected parts.
+
+        :param changes: Dict of 'section.option' to (old value, new value).
         """
         try:
-            if self.config.is_module_enabled('menu'):
-                logging.info("Creating menu.")
-                menu.create_menu(self, self.config)
-
-            if self.config.is_module_enabled('status_bar'):
-                logging.info("Creating status bar.")
-                status_bar.create_status_bar(self)
-
-            if self.config.is_module_enabled('toolbar'):
-                logging.info("Creating toolbar.")
-                toolbar.create_toolbar(self)
-        except AttributeError as e:
-            logging.error(f"Error initializing components: {e}", exc_info=True)
-            raise
+            settings = self.config.settings
+            if 'app.dark_mode' in changes:
+                apply_dark_mode_if_enabled(self.app, self.config)
+            if 'app.theme_hot_reload' in changes:
+                if settings.app.theme_hot_reload:
+                    themes.enable_hot_reload(self.app)
+                else:
+                    themes.disable_hot_reload()
+            if 'app.config_hot_reload' in changes:
+                if settings.app.config_hot_reload:
+                    self.config.enable_hot_reload()
+                else:
+                    self.config.disable_hot_reload()
+            if changes.keys() & {'app.start_maximized', 'app.screen_width', 'app.screen_height'}:
+                self.apply_window_geometry()
+            if 'app.stall_threshold_ms' in changes:
+                watchdog.stop_watchdog()
+                start_watchdog_if_enabled(self.config)
+
+            for name, build in self.component_builders().items():
+                if f'modules.{name}' in changes:
+                    self.set_component_enabled(name, build, getattr(settings.modules, name))
+            if changes.keys() & {'modules.database', 'database.path', 'database.timeout_s'}:
+                try:
+                    initialize_database_if_enabled(self.config)
+                except Exception:
+                    pass  # Already logged; the application keeps running without the database
+
+            restart = [key for key in changes if key not in LIVE_SETTINGS and not key.startswith('logging.')]
+            if restart:
+                logging.info(f"Changed settings applied at the next start: {', '.join(restart)}")
+        except Exception as e:
+            # Raised from a Qt slot, an exception would abort the application
+            logging.error(f"Failed to apply configuration changes: {e}", exc_info=True)
+
+    def apply_window_geometry(self):
+        """
+        Maximizes the window or restores it to the configured size.
+        """
+        settings = self.config.settings.app
+        if settings.start_maximized:
+            logging.info("Maximizing window as per configuration.")
+            self.showMaximized()
+        else:
+            logging.info(f"Setting window size to {settings.screen_width}x{settings.screen_height}.")
+            self.showNormal()
+            self.resize(settings.screen_width, settings.screen_height)
+
+    def set_component_enabled(self, name, build, enabled):
+        """
+        Shows or hides an optional UI component, building it the first time it is enabled.
+
+        :param name: The component's module name, e.g. 'toolbar'.
+        :param build: Callback building the component.
+        :param enabled: Whether the component should be shown.
+        """
+        widget = self.findChild(COMPONENT_WIDGETS[name], options=Qt.FindChildOption.FindDirectChildrenOnly)
+        if widget is None:
+            if not enabled:
+                return
+            logging.info(f"Creating {name.replace('_', ' ')}.")
+            with tracing.span(f'{name}.create'):
+                build()
+            widget = self.findChild(COMPONENT_WIDGETS[name], options=Qt.FindChildOption.FindDirectChildrenOnly)
+        if widget is not None:
+            widget.setVisible(enabled)
+            logging.info(f"{name.replace('_', ' ').capitalize()} {'enabled' if enabled else 'disabled'}.")
 
 
 def main():
@@ -154,22 +271,37 @@ def main():
     """
     start_time = time.time()
 
+    # Enable the startup tracer when requested via --trace-startup or PYQT6IFY_TRACE
+    tracing.enable_from_environment(sys.argv)
+
     try:
         # Load configuration
-        config = Config()
+        with tracing.span('config.load'):
+            config = Config()
         logging.info("Configuration loaded successfully.")
 
-        # Setup logging based on configuration
-        setup_logging_if_enabled(config)
-
         logging.info("Starting application.")
 
         # Initialize QApplication and MainWindow
-        app = QApplication(sys.argv)
-        window = MainWindow(config, app)
-
-        # Initialize the database if enabled
-        initialize_database_if_enabled(config)
+        with tracing.span('qt.create_application'):
+            app = QApplication(sys.argv)
+        with tracing.span('watchdog.start'):
+            start_watchdog_if_enabled(config)
+        with tracing.span('window.create'):
+            window = MainWindow(config, app)
+
+        # Apply edits to config.ini and settings.py without a restart, if enabled
+        if config.settings.app.config_hot_reload:
+            config.enable_hot_reload()
+
+        # Initialize the database (if enabled) as the last startup stage
+        window.startup.add_stage('database', lambda: initialize_database_if_enabled(config), priority=100)
+
+        # Startup is complete once every stage has run from the event loop
+        window.startup.finished.connect(tracing.finish)
+        window.startup.finished.connect(lambda: logging.info(f"Icon registry: {icons.registry.stats()}"))
+        if watchdog.watchdog is not None:
+            window.startup.finished.connect(lambda: logging.info(f"Stall watchdog: {watchdog.stats()}"))
 
         # Execute the application
         app.exec()
@@ -178,10 +310,25 @@ def main():
         logging.error(f"An error occurred: {e}", exc_info=True)
 
     finally:
+        # Flush the startup trace if startup failed before it was written
+        tracing.finish()
+
+        if watchdog.watchdog is not None:
+            logging.info(f"Stall watchdog: {watchdog.stats()}")
+            watchdog.stop_watchdog()
+
         # Log the total application runtime
         elapsed_time = time.time() - start_time
         logging.info(f"Application ran for {format_elapsed_time(elapsed_time)}")
         logging.info("Closing application.")
+
+        # Report what the log suppression filter dropped
+        error_handling.flush_suppressed()
+        if error_handling.suppression_stats() is not None:
+            logging.info(f"Log suppression: {error_handling.suppression_stats()}")
+
+        # Write any records still queued by async logging
+        error_handling.disable_async_logging()
         sys.exit(0)
 
 
@@ -1,6 +1,6 @@
 from PyQt6.QtWidgets import QMessageBox
-from PyQt6.QtGui import QIcon
 import logging
+from modules import icons
 
 def show_about_dialog(window, config):
     """
@@ -20,7 +20,7 @@ def show_about_dialog(window, config):
     # Create the QMessageBox for the About dialog
     about_dialog = QMessageBox(window)
     about_dialog.setWindowTitle(f"About {app_name}")
-    about_dialog.setWindowIcon(QIcon(icon_path))
+    about_dialog.setWindowIcon(icons.get_icon(icon_path))
 
     # Set the primary content of the dialog with rich text formatting
     about_dialog.setText(f"""
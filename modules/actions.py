@@ -0,0 +1,202 @@
+import logging
+from dataclasses import dataclass
+from PyQt6.QtGui import QAction, QIcon, QKeySequence
+from modules import icons
+from modules.lazy_loader import get_subsystem
+from modules.status_bar import update_status_bar
+
+# The command palette and the log viewer are only imported when first opened
+command_palette = get_subsystem('command_palette')
+log_viewer = get_subsystem('log_viewer')
+
+
+@dataclass(frozen=True)
+class ActionSpec:
+    """
+    Declarative description of an application command.
+
+    :param id: Unique identifier, e.g. 'file.new'.
+    :param label: Text shown in menus and tooltips.
+    :param icon: Icon name or path, or None.
+    :param shortcut: Key sequence string, e.g. 'Ctrl+N', or None.
+    :param status_message: Message shown in the status bar when triggered, or None.
+    :param handler: Called with the window when triggered, or None.
+    :param groups: Names of the groups the action belongs to, e.g. ('file',).
+    """
+    id: str
+    label: str
+    icon: str = None
+    shortcut: str = None
+    status_message: str = None
+    handler: object = None
+    groups: tuple = ()
+
+
+# Commands shared by the menu bar, the toolbar and the toolbar context menu
+DEFAULT_ACTIONS = [
+    ActionSpec('file.new', 'New', icon='new', shortcut='Ctrl+N',
+               status_message="New file created", groups=('file',)),
+    ActionSpec('file.open', 'Open', icon='open', shortcut='Ctrl+O',
+               status_message="File opened", groups=('file',)),
+    ActionSpec('file.save', 'Save', icon='save', shortcut='Ctrl+S',
+               status_message="File saved", groups=('file',)),
+    ActionSpec('file.print', 'Print', icon='print', shortcut='Ctrl+P',
+               status_message="Printing file"),
+    ActionSpec('file.exit', 'Exit', icon='exit', shortcut='Ctrl+Q',
+               handler=lambda window: window.close()),
+    ActionSpec('edit.undo', 'Undo', icon='undo', shortcut='Ctrl+Z',
+               status_message="Undo action", groups=('edit',)),
+    ActionSpec('edit.redo', 'Redo', icon='redo', shortcut='Ctrl+Y',
+               status_message="Redo action", groups=('edit',)),
+    ActionSpec('edit.cut', 'Cut', icon='cut', shortcut='Ctrl+X',
+               status_message="Cut action", groups=('edit',)),
+    ActionSpec('edit.copy', 'Copy', icon='copy', shortcut='Ctrl+C',
+               status_message="Copy action", groups=('edit',)),
+    ActionSpec('edit.paste', 'Paste', icon='paste', shortcut='Ctrl+V',
+               status_message="Paste action", groups=('edit',)),
+    ActionSpec('edit.select_all', 'Select All', icon='select-all', shortcut='Ctrl+A',
+               status_message="Selected all"),
+    ActionSpec('view.command_palette', 'Command Palette...', shortcut='Ctrl+Shift+P',
+               handler=lambda window: command_palette.show_palette(window), groups=('window',)),
+    ActionSpec('view.log_viewer', 'Log Viewer', shortcut='Ctrl+Shift+L',
+               handler=lambda window: log_viewer.toggle_log_viewer(window), groups=('window',)),
+]
+
+
+class ActionRegistry:
+    """
+    Creates each command's QAction once per window, on first use, so the
+    menu, toolbar and context menus share the same instances (and therefore
+    the same enabled, visible and checked state).
+    """
+
+    def __init__(self, window, specs=DEFAULT_ACTIONS):
+        """
+        Initialize the registry.
+
+        :param window: The main window, used as the actions' parent and passed to handlers.
+        :param specs: The ActionSpecs to register.
+        """
+        self.window = window
+        self._specs = {}
+        self._actions = {}
+        self._listeners = []
+        for spec in specs:
+            self.register(spec)
+
+    def register(self, spec):
+        """
+        Add or replace an action spec. Replacing a spec discards the action
+        created from the previous one.
+
+        :param spec: The ActionSpec to register.
+        """
+        self._specs[spec.id] = spec
+        self._actions.pop(spec.id, None)
+        for listener in self._listeners:
+            listener(spec)
+
+    def add_listener(self, listener):
+        """
+        Call a function with every spec registered from now on.
+
+        :param listener: Callable taking an ActionSpec.
+        """
+        self._listeners.append(listener)
+
+    def specs(self):
+        """Return the registered specs in registration order."""
+        return list(self._specs.values())
+
+    def get(self, action_id):
+        """
+        Return the QAction for an id, creating and connecting it on first use.
+
+        :param action_id: The action id.
+        :return: The QAction.
+        :raises KeyError: If no action with this id is registered.
+        """
+        action = self._actions.get(action_id)
+        if action is None:
+            action = self._create(self._specs[action_id])
+            self._actions[action_id] = action
+        return action
+
+    def _create(self, spec):
+        """Build the QAction for a spec and connect its handler and status message."""
+        action = QAction(icons.get_icon(spec.icon) if spec.icon else QIcon(), spec.label, self.window)
+        action.setObjectName(spec.id)
+        if spec.shortcut:
+            action.setShortcut(QKeySequence(spec.shortcut))
+        if spec.handler is not None:
+            action.triggered.connect(lambda checked=False, handler=spec.handler: handler(self.window))
+        if spec.status_message:
+            action.triggered.connect(lambda checked=False, message=spec.status_message: self._show_status(message))
+        return action
+
+    def _show_status(self, message):
+        """Show an action's status message, if the window has a status bar."""
+        try:
+            update_status_bar(self.window.statusBar(), message)
+        except Exception as e:
+            logging.error(f"Failed to update status bar: {e}")
+
+    def group(self, name):
+        """
+        Return the QActions of a group in registration order.
+
+        :param name: The group name.
+        :return: A list of QActions.
+        """
+        return [self.get(spec.id) for spec in self._specs.values() if name in spec.groups]
+
+    def set_group_visible(self, name, visible):
+        """
+        Show or hide every action in a group, wherever it is displayed.
+
+        :param name: The group name.
+        :param visible: Whether the actions should be visible.
+        """
+        for action in self.group(name):
+            action.setVisible(visible)
+
+    def set_group_enabled(self, name, enabled):
+        """
+        Enable or disable every action in a group.
+
+        :param name: The group name.
+        :param enabled: Whether the actions should be enabled.
+        """
+        for action in self.group(name):
+            action.setEnabled(enabled)
+
+    def populate(self, widget, layout):
+        """
+        Add actions to a menu or toolbar.
+
+        :param widget: The QMenu or QToolBar to fill.
+        :param layout: Action ids in display order; None adds a separator.
+        """
+        for action_id in layout:
+            if action_id is None:
+                widget.addSeparator()
+            else:
+                widget.addAction(self.get(action_id))
+
+    def created_count(self):
+        """Return how many QActions have been created so far."""
+        return len(self._actions)
+
+
+def get_registry(window):
+    """
+    Return the action registry of a window, creating it on first use.
+
+    :param window: The main application window.
+    :return: The window's ActionRegistry.
+    """
+    registry = getattr(window, 'action_registry', None)
+    if registry is None:
+        registry = ActionRegistry(window)
+        window.action_registry = registry
+    return registry
@@ -0,0 +1,541 @@
+import bisect
+import logging
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QDialog, QLineEdit, QListWidget, QListWidgetItem, QVBoxLayout
+import config.settings as app_settings
+from modules import actions, menu, theme_index, themes
+from modules.status_bar import update_status_bar
+
+# Id of the action that opens the palette (not listed in the palette itself)
+PALETTE_ACTION_ID = 'view.command_palette'
+
+MAX_RESULTS = 50
+
+# Searchable fields of an entry; see SearchIndex
+FIELDS = ('label', 'words', 'initials', 'detail')
+
+# Above this many candidate lines, one scan of a whole field is cheaper than a scan per line
+MAX_CANDIDATE_LINES = 64
+
+# Every indexed line ends with this separator and the slot of its entry
+SLOT_SEPARATOR = '\x00'
+
+# Characters that separate the words of a label
+WORD_SEPARATORS = ' ._-/:>()'
+_WORD_PATTERN = re.compile(f'[^{re.escape(WORD_SEPARATORS)}]+')
+
+
+@dataclass(frozen=True)
+class PaletteEntry:
+    """
+    One searchable command.
+
+    :param id: Unique identifier, e.g. 'action:file.new' or 'theme:dark_theme'.
+    :param label: Text shown in the palette and matched first.
+    :param category: Group shown next to the label ('Action', 'Theme', 'Setting').
+    :param detail: Extra searchable text, e.g. a shortcut or setting key.
+    :param callback: Called without arguments when the entry is chosen.
+    """
+    id: str
+    label: str
+    category: str
+    detail: str = ''
+    callback: object = None
+
+
+def normalize_query(query):
+    """Lowercase a query and collapse its whitespace."""
+    return ' '.join(query.lower().split())
+
+
+def word_initials(text):
+    """Return the first character of every word in a normalized text."""
+    return ''.join(word[0] for word in _WORD_PATTERN.findall(text))
+
+
+def word_suffixes(text):
+    """Return the tails of a normalized text starting at its second, third, ... word."""
+    return [text[match.start():] for match in _WORD_PATTERN.finditer(text)][1:]
+
+
+def line_grams(line):
+    """
+    Return the characters and character pairs of a line, with the first
+    character also paired with a leading newline ('\\nt' for 'toggle').
+
+    :param line: A normalized line of text.
+    :return: A set of strings of length one or two.
+    """
+    return set(line) | {first + second for first, second in zip('\n' + line, line)}
+
+
+def query_tiers(query):
+    """
+    Compile the ranking tiers for a query, best first. Every pattern starts
+    with a literal character, so the regular expression engine can skip
+    ahead to candidate positions, and none of them backtracks. Each one
+    then consumes the rest of the line and captures the slot at its end,
+    so findall returns the slot of every matching line, once.
+
+    :param query: Normalized query (see normalize_query).
+    :return: A list of (field, grams, pattern) tuples; field names the
+             flattened text to scan, and grams are characters and
+             character pairs (see line_grams) every matching line contains.
+    """
+    chars = [char for char in query if char != ' ']
+    # '[^\\n\\x00X]*X' finds the next X before the end of the line's text without backtracking
+    subsequence = re.escape(chars[0]) + ''.join(
+        f'[^\\n\\x00{re.escape(char)}]*{re.escape(char)}' for char in chars[1:])
+    line_slot = '[^\\n\\x00]*\\x00([0-9]+)'
+    line_prefix = re.compile(f'\\n{re.escape(query)}{line_slot}')
+    subsequence = re.compile(subsequence + line_slot)
+    char_grams = frozenset(chars)
+    substring_grams = char_grams | {query[i:i + 2] for i in range(len(query) - 1)}
+    prefix_grams = substring_grams | {'\n' + query[0]}
+    return [
+        ('label', prefix_grams, line_prefix),        # The label starts with the query
+        ('words', prefix_grams, line_prefix),        # A later word of it does
+        ('label', substring_grams, re.compile(re.escape(query) + line_slot)),  # It contains the query
+        ('initials', char_grams, subsequence),  # Its characters start words in order ('cp': Command Palette)
+        ('label', char_grams, subsequence),     # Its characters appear in the label in order
+        ('detail', char_grams, subsequence),    # ... or in the category, shortcut or key
+    ]
+
+
+class SearchIndex:
+    """
+    Index over palette entries for keystroke-rate search.
+
+    Every entry gets a slot, and its label, word initials and details are
+    appended as one line each to a newline-separated string per field; the
+    'words' field holds one line per later word of a label for the
+    word-prefix tier. Each line ends with SLOT_SEPARATOR and its slot.
+    Every ranking tier (see query_tiers) is then a regular expression
+    findall done in C that returns the matching slots, and the search stops
+    after the tier that fills the limit; each tier's matches are sorted by
+    label before the results are truncated, so they are always the
+    best-ranked entries.
+
+    For each field, the lines containing each character and character pair
+    (see line_grams) are also kept as a bitmask, so a tier whose required
+    characters and pairs appear together in only a few lines scans just
+    those lines, and none if no line has them all. While the user types, a query that
+    extends a previous query which matched fewer than `limit` entries only
+    rescans the lines of those entries, since every tier of the longer
+    query implies a tier of the shorter one.
+
+    Adding an entry appends its lines and sets their bits, and removing one
+    blanks its lines in place, so neither touches the other entries. The
+    blanked lines are dropped once they make up half of the index.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.version = 0  # Incremented whenever entries are added or removed
+        self._entries = {}
+        self._order = []       # (normalized label, id) tuples, sorted, listed for an empty query
+        self._slots = []       # Id of the entry in each slot, None once removed
+        # Sort key of each slot's entry; the separator sorts below every character,
+        # so the keys are in the same order as the (label, id) tuples of _order
+        self._sort_keys = []
+        self._slot_of = {}
+        self._word_lines = []  # (first line, line count) in the 'words' field of each slot
+        self._lines = {field: [] for field in FIELDS}
+        self._line_starts = {field: [] for field in FIELDS}  # Offset of each line in the haystack
+        self._gram_lines = {field: {} for field in FIELDS}   # gram -> bitmask of the lines containing it
+        self._haystacks = None
+        self._last_search = None  # (query, slots) of the last search that found every match
+        self._tier_cache = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, entry_id):
+        return entry_id in self._entries
+
+    def add(self, entry):
+        """
+        Add an entry, replacing an existing entry with the same id.
+
+        :param entry: The PaletteEntry to add.
+        """
+        self.remove(entry.id)
+        label = normalize_query(entry.label)
+        slot = len(self._slots)
+        self._slots.append(entry.id)
+        self._sort_keys.append(f'{label}{SLOT_SEPARATOR}{entry.id}')
+        self._slot_of[entry.id] = slot
+        self._entries[entry.id] = entry
+        bisect.insort(self._order, (label, entry.id))
+
+        self._append_line('label', label, slot)
+        self._append_line('initials', word_initials(label), slot)
+        self._append_line('detail', normalize_query(f'{entry.category} {entry.detail}'), slot)
+        suffixes = word_suffixes(label)
+        self._word_lines.append((len(self._lines['words']), len(suffixes)))
+        for suffix in suffixes:
+            self._append_line('words', suffix, slot)
+        self._changed()
+
+    def remove(self, entry_id):
+        """
+        Remove an entry if present.
+
+        :param entry_id: Id of the entry to remove.
+        """
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        slot = self._slot_of.pop(entry_id)
+        self._slots[slot] = None
+        del self._order[bisect.bisect_left(self._order, (normalize_query(entry.label), entry_id))]
+
+        first, count = self._word_lines[slot]
+        for field, numbers in (('label', [slot]), ('initials', [slot]), ('detail', [slot]),
+                               ('words', range(first, first + count))):
+            for number in numbers:
+                self._blank_line(field, number)
+        self._changed()
+
+        if len(self._slots) > 64 and len(self._entries) * 2 < len(self._slots):
+            self._compact()
+
+    def _append_line(self, field, line, slot):
+        """Append a line for a slot to a field and index its characters."""
+        lines, line_starts = self._lines[field], self._line_starts[field]
+        number = len(lines)
+        # The haystack starts with a newline, and every line is followed by one
+        line_starts.append(line_starts[-1] + len(lines[-1]) + 1 if lines else 1)
+        line = line.replace(SLOT_SEPARATOR, ' ')
+        lines.append(f'{line}{SLOT_SEPARATOR}{slot}')
+        gram_lines, bit = self._gram_lines[field], 1 << number
+        for gram in line_grams(line):
+            gram_lines[gram] = gram_lines.get(gram, 0) | bit
+
+    def _blank_line(self, field, number):
+        """Replace a line with spaces, which no query matches, keeping the offsets of the others."""
+        lines, gram_lines = self._lines[field], self._gram_lines[field]
+        mask = ~(1 << number)
+        for gram in line_grams(lines[number].partition(SLOT_SEPARATOR)[0]):
+            gram_lines[gram] &= mask
+        lines[number] = ' ' * len(lines[number])
+
+    def _compact(self):
+        """Rebuild the index from its remaining entries, dropping blanked lines."""
+        entries = [self._entries[entry_id] for entry_id in self._slots if entry_id is not None]
+        version = self.version
+        self.__init__()
+        for entry in entries:
+            self.add(entry)
+        self.version = version + 1
+
+    def _changed(self):
+        self.version += 1
+        self._haystacks = None
+        self._last_search = None
+
+    def ids(self, prefix=''):
+        """Return the ids of all entries starting with a prefix."""
+        return [entry_id for entry_id in self._entries if entry_id.startswith(prefix)]
+
+    def get(self, entry_id):
+        """Return the entry with an id, or None."""
+        return self._entries.get(entry_id)
+
+    def _narrowed_lines(self, slots):
+        """Return a bitmask per field of the lines belonging to some slots."""
+        slot_mask = word_mask = 0
+        for slot in slots:
+            slot_mask |= 1 << slot
+            first, count = self._word_lines[slot]
+            word_mask |= ((1 << count) - 1) << first
+        return {'label': slot_mask, 'initials': slot_mask, 'detail': slot_mask, 'words': word_mask}
+
+    def _spans(self, field, grams, narrowed=None):
+        """
+        Return the (start, end) ranges of a field's haystack worth scanning
+        for a tier: the whole haystack, or only the lines containing every
+        gram of the tier (and in narrowed, if given) if there are at most
+        MAX_CANDIDATE_LINES of them.
+        """
+        haystack, line_starts = self._haystacks[field], self._line_starts[field]
+        gram_lines = self._gram_lines[field]
+        mask = -1 if narrowed is None else narrowed[field]
+        for gram in grams:
+            mask &= gram_lines.get(gram, 0)
+        if mask < 0 or bin(mask).count('1') > MAX_CANDIDATE_LINES:
+            return [(0, len(haystack))]
+        spans = []
+        while mask:
+            number = (mask & -mask).bit_length() - 1
+            mask &= mask - 1
+            # Each span starts at the newline preceding its line
+            end = line_starts[number + 1] - 1 if number + 1 < len(line_starts) else len(haystack)
+            spans.append((line_starts[number] - 1, end))
+        return spans
+
+    def _tiers(self, query):
+        """Return the compiled tiers of a query, caching recent queries."""
+        tiers = self._tier_cache.get(query)
+        if tiers is None:
+            tiers = query_tiers(query)
+            self._tier_cache[query] = tiers
+            if len(self._tier_cache) > 64:
+                self._tier_cache.popitem(last=False)
+        return tiers
+
+    def search(self, query, limit=MAX_RESULTS):
+        """
+        Return the best matching entries for a query.
+
+        :param query: Text typed by the user; case and repeated spaces are ignored.
+        :param limit: Maximum number of results.
+        :return: A list of PaletteEntry objects, best match first.
+        """
+        query = normalize_query(query)
+        if not query:
+            return [self._entries[entry_id] for _, entry_id in self._order[:limit]]
+        if self._haystacks is None:
+            self._haystacks = {field: '\n' + '\n'.join(lines) for field, lines in self._lines.items()}
+
+        narrowed = None
+        if self._last_search is not None and query.startswith(self._last_search[0]):
+            narrowed = self._narrowed_lines(self._last_search[1])
+        results, found, spans = [], set(), {}
+
+        for field, grams, pattern in self._tiers(query):
+            if (field, grams) not in spans:
+                spans[field, grams] = self._spans(field, grams, narrowed)
+            tier = sorted(self._scan(field, pattern, spans[field, grams], found), key=self._sort_keys.__getitem__)
+            results.extend(self._entries[self._slots[slot]] for slot in tier[:limit - len(results)])
+            if len(results) >= limit:
+                return results
+        self._last_search = (query, found)
+        return results
+
+    def _scan(self, field, pattern, spans, found):
+        """
+        Scan spans of a field for a pattern.
+
+        :return: The set of slots with a match that are not in found yet;
+                 they are added to found.
+        """
+        haystack = self._haystacks[field]
+        if len(spans) == 1:
+            start, end = spans[0]
+            slots = set(map(int, pattern.findall(haystack, start, end)))
+        else:
+            slots = set()
+            for start, end in spans:
+                slots.update(map(int, pattern.findall(haystack, start, end)))
+        slots -= found
+        found |= slots
+        return slots
+
+
+class CommandPaletteIndex:
+    """
+    Builds and maintains the palette's search index from the window's
+    action registry, the installed themes and the settings keys. Actions
+    registered later are added as they are registered; themes are
+    re-synchronized whenever the theme index version changes.
+    """
+
+    def __init__(self, window):
+        """
+        Build the index for a window.
+
+        :param window: The main application window.
+        """
+        self.window = window
+        self.index = SearchIndex()
+        self._theme_version = None
+
+        registry = actions.get_registry(window)
+        for spec in registry.specs():
+            self.add_action(spec)
+        registry.add_listener(self.add_action)
+
+        self.add_dialog_entries()
+        self.add_setting_entries()
+        self.sync_themes()
+
+    def add_action(self, spec):
+        """
+        Index an action from the action registry.
+
+        :param spec: The ActionSpec of the action.
+        """
+        if spec.id == PALETTE_ACTION_ID:
+            return
+        registry = actions.get_registry(self.window)
+        self.index.add(PaletteEntry(
+            id=f'action:{spec.id}',
+            label=spec.label,
+            category='Action',
+            detail=spec.shortcut or '',
+            callback=lambda action_id=spec.id: registry.get(action_id).trigger(),
+        ))
+
+    def add_dialog_entries(self):
+        """Index the dialogs opened from the Settings and Help menus."""
+        config = getattr(self.window, 'config', None)
+        self.index.add(PaletteEntry(
+            id='dialog:settings', label='Config Defaults', category='Dialog', detail='settings preferences',
+            callback=lambda: menu.open_settings_dialog(self.window),
+        ))
+        if config is not None:
+            self.index.add(PaletteEntry(
+                id='dialog:about', label='About', category='Dialog', detail='help version',
+                callback=lambda: menu.about.show_about_dialog(self.window, config),
+            ))
+
+    def add_setting_entries(self):
+        """Index every settings key, opening the Settings dialog at its field."""
+        sections = [
+            ("About Info", app_settings.about_info),
+            ("Modules", app_settings.modules),
+            ("App Defaults", app_settings.app_defaults),
+            ("Logging Settings", app_settings.logging_defaults),
+            ("Database", app_settings.database_defaults),
+        ]
+        for tab_title, settings in sections:
+            for key in settings:
+                self.index.add(PaletteEntry(
+                    id=f'setting:{tab_title}:{key}',
+                    label=f"{tab_title}: {key.replace('_', ' ').capitalize()}",
+                    category='Setting',
+                    detail=key,
+                    callback=lambda tab=tab_title, field=key: menu.open_settings_dialog(self.window, tab, field),
+                ))
+
+    def sync_themes(self):
+        """Add, update and remove theme entries if the installed themes changed."""
+        theme_index.index.refresh()
+        if theme_index.index.version == self._theme_version:
+            return
+        current = set()
+        for entry in theme_index.index.entries():
+            entry_id = f'theme:{entry.name}'
+            current.add(entry_id)
+            self.index.add(PaletteEntry(
+                id=entry_id,
+                label=f'Theme: {entry.display_name}',
+                category='Theme',
+                detail=entry.name,
+                callback=lambda path=entry.path, name=entry.display_name: self.apply_theme(path, name),
+            ))
+        for entry_id in self.index.ids('theme:'):
+            if entry_id not in current:
+                self.index.remove(entry_id)
+        self._theme_version = theme_index.index.version
+
+    def apply_theme(self, theme_file, theme_name):
+        """Apply a theme chosen from the palette."""
+        if themes.apply_theme(self.window.app, theme_file, show_message=False):
+            update_status_bar(self.window.statusBar(), f"Theme applied: {theme_name}")
+
+    def search(self, query, limit=MAX_RESULTS):
+        """Search the index (see SearchIndex.search)."""
+        return self.index.search(query, limit)
+
+
+class CommandPalette(QDialog):
+    """Popup with a search field and the matching commands."""
+
+    def __init__(self, palette_index, parent=None):
+        """
+        Initialize the palette.
+
+        :param palette_index: The CommandPaletteIndex to search.
+        :param parent: Parent widget (the main window).
+        """
+        super().__init__(parent, Qt.WindowType.Popup)
+        self.palette_index = palette_index
+        self.setMinimumWidth(480)
+
+        self.search_field = QLineEdit()
+        self.search_field.setPlaceholderText("Type a command, theme or setting")
+        self.search_field.textChanged.connect(self.update_results)
+        self.search_field.returnPressed.connect(self.run_selected)
+        self.search_field.installEventFilter(self)
+
+        self.results = QListWidget()
+        self.results.itemActivated.connect(self.run_item)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(6, 6, 6, 6)
+        layout.addWidget(self.search_field)
+        layout.addWidget(self.results)
+        self.setLayout(layout)
+
+    def open(self):
+        """Reset the search, position the palette at the top of the window and show it."""
+        self.palette_index.sync_themes()
+        self.search_field.clear()
+        self.update_results('')
+        parent = self.parentWidget()
+        if parent is not None:
+            width = min(max(self.minimumWidth(), parent.width() // 2), parent.width())
+            self.resize(width, 360)
+            top_left = parent.mapToGlobal(parent.rect().topLeft())
+            self.move(top_left.x() + (parent.width() - width) // 2, top_left.y() + 40)
+        self.show()
+        self.search_field.setFocus()
+
+    def update_results(self, text):
+        """Show the entries matching the search text."""
+        self.results.clear()
+        for entry in self.palette_index.search(text):
+            detail = f'  ({entry.detail})' if entry.category == 'Action' and entry.detail else ''
+            item = QListWidgetItem(f'{entry.label}{detail}')
+            item.setData(Qt.ItemDataRole.UserRole, entry.id)
+            item.setToolTip(entry.category)
+            self.results.addItem(item)
+        if self.results.count():
+            self.results.setCurrentRow(0)
+
+    def eventFilter(self, watched, event):
+        """Move the selection with the arrow keys while typing."""
+        if watched is self.search_field and event.type() == event.Type.KeyPress:
+            key = event.key()
+            if key in (Qt.Key.Key_Down, Qt.Key.Key_Up) and self.results.count():
+                step = 1 if key == Qt.Key.Key_Down else -1
+                row = (self.results.currentRow() + step) % self.results.count()
+                self.results.setCurrentRow(row)
+                return True
+        return super().eventFilter(watched, event)
+
+    def run_selected(self):
+        """Run the selected entry."""
+        item = self.results.currentItem()
+        if item is not None:
+            self.run_item(item)
+
+    def run_item(self, item):
+        """Close the palette and run the entry of a result item."""
+        entry = self.palette_index.index.get(item.data(Qt.ItemDataRole.UserRole))
+        self.hide()
+        if entry is None or entry.callback is None:
+            return
+        try:
+            logging.info(f"Command palette: {entry.id}")
+            entry.callback()
+        except Exception as e:
+            logging.error(f"Failed to run command palette entry {entry.id}: {e}", exc_info=True)
+
+
+def show_palette(window):
+    """
+    Open the command palette of a window, building its index on first use.
+
+    :param window: The main application window.
+    """
+    palette = getattr(window, 'command_palette', None)
+    if palette is None:
+        palette = CommandPalette(CommandPaletteIndex(window), window)
+        window.command_palette = palette
+    palette.open()
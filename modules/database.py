@@ -2,21 +2,20 @@ import sqlite3
 from sqlite3 import Error
 import logging
 
-def create_connection(db_file):
-    """ create a database connection to the SQLite database specified by db_file """
+def create_connection(db_file, timeout=5.0):
+    """ create a database connection to the SQLite database specified by db_file,
+        waiting up to timeout seconds for a locked database """
     try:
-        conn = sqlite3.connect(db_file)
+        conn = sqlite3.connect(db_file, timeout=timeout)
         logging.info(f"Connected to SQLite database: {db_file}")
         return conn
     except Error as e:
         logging.error(f"Failed to connect to SQLite database: {e}")
         return None
 
-def main():
-    database = "my_pyqt_app.db"
-
+def main(database="my_pyqt_app.db", timeout=5.0):
     # create a database connection
-    conn = create_connection(database)
+    conn = create_connection(database, timeout)
 
     if conn is not None:
         logging.info("Database is ready for new project setup.")
@@ -1,73 +1,738 @@
+import atexit
+import collections
+import copy
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from modules.log_rotation import CompressingRotatingFileHandler
 
-def setup_logging(log_file='logs/app.log', max_bytes=5 * 1024 * 1024, backup_count=3):
+# Overflow policies of the async logging queue (see BoundedQueueHandler)
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'sample')
+
+DEFAULT_QUEUE_SIZE = 10000
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s [in %(filename)s:%(lineno)d]"
+
+# Log file formats: free text lines (LOG_FORMAT) or one JSON object per line
+LOG_FORMATS = ('text', 'json')
+
+# Records kept while waiting for setup_logging
+EARLY_RECORD_LIMIT = 1000
+
+
+def parse_level(name):
     """
-    Set up logging for the application with log rotation.
-    
-    :param log_file: The path to the log file.
-    :param max_bytes: Maximum size of the log file before rotation (in bytes).
-    :param backup_count: Number of backup log files to keep.
+    Convert a level name such as 'INFO' to its number.
+
+    :param name: The level name (case-insensitive) or number.
+    :return: The numeric logging level.
+    """
+    if isinstance(name, int):
+        return name
+    name = name.strip().upper()
+    level = int(name) if name.isdigit() else logging.getLevelName(name)
+    if not isinstance(level, int):
+        raise ValueError(f"Unknown logging level '{name}'")
+    return level
+
+
+def parse_module_levels(text):
+    """
+    Parse per-module levels written as 'menu=WARNING, status_bar=ERROR'.
+
+    :param text: The setting value; empty for none.
+    :return: A dict of module or logger name to numeric level.
+    """
+    levels = {}
+    for item in text.split(','):
+        if not item.strip():
+            continue
+        name, separator, level = item.partition('=')
+        if not separator or not name.strip():
+            raise ValueError(f"Invalid module level '{item.strip()}', expected name=LEVEL")
+        levels[name.strip()] = parse_level(level)
+    return levels
+
+
+class TextFormatter(logging.Formatter):
+    """Formats records with LOG_FORMAT, appending their structured fields to the message as key=value."""
+
+    def __init__(self, fmt=LOG_FORMAT):
+        super().__init__(fmt)
+
+    def formatMessage(self, record):
+        fields = getattr(record, 'fields', None)
+        if fields:
+            repeated = fields.get('repeated')
+            if repeated is not None:
+                record.message += f' (repeated {repeated} times)'
+            pairs = ' '.join(f'{key}={value}' for key, value in fields.items() if key != 'repeated')
+            if pairs:
+                record.message += ' ' + pairs
+        return super().formatMessage(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line (NDJSON) with the fields
+    ts (UTC, ISO 8601), level, logger, module, line and event (the message),
+    followed by the record's structured fields (see log_info), and exc or
+    stack when present. Structured fields never replace these keys.
+    """
+
+    RESERVED = ('ts', 'level', 'logger', 'module', 'line', 'event', 'exc', 'stack')
+
+    def __init__(self):
+        super().__init__()
+        # Compact output from the C encoder; values it cannot encode are written with str()
+        self._encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=str).encode
+        self._second = None
+        self._second_text = ''
+
+    def format(self, record):
+        second = int(record.created)
+        if second != self._second:
+            # The date and time are formatted once per second
+            self._second_text = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second))
+            self._second = second
+        entry = {
+            'ts': f"{self._second_text}.{int(record.msecs):03d}Z",
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'line': record.lineno,
+            'event': record.getMessage(),
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            for key, value in fields.items():
+                if key not in entry:
+                    entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = record.stack_info
+        return self._encode(entry)
+
+
+class ModuleLevelFilter(logging.Filter):
+    """
+    Applies per-module levels to records logged through the root logger
+    (the logging.info(...) calls used throughout the application). A
+    record's level is compared with the level of its module (file name
+    without .py, e.g. 'menu') or logger name, or default_level otherwise.
+    """
+
+    def __init__(self, module_levels, default_level):
+        """
+        Initialize the filter.
+
+        :param module_levels: Dict of module or logger name to numeric level.
+        :param default_level: Level of modules without their own.
+        """
+        super().__init__()
+        self.module_levels = module_levels
+        self.default_level = default_level
+
+    def filter(self, record):
+        level = self.module_levels.get(record.module)
+        if level is None:
+            level = self.module_levels.get(record.name, self.default_level)
+        return record.levelno >= level
+
+
+class LogSuppressionFilter(logging.Filter):
+    """
+    Drops repetitive records on the root logger before they are queued or
+    written, in three stages:
+
+    - Duplicates: a record identical to one written less than dedup_window_s
+      ago (same logger, level, call site and message) is dropped. The next
+      copy written, or a summary once the window has passed, carries the
+      number dropped as the structured field 'repeated'.
+    - Rate limit: each call site has a token bucket of rate_limit_burst
+      records refilled at rate_limit_per_s; records without a token are dropped.
+    - Sampling: once a logger (or, for the root logger, a module) has logged
+      sample_threshold records in the current second, only one in
+      sample_every further records is kept.
+
+    Records at exempt_level and above are only deduplicated. A stage is off
+    when its limit is 0. Dropped records are counted per stage and call site
+    (see stats).
+    """
+
+    # Identical records tracked at most; the oldest are forgotten first
+    MAX_TRACKED = 1024
+
+    def __init__(self, dedup_window_s=0, rate_limit_per_s=0, rate_limit_burst=0, sample_threshold=0,
+                 sample_every=10, exempt_level=logging.ERROR):
+        """
+        Initialize the filter.
+
+        :param dedup_window_s: Seconds during which identical records are dropped.
+        :param rate_limit_per_s: Records per second allowed per call site.
+        :param rate_limit_burst: Records a call site may log at once (defaults to rate_limit_per_s).
+        :param sample_threshold: Records per second per logger before sampling starts.
+        :param sample_every: Keep one in this many records while sampling.
+        :param exempt_level: Records at or above this level are never rate-limited or sampled.
+        """
+        super().__init__()
+        self.dedup_window_s = dedup_window_s
+        self.rate_limit_per_s = rate_limit_per_s
+        self.rate_limit_burst = max(rate_limit_burst or rate_limit_per_s, 1)
+        self.sample_threshold = sample_threshold
+        self.sample_every = max(sample_every, 1)
+        self.exempt_level = exempt_level
+        self.counts = {'deduplicated': 0, 'rate_limited': 0, 'sampled_out': 0}
+        self.dropped_by_site = collections.Counter()
+
+        self._lock = threading.Lock()
+        self._recent = collections.OrderedDict()  # record key -> [written at, dropped count, last dropped record]
+        self._buckets = {}                         # call site -> [tokens, updated at]
+        self._windows = {}                         # logger -> [second, records in the second]
+        self._next_prune = 0.0
+
+    def filter(self, record):
+        fields = getattr(record, 'fields', None)
+        if fields and 'repeated' in fields:
+            return True  # A summary of dropped duplicates
+        with self._lock:
+            keep, summaries = self._check(record, fields, time.monotonic())
+        # Summaries pass through this filter again, so they are written without the lock
+        self._write_summaries(summaries)
+        return keep
+
+    def _check(self, record, fields, now):
+        """Decide whether to keep a record; called with the lock held. Returns (keep, summaries)."""
+        site = (record.pathname, record.lineno)
+        summaries = ()
+        key = None
+        if self.dedup_window_s > 0:
+            if now >= self._next_prune:
+                summaries = self._prune(now)
+            key = (record.name, record.levelno, site, record.getMessage())
+            entry = self._recent.get(key)
+            if entry is not None and now - entry[0] < self.dedup_window_s:
+                entry[1] += 1
+                # Kept for the summary, without a traceback holding on to its frames
+                entry[2] = record if record.exc_info is None else _without_traceback(record)
+                return self._drop('deduplicated', site), summaries
+        if record.levelno < self.exempt_level:
+            if self.rate_limit_per_s > 0 and not self._take_token(site, now):
+                return self._drop('rate_limited', site), summaries
+            if self.sample_threshold > 0 and not self._sample(record, now):
+                return self._drop('sampled_out', site), summaries
+        if key is not None:
+            entry = self._recent.pop(key, None)
+            if entry is not None and entry[1]:
+                record.fields = {**(fields or {}), 'repeated': entry[1]}
+            self._recent[key] = [now, 0, None]
+            if len(self._recent) > self.MAX_TRACKED:
+                summaries += self._forget_oldest()
+        return True, summaries
+
+    def _drop(self, stage, site):
+        """Count a dropped record; called with the lock held."""
+        self.counts[stage] += 1
+        self.dropped_by_site[site] += 1
+        return False
+
+    def _take_token(self, site, now):
+        bucket = self._buckets.get(site)
+        if bucket is None:
+            bucket = self._buckets[site] = [float(self.rate_limit_burst), now]
+        else:
+            bucket[0] = min(self.rate_limit_burst, bucket[0] + (now - bucket[1]) * self.rate_limit_per_s)
+            bucket[1] = now
+        if bucket[0] < 1.0:
+            return False
+        bucket[0] -= 1.0
+        return True
+
+    def _sample(self, record, now):
+        logger = record.module if record.name == 'root' else record.name
+        second = int(now)
+        window = self._windows.get(logger)
+        if window is None or window[0] != second:
+            window = self._windows[logger] = [second, 0]
+        window[1] += 1
+        over = window[1] - self.sample_threshold
+        return over <= 0 or over % self.sample_every == 0
+
+    def _prune(self, now):
+        """Forget records whose window has passed, returning summaries of their dropped copies."""
+        self._next_prune = now + self.dedup_window_s
+        summaries = []
+        for key in [key for key, entry in self._recent.items() if now - entry[0] >= self.dedup_window_s]:
+            entry = self._recent.pop(key)
+            if entry[1]:
+                summaries.append((entry[2], entry[1]))
+        return tuple(summaries)
+
+    def _forget_oldest(self):
+        _, entry = self._recent.popitem(last=False)
+        return ((entry[2], entry[1]),) if entry[1] else ()
+
+    def _write_summaries(self, summaries):
+        """Log the last dropped copy of each record with the number of copies dropped."""
+        for record, count in summaries:
+            summary = copy.copy(record)
+            summary.fields = {**(getattr(record, 'fields', None) or {}), 'repeated': count}
+            logging.getLogger(record.name).handle(summary)
+
+    def flush(self):
+        """Write the summaries of all dropped duplicates now."""
+        with self._lock:
+            summaries = tuple((entry[2], entry[1]) for entry in self._recent.values() if entry[1])
+            self._recent.clear()
+        self._write_summaries(summaries)
+
+    def stats(self, top=10):
+        """
+        Return the suppression counters.
+
+        :param top: Number of call sites with the most dropped records to include.
+        :return: A dict with the deduplicated, rate_limited and sampled_out counts,
+                 and the dropped count of the top call sites as 'file:line'.
+        """
+        with self._lock:
+            sites = self.dropped_by_site.most_common(top)
+            result = dict(self.counts)
+        result['top_sites'] = {f"{os.path.basename(path)}:{line}": count for (path, line), count in sites}
+        return result
+
+
+def _without_traceback(record):
+    """Return a copy of a record without its exception info."""
+    record = copy.copy(record)
+    record.exc_info = None
+    record.exc_text = None
+    return record
+
+
+class _EarlyRecordBuffer(logging.Handler):
+    """Keeps the records logged before setup_logging, which writes them to the configured handlers."""
+
+    def __init__(self, capacity=EARLY_RECORD_LIMIT):
+        super().__init__()
+        self.records = collections.deque(maxlen=capacity)
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+_early_buffer = None
+
+# Settings and objects installed by setup_logging (see _logging_state)
+_logging_state = None
+
+
+def capture_early_logging(level=logging.INFO):
     """
-    # Ensure the logs directory exists
-    if not os.path.exists('logs'):
-        os.makedirs('logs')
+    Buffer log records until setup_logging runs, so records logged while
+    the configuration loads are written once, to the configured handlers.
+    If setup_logging never runs, the records are printed to stderr at exit.
 
-    # Set up the log format
-    log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s [in %(filename)s:%(lineno)d]"
+    :param level: Level to capture until the configured level is known.
+    """
+    global _early_buffer
+    root = logging.getLogger()
+    if _early_buffer is not None or _logging_state is not None or root.handlers:
+        return
+    _early_buffer = _EarlyRecordBuffer()
+    root.addHandler(_early_buffer)
+    root.setLevel(level)
+    atexit.register(_flush_early_records)
+
+
+def _take_early_records():
+    """Remove the early record buffer from the root logger and return its records."""
+    global _early_buffer
+    if _early_buffer is None:
+        return []
+    buffer, _early_buffer = _early_buffer, None
+    logging.getLogger().removeHandler(buffer)
+    return list(buffer.records)
+
+
+def _flush_early_records():
+    """Print buffered records to stderr when logging was never set up."""
+    records = _take_early_records()
+    if records:
+        handler = logging.StreamHandler()
+        handler.setFormatter(TextFormatter())
+        for record in records:
+            handler.handle(record)
 
-    # Create a rotating file handler
-    file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
-    file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(logging.Formatter(log_format))
+
+def setup_logging(log_file='logs/app.log', max_bytes=5 * 1024 * 1024, backup_count=3, level='INFO',
+                  module_levels=None, async_logging=False, queue_size=DEFAULT_QUEUE_SIZE, overflow='block',
+                  compression='gzip', max_age_days=0, max_total_bytes=0, log_format='text',
+                  dedup_window_s=0, rate_limit_per_s=0, rate_limit_burst=0, sample_threshold=0, sample_every=10):
+    """
+    Set up logging for the application with log rotation. This is the single
+    place logging is configured: calling it again with the same settings does
+    nothing, and with different settings replaces the previous configuration.
+
+    The root logger's level is set to the lowest configured level, so calls
+    below it (usually DEBUG) return before a record is created. Per-module
+    levels are applied by a ModuleLevelFilter and on the named loggers.
+    Repetitive records are dropped by a LogSuppressionFilter when any of its
+    limits is set.
+
+    :param log_file: The path to the log file, or None to only log to the console.
+    :param max_bytes: Maximum size of the log file before rotation (in bytes).
+    :param backup_count: Number of backup log files to keep (0 for no limit).
+    :param level: Level name of the application's log records.
+    :param module_levels: Optional dict of module or logger name to level name, e.g. {'menu': 'WARNING'}.
+    :param async_logging: Write records from a background thread (see enable_async_logging).
+    :param queue_size: Maximum number of queued records in async mode.
+    :param overflow: Overflow policy of the async queue, one of OVERFLOW_POLICIES.
+    :param compression: How rotated log files are compressed: 'gzip', 'zstd' or 'none'.
+    :param max_age_days: Remove backups older than this many days (0 keeps them).
+    :param max_total_bytes: Disk budget of the log file and its backups (0 for no limit).
+    :param log_format: Format of the log file, 'text' or 'json' (NDJSON, see JsonFormatter); the console is always text.
+    :param dedup_window_s: Seconds during which identical records are written once (0 disables).
+    :param rate_limit_per_s: Records per second allowed per call site (0 disables).
+    :param rate_limit_burst: Records a call site may log at once before the rate limit applies.
+    :param sample_threshold: Records per second per module before sampling starts (0 disables).
+    :param sample_every: Keep one in this many records while sampling.
+    :return: True if logging was (re)configured, False if it already was with these settings.
+    """
+    global _logging_state
+    default_level = parse_level(level)
+    levels = {name: parse_level(value) for name, value in (module_levels or {}).items()}
+    settings = (log_file, max_bytes, backup_count, default_level, tuple(sorted(levels.items())),
+                bool(async_logging), queue_size, overflow, compression, max_age_days, max_total_bytes, log_format,
+                dedup_window_s, rate_limit_per_s, rate_limit_burst, sample_threshold, sample_every)
+    if _logging_state is not None and _logging_state['settings'] == settings:
+        return False
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format '{log_format}', expected one of {LOG_FORMATS}")
+    if async_logging and overflow not in OVERFLOW_POLICIES:
+        raise ValueError(f"Unknown logging overflow policy '{overflow}', expected one of {OVERFLOW_POLICIES}")
+
+    root = logging.getLogger()
+    handlers = []
+    if log_file:
+        # Ensure the log directory exists
+        log_dir = os.path.dirname(log_file)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+        # Rollover only renames the file; compression and retention run on a background thread
+        handlers.append(CompressingRotatingFileHandler(
+            log_file, max_bytes=max_bytes, backup_count=backup_count, compression=compression,
+            max_age_days=max_age_days, max_total_bytes=max_total_bytes))
+        handlers[-1].setFormatter(JsonFormatter() if log_format == 'json' else TextFormatter())
 
     # Create a stream handler to output to console
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.DEBUG)
-    console_handler.setFormatter(logging.Formatter(log_format))
+    console_handler.setFormatter(TextFormatter())
+    handlers.append(console_handler)
+
+    # The new handlers are created first, so records logged meanwhile still have a destination
+    early_records = _take_early_records()
+    _reset_logging()
+    for handler in handlers:
+        root.addHandler(handler)
+
+    root.setLevel(min([default_level, *levels.values()]))
+    filters = []
+    if levels:
+        filters.append(ModuleLevelFilter(levels, default_level))
+        # Loggers named after a module are filtered before their records are created
+        for name, module_level in levels.items():
+            logging.getLogger(name).setLevel(module_level)
+    suppression_filter = None
+    if dedup_window_s > 0 or rate_limit_per_s > 0 or sample_threshold > 0:
+        # Added after the level filter, so only records that would be written are counted
+        suppression_filter = LogSuppressionFilter(dedup_window_s, rate_limit_per_s, rate_limit_burst,
+                                                  sample_threshold, sample_every)
+        filters.append(suppression_filter)
+    for log_filter in filters:
+        root.addFilter(log_filter)
+
+    _logging_state = {'settings': settings, 'handlers': handlers, 'filters': filters,
+                      'suppression': suppression_filter, 'loggers': list(levels)}
+
+    # Records logged while the configuration loaded, at the configured levels
+    for record in early_records:
+        logger = logging.getLogger(record.name)
+        if logger.isEnabledFor(record.levelno):
+            logger.handle(record)
+
+    if async_logging:
+        enable_async_logging(queue_size=queue_size, overflow=overflow)
 
-    # Set up the root logger
-    logging.basicConfig(level=logging.DEBUG, handlers=[file_handler, console_handler])
+    module_text = ', '.join(f"{name}={logging.getLevelName(value)}" for name, value in levels.items())
+    logging.info(f"Logging has been set up (level {logging.getLevelName(default_level)}"
+                 + (f", module levels {module_text}" if levels else "") + ").")
+    return True
 
-    logging.info("Logging has been set up.")
 
+def _reset_logging():
+    """Remove the handlers, filters and logger levels installed by setup_logging."""
+    global _logging_state
+    disable_async_logging()
+    if _logging_state is None:
+        return
+    state, _logging_state = _logging_state, None
+    root = logging.getLogger()
+    if state['suppression'] is not None:
+        state['suppression'].flush()
+    for handler in state['handlers']:
+        root.removeHandler(handler)
+        handler.close()
+    for log_filter in state['filters']:
+        root.removeFilter(log_filter)
+    for name in state['loggers']:
+        logging.getLogger(name).setLevel(logging.NOTSET)
 
-def log_error(error, exc_info=True):
+
+def suppression_stats():
+    """
+    Return the counters of records dropped by the LogSuppressionFilter, or
+    None if no suppression is configured (see LogSuppressionFilter.stats).
+    """
+    if _logging_state is None or _logging_state['suppression'] is None:
+        return None
+    return _logging_state['suppression'].stats()
+
+
+def flush_suppressed():
+    """Write the 'repeated N times' summaries of duplicates dropped so far, e.g. before exiting."""
+    if _logging_state is not None and _logging_state['suppression'] is not None:
+        _logging_state['suppression'].flush()
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Puts records on a bounded queue served by a QueueListener thread, and
+    applies an overflow policy when the listener falls behind:
+
+    - 'block': wait for space, so no record is lost.
+    - 'drop_oldest': discard the oldest queued record to make room.
+    - 'sample': once the queue is three quarters full, keep only one in
+      sample_every records below WARNING; WARNING and above wait for space.
+
+    Dropped and sampled-out records are counted.
+    """
+
+    def __init__(self, log_queue, overflow='block', sample_every=10):
+        """
+        Initialize the handler.
+
+        :param log_queue: A queue.Queue, bounded by its maxsize.
+        :param overflow: One of OVERFLOW_POLICIES.
+        :param sample_every: Keep one in this many records when sampling.
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown logging overflow policy '{overflow}', expected one of {OVERFLOW_POLICIES}")
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.sample_every = sample_every
+        self.dropped = 0
+        self.sampled_out = 0
+        self._sample_counter = 0
+        self._high_water = log_queue.maxsize * 3 // 4
+
+    def prepare(self, record):
+        """
+        Format the message on the calling thread, as its arguments may change
+        afterwards, but keep the traceback separate from it (in exc_text), so
+        text and JSON formatters see the same record as without the queue.
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatter.formatException(record.exc_info) if self.formatter \
+                else logging.Formatter().formatException(record.exc_info)
+        record.msg, record.args, record.exc_info = record.message, None, None
+        return record
+
+    def enqueue(self, record):
+        """Queue a record according to the overflow policy (called with the handler lock held)."""
+        log_queue = self.queue
+        if self.overflow == 'block' or log_queue.maxsize <= 0 or record.levelno >= logging.WARNING:
+            log_queue.put(record)
+        elif self.overflow == 'sample':
+            if log_queue.qsize() >= self._high_water:
+                self._sample_counter += 1
+                if self._sample_counter % self.sample_every:
+                    self.sampled_out += 1
+                    return
+            try:
+                log_queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+        else:
+            while True:
+                try:
+                    log_queue.put_nowait(record)
+                    return
+                except queue.Full:
+                    try:
+                        log_queue.get_nowait()
+                        self.dropped += 1
+                    except queue.Empty:
+                        pass
+
+
+class _QueueListener(QueueListener):
+    """QueueListener whose stop sentinel waits for space in a full queue."""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+# (handler, listener, moved handlers) while async logging is enabled
+_async_logging = None
+
+
+def enable_async_logging(queue_size=DEFAULT_QUEUE_SIZE, overflow='block'):
+    """
+    Move the root logger's handlers behind a bounded queue, so logging calls
+    only queue records and the handlers' file and console I/O (including
+    rotation) runs on a background listener thread. Queued records are
+    flushed by disable_async_logging, which also runs at exit.
+
+    :param queue_size: Maximum number of queued records (0 for unbounded).
+    :param overflow: What to do when the queue is full, one of OVERFLOW_POLICIES.
+    :return: The BoundedQueueHandler installed on the root logger.
+    """
+    global _async_logging
+    if _async_logging is not None:
+        return _async_logging[0]
+
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    log_queue = queue.Queue(maxsize=queue_size)
+    queue_handler = BoundedQueueHandler(log_queue, overflow)
+    listener = _QueueListener(log_queue, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    listener.start()
+    _async_logging = (queue_handler, listener, handlers)
+    atexit.register(disable_async_logging)
+
+    logging.info(f"Async logging enabled (queue size {queue_size}, overflow policy '{overflow}').")
+    return queue_handler
+
+
+def disable_async_logging():
+    """
+    Write all queued records, stop the listener thread and put the original
+    handlers back on the root logger. Does nothing if async logging is off.
+    """
+    global _async_logging
+    if _async_logging is None:
+        return
+    queue_handler, listener, handlers = _async_logging
+    _async_logging = None
+
+    root = logging.getLogger()
+    root.removeHandler(queue_handler)
+    listener.stop()
+    for handler in handlers:
+        root.addHandler(handler)
+        handler.flush()
+    if queue_handler.dropped or queue_handler.sampled_out:
+        logging.warning(f"Async logging dropped {queue_handler.dropped} and sampled out "
+                        f"{queue_handler.sampled_out} records.")
+
+
+def async_logging_stats():
+    """
+    Return the async logging counters, or None if async logging is off.
+
+    :return: A dict with the queued, dropped and sampled_out record counts.
+    """
+    if _async_logging is None:
+        return None
+    queue_handler = _async_logging[0]
+    return {
+        'queued': queue_handler.queue.qsize(),
+        'dropped': queue_handler.dropped,
+        'sampled_out': queue_handler.sampled_out,
+    }
+
+
+def _log(level, message, args, fields, exc_info=None):
+    """
+    Log through the root logger on behalf of the helper's caller. Nothing is
+    formatted, and no record is created, when the level is disabled.
+    """
+    logger = logging.getLogger()
+    if logger.isEnabledFor(level):
+        # stacklevel 3 attributes the record to the caller of the log_* helper
+        logger.log(level, message, *args, exc_info=exc_info, extra={'fields': fields} if fields else None,
+                   stacklevel=3)
+
+
+def log_error(error, *args, exc_info=True, **fields):
     """
     Log an error with optional exception info.
     
-    :param error: The error message to log.
+    :param error: The error message to log; %-style placeholders are filled from args when the record is written.
+    :param args: Arguments of the message's placeholders.
     :param exc_info: Whether to include the full exception traceback (default: True).
+    :param fields: Structured fields of the record, e.g. duration_ms=12.5 (see JsonFormatter).
     """
-    logging.error(error, exc_info=exc_info)
+    _log(logging.ERROR, error, args, fields, exc_info)
 
 
-def log_warning(warning):
+def log_warning(warning, *args, **fields):
     """
     Log a warning message.
     
-    :param warning: The warning message to log.
+    :param warning: The warning message to log, with optional %-style placeholders.
+    :param args: Arguments of the message's placeholders.
+    :param fields: Structured fields of the record.
     """
-    logging.warning(warning)
+    _log(logging.WARNING, warning, args, fields)
 
 
-def log_info(info):
+def log_info(info, *args, **fields):
     """
     Log an informational message.
     
-    :param info: The informational message to log.
+    :param info: The informational message to log, with optional %-style placeholders.
+    :param args: Arguments of the message's placeholders.
+    :param fields: Structured fields of the record.
+    """
+    _log(logging.INFO, info, args, fields)
+
+
+def log_stall(duration_ms, stack=None):
+    """
+    Log that the GUI thread's event loop stalled.
+    
+    :param duration_ms: How long the event loop has been (or was) blocked, in milliseconds.
+    :param stack: Optional formatted stack lines of the GUI thread during the stall.
     """
-    logging.info(info)
+    message, args = "GUI thread stalled for %.0f ms", (duration_ms,)
+    if stack:
+        message += "; GUI thread stack:\n%s"
+        args += (''.join(stack),)
+    _log(logging.WARNING, message, args, {'duration_ms': round(duration_ms, 1)})
 
 
-def log_debug(debug_message):
+def log_debug(debug_message, *args, **fields):
     """
     Log a debug message.
     
-    :param debug_message: The debug message to log.
+    :param debug_message: The debug message to log, with optional %-style placeholders.
+    :param args: Arguments of the message's placeholders.
+    :param fields: Structured fields of the record.
     """
-    logging.debug(debug_message)
+    _log(logging.DEBUG, debug_message, args, fields)
 
 
 # Example usage
@@ -0,0 +1,185 @@
+import logging
+import os
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QIcon, QImageReader, QPixmap
+from modules import resources
+
+# Directory searched when an icon is requested by name (e.g. 'new')
+ICONS_PATH = 'resources/icons'
+
+
+class IconRegistry:
+    """
+    Process-wide cache of icons and pixmaps, read through the resource
+    loader (bundle or disk). Each file is loaded once and each requested
+    size is scaled once; missing files are logged a single time and then
+    served as a cached null icon.
+    """
+
+    def __init__(self, icons_path=ICONS_PATH):
+        """
+        Initialize an empty registry.
+
+        :param icons_path: Directory used to resolve icon names.
+        """
+        self.icons_path = icons_path
+        self.hits = 0
+        self.misses = 0
+        # Bytes of the decoded pixmaps; icons requested without a size are decoded
+        # lazily by Qt and counted from their image header when created
+        self.pixmap_bytes = 0
+        self._icons = {}
+        self._pixmaps = {}
+        self._missing = set()
+
+    def resolve(self, name):
+        """
+        Turn an icon name or path into a normalized file path.
+
+        :param name: Icon name ('new') or path ('resources/icons/new.png').
+        :return: The normalized path.
+        """
+        if os.sep in name or '/' in name or os.path.splitext(name)[1]:
+            return os.path.normpath(name)
+        return os.path.normpath(os.path.join(self.icons_path, f'{name}.png'))
+
+    def _exists(self, path):
+        """Check that an icon file exists, logging each missing file only once."""
+        if path in self._missing:
+            return False
+        if resources.loader.exists(path):
+            return True
+        self._missing.add(path)
+        logging.warning(f"Icon not found: {path}")
+        return False
+
+    def icon(self, name, size=None):
+        """
+        Return the QIcon for a name or path.
+
+        Without a size, the icon is decoded lazily by Qt when first painted,
+        from the bundle or from disk; otherwise it is built from a pixmap
+        decoded (and scaled) once.
+
+        :param name: Icon name or path.
+        :param size: Optional edge length in pixels.
+        :return: A QIcon (null if the file does not exist).
+        """
+        path = self.resolve(name)
+        key = (path, size)
+        icon = self._icons.get(key)
+        if icon is not None:
+            self.hits += 1
+            return icon
+
+        self.misses += 1
+        if not self._exists(path):
+            icon = QIcon()
+        elif size is None:
+            qt_path = resources.loader.qt_path(path)
+            image_size = QImageReader(qt_path).size()
+            if image_size.isValid():
+                # Qt decodes file icons to 32-bit pixmaps
+                self.pixmap_bytes += image_size.width() * image_size.height() * 4
+            icon = QIcon(qt_path)
+        else:
+            icon = QIcon(self._pixmap(path, size))
+        self._icons[key] = icon
+        return icon
+
+    def pixmap(self, name, size=None):
+        """
+        Return the QPixmap for a name or path, scaled to fit size x size
+        while keeping its aspect ratio.
+
+        :param name: Icon name or path.
+        :param size: Optional edge length in pixels, None for the original size.
+        :return: A QPixmap (null if the file does not exist).
+        """
+        path = self.resolve(name)
+        key = (path, size)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self.hits += 1
+            return pixmap
+
+        self.misses += 1
+        return self._pixmap(path, size)
+
+    def _pixmap(self, path, size):
+        """Return the cached pixmap of a resolved path, loading (and scaling) it if needed."""
+        key = (path, size)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            return pixmap
+
+        if size is not None:
+            source = self._pixmap(path, None)
+            pixmap = source if source.isNull() else source.scaled(
+                size, size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        elif self._exists(path):
+            pixmap = QPixmap(resources.loader.qt_path(path))
+        else:
+            pixmap = QPixmap()
+
+        if not pixmap.isNull():
+            self.pixmap_bytes += pixmap.width() * pixmap.height() * pixmap.depth() // 8
+        self._pixmaps[key] = pixmap
+        return pixmap
+
+    def invalidate(self, name=None):
+        """
+        Forget cached icons and pixmaps for one file, or for all files.
+
+        :param name: Icon name or path, or None to clear everything.
+        """
+        if name is None:
+            self._icons.clear()
+            self._pixmaps.clear()
+            self._missing.clear()
+            return
+        path = self.resolve(name)
+        for cache in (self._icons, self._pixmaps):
+            for key in [k for k in cache if k[0] == path]:
+                del cache[key]
+        self._missing.discard(path)
+
+    def stats(self):
+        """
+        Return registry statistics.
+
+        :return: A dict with hits and misses (one per icon or pixmap request),
+                 the decoded bytes of the icons and pixmaps and missing files.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'pixmap_bytes': self.pixmap_bytes,
+            'cached_icons': len(self._icons),
+            'cached_pixmaps': len(self._pixmaps),
+            'missing': sorted(self._missing),
+        }
+
+
+# Process-wide registry; create QIcons and QPixmaps on the GUI thread only
+registry = IconRegistry()
+
+
+def get_icon(name, size=None):
+    """
+    Return a cached QIcon by name ('save') or path.
+
+    :param name: Icon name or path.
+    :param size: Optional edge length in pixels.
+    """
+    return registry.icon(name, size)
+
+
+def get_pixmap(name, size=None):
+    """
+    Return a cached QPixmap by name ('app_icon') or path.
+
+    :param name: Icon name or path.
+    :param size: Optional edge length in pixels.
+    """
+    return registry.pixmap(name, size)
@@ -0,0 +1,96 @@
+import importlib
+import logging
+import sys
+import time
+
+# Optional subsystems that most sessions never use. They are imported on
+# first attribute access instead of at application startup.
+OPTIONAL_SUBSYSTEMS = {
+    'settings_dialog': 'config.settings_dialog',
+    'about': 'modules.about',
+    'command_palette': 'modules.command_palette',
+    'performance_hud': 'modules.performance_hud',
+    'log_viewer': 'modules.log_viewer',
+    'database': 'modules.database',
+    'pillow': 'PIL.Image',
+    'zstandard': 'zstandard',
+}
+
+
+class LazyModule:
+    """
+    Proxy that imports the named module the first time one of its attributes
+    is accessed, so the import cost is only paid by code paths that need it.
+    """
+
+    def __init__(self, module_name):
+        """
+        Initialize the proxy without importing the module.
+
+        :param module_name: Fully qualified name of the module to import.
+        """
+        self._module_name = module_name
+        self._module = None
+
+    def _load(self):
+        """
+        Import the wrapped module, logging how long the import took.
+
+        :return: The imported module.
+        """
+        if self._module is None:
+            already_loaded = self._module_name in sys.modules
+            start_time = time.perf_counter()
+            self._module = importlib.import_module(self._module_name)
+            if not already_loaded:
+                elapsed_ms = (time.perf_counter() - start_time) * 1000
+                logging.info(f"Lazily imported {self._module_name} in {elapsed_ms:.1f} ms")
+        return self._module
+
+    @property
+    def is_loaded(self):
+        """Whether the wrapped module has been imported through this proxy."""
+        return self._module is not None
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __repr__(self):
+        state = 'loaded' if self.is_loaded else 'not loaded'
+        return f"<LazyModule {self._module_name} ({state})>"
+
+
+_lazy_modules = {}
+
+
+def lazy_import(module_name):
+    """
+    Return a shared lazy proxy for the given module.
+
+    :param module_name: Fully qualified module name (e.g. 'config.settings_dialog').
+    :return: A LazyModule that imports the module on first use.
+    """
+    proxy = _lazy_modules.get(module_name)
+    if proxy is None:
+        proxy = _lazy_modules[module_name] = LazyModule(module_name)
+    return proxy
+
+
+def get_subsystem(name):
+    """
+    Return a lazy proxy for one of the registered optional subsystems.
+
+    :param name: Subsystem key from OPTIONAL_SUBSYSTEMS (e.g. 'database').
+    :return: A LazyModule for the subsystem.
+    :raises KeyError: If the subsystem is not registered.
+    """
+    return lazy_import(OPTIONAL_SUBSYSTEMS[name])
+
+
+def loaded_subsystems():
+    """
+    List the optional subsystems that have been imported so far.
+
+    :return: A list of subsystem keys.
+    """
+    return [name for name, module_name in OPTIONAL_SUBSYSTEMS.items() if module_name in sys.modules]
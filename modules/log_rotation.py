@@ -0,0 +1,242 @@
+import gzip
+import importlib.util
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+from modules.lazy_loader import get_subsystem
+
+logger = logging.getLogger(__name__)
+
+# zstandard is optional (pip install zstandard); gzip is used without it
+zstandard = get_subsystem('zstandard')
+
+COMPRESSIONS = ('gzip', 'zstd', 'none')
+COMPRESSED_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+# Suffix of a backup while it is being compressed
+PARTIAL_SUFFIX = '.partial'
+
+COPY_CHUNK_BYTES = 1024 * 1024
+
+# How long closing a handler waits for pending compression
+CLOSE_TIMEOUT_S = 10.0
+
+# Queued to stop the rotation worker
+_STOP = object()
+
+
+def backup_files(log_file):
+    """
+    Return the rotated backups of a log file, oldest first.
+
+    Backups are named '<log_file>.<YYYYmmdd-HHMMSS-mmm>' (plus '.gz' or '.zst' once
+    compressed); the numbered backups of RotatingFileHandler are included too.
+
+    :param log_file: Path of the active log file.
+    :return: A list of backup paths ordered by last modification time.
+    """
+    directory = os.path.dirname(log_file) or '.'
+    prefix = os.path.basename(log_file) + '.'
+    backups = []
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return []
+    for entry in entries:
+        if entry.name.startswith(prefix) and not entry.name.endswith(PARTIAL_SUFFIX) and entry.is_file():
+            try:
+                backups.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                pass  # Removed meanwhile
+    return [path for _, path in sorted(backups)]
+
+
+def is_compressed(path):
+    """Whether a backup path is compressed (by its suffix)."""
+    return path.endswith(tuple(COMPRESSED_SUFFIXES.values()))
+
+
+def compress_file(path, compression):
+    """
+    Compress a file next to itself and remove the original. The compressed
+    file is written under a temporary name and renamed when complete, and
+    keeps the original's modification time.
+
+    :param path: The file to compress.
+    :param compression: 'gzip' or 'zstd'.
+    :return: The path of the compressed file.
+    """
+    target = path + COMPRESSED_SUFFIXES[compression]
+    # Unique per thread, as the workers of an old and a new handler may briefly overlap
+    partial = f"{target}.{threading.get_ident()}{PARTIAL_SUFFIX}"
+    stat = os.stat(path)
+    with open(path, 'rb') as source, open(partial, 'wb') as raw:
+        if compression == 'zstd':
+            with zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=False) as destination:
+                shutil.copyfileobj(source, destination, COPY_CHUNK_BYTES)
+        else:
+            with gzip.GzipFile(filename=os.path.basename(path), mode='wb', fileobj=raw,
+                               compresslevel=6, mtime=stat.st_mtime) as destination:
+                shutil.copyfileobj(source, destination, COPY_CHUNK_BYTES)
+    os.utime(partial, (stat.st_atime, stat.st_mtime))
+    os.replace(partial, target)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass  # Compressed by another worker meanwhile
+    return target
+
+
+class CompressingRotatingFileHandler(RotatingFileHandler):
+    """
+    Size-based rotating file handler that keeps the rollover itself cheap.
+
+    On rollover the log file is only renamed to a timestamped backup and
+    reopened; a background thread then compresses the backup (gzip or zstd)
+    and applies the retention policies: at most backup_count backups, none
+    older than max_age_days, and the log plus its backups within
+    max_total_bytes. Backups left uncompressed by an earlier run are
+    compressed when the handler starts.
+    """
+
+    def __init__(self, filename, max_bytes=0, backup_count=0, compression='gzip', max_age_days=0,
+                 max_total_bytes=0, encoding=None):
+        """
+        Initialize the handler.
+
+        :param filename: Path of the log file.
+        :param max_bytes: Size at which the log is rotated (0 never rotates).
+        :param backup_count: Maximum number of backups kept (0 for no limit).
+        :param compression: One of COMPRESSIONS.
+        :param max_age_days: Remove backups last written more than this many days ago (0 keeps them).
+        :param max_total_bytes: Disk budget of the log and its backups (0 for no limit).
+        :param encoding: Encoding of the log file.
+        """
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown log compression '{compression}', expected one of {COMPRESSIONS}")
+        if compression == 'zstd' and importlib.util.find_spec('zstandard') is None:
+            logger.warning("zstandard is not installed (pip install zstandard); compressing logs with gzip.")
+            compression = 'gzip'
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding)
+        self.compression = compression
+        self.max_age_days = max_age_days
+        self.max_total_bytes = max_total_bytes
+        self.rollover_count = 0
+        self.compressed_count = 0
+        self.removed_count = 0
+
+        self._jobs = queue.Queue()
+        self._worker = threading.Thread(target=self._work, name='log-rotation', daemon=True)
+        self._worker.start()
+        for path in backup_files(self.baseFilename):
+            if not is_compressed(path):
+                self._jobs.put(path)
+        self._jobs.put(None)  # Apply the retention policies
+
+    def doRollover(self):
+        """Rename the log to a timestamped backup and reopen it; compression happens in the background."""
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if os.path.exists(self.baseFilename):
+            backup = self._backup_name()
+            os.replace(self.baseFilename, backup)
+            self.rollover_count += 1
+            self._jobs.put(backup)
+        if not self.delay:
+            self.stream = self._open()
+
+    def _backup_name(self):
+        """Return an unused timestamped backup name."""
+        now = time.time()
+        base = f"{self.baseFilename}.{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{int(now * 1000) % 1000:03d}"
+        name, counter = base, 1
+        suffixes = ('', *COMPRESSED_SUFFIXES.values())
+        while any(os.path.exists(name + suffix) for suffix in suffixes):
+            name = f"{base}-{counter}"
+            counter += 1
+        return name
+
+    def _work(self):
+        """Background thread: compress backups and apply the retention policies."""
+        while True:
+            path = self._jobs.get()
+            try:
+                if path is _STOP:
+                    return
+                if path is not None and self.compression != 'none' and os.path.exists(path):
+                    compress_file(path, self.compression)
+                    self.compressed_count += 1
+                if self._jobs.empty():
+                    self.apply_retention()
+            except FileNotFoundError:
+                pass  # Compressed or removed by another worker meanwhile
+            except Exception as e:
+                logger.warning(f"Log rotation failed for {path or self.baseFilename}: {e}")
+            finally:
+                self._jobs.task_done()
+
+    def apply_retention(self):
+        """Remove the oldest backups that exceed the count, age or disk budget limits."""
+        backups = backup_files(self.baseFilename)
+        removed = []
+        if self.backupCount > 0 and len(backups) > self.backupCount:
+            removed += backups[:len(backups) - self.backupCount]
+            backups = backups[len(backups) - self.backupCount:]
+        if self.max_age_days > 0:
+            cutoff = time.time() - self.max_age_days * 86400
+            expired = [path for path in backups if _mtime(path) < cutoff]
+            removed += expired
+            backups = backups[len(expired):]
+        if self.max_total_bytes > 0:
+            sizes = [_size(path) for path in backups]
+            total = _size(self.baseFilename) + sum(sizes)
+            while backups and total > self.max_total_bytes:
+                total -= sizes.pop(0)
+                removed.append(backups.pop(0))
+        for path in removed:
+            try:
+                os.remove(path)
+                self.removed_count += 1
+            except OSError:
+                pass
+        return removed
+
+    def wait_idle(self, timeout=None):
+        """
+        Wait until pending compression and retention jobs are done.
+
+        :param timeout: Maximum seconds to wait, or None to wait indefinitely.
+        :return: True if the worker is idle.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._jobs.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self):
+        """Close the log file, finishing pending compression first (up to CLOSE_TIMEOUT_S)."""
+        if self._worker.is_alive():
+            self._jobs.put(_STOP)
+            self._worker.join(CLOSE_TIMEOUT_S)
+        super().close()
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+def _size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
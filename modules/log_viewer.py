@@ -0,0 +1,618 @@
+import bisect
+import gzip
+import logging
+import mmap
+import os
+import re
+import shutil
+import tempfile
+from array import array
+from PyQt6.QtCore import (QAbstractListModel, QModelIndex, QObject, QRunnable, QThreadPool, QTimer, Qt,
+                          pyqtSignal)
+from PyQt6.QtGui import QColor, QFontDatabase
+from PyQt6.QtWidgets import (QCheckBox, QComboBox, QDockWidget, QHBoxLayout, QLabel, QLineEdit, QListView,
+                             QPushButton, QVBoxLayout, QWidget)
+from modules import log_rotation
+
+# Level codes stored per line; 0 marks lines before the first recognized record
+LEVEL_NAMES = ['', 'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+LEVEL_CODES = {name.encode(): code for code, name in enumerate(LEVEL_NAMES) if name}
+
+# Start of a record in the error_handling text format ('<time> - <name> - LEVEL - '), the
+# older basicConfig format ('<time>:LEVEL:') or the JSON format ('{"ts":"<time>","level":"LEVEL"');
+# other lines continue the previous record
+RECORD_START = re.compile(rb'\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{3}(?: - .*? - |:)(DEBUG|INFO|WARNING|ERROR|CRITICAL)(?: - |:)'
+                          rb'|\{"ts":"[^"]*","level":"(DEBUG|INFO|WARNING|ERROR|CRITICAL)"')
+
+# Bytes indexed between progress updates of the line index
+INDEX_CHUNK_BYTES = 4 * 1024 * 1024
+
+# Bytes searched per step when searching backwards
+SEARCH_WINDOW_BYTES = 4 * 1024 * 1024
+
+# How often the live log file is checked for new lines and rotation
+POLL_INTERVAL_MS = 500
+
+LEVEL_COLORS = {
+    3: QColor('#e65100'),  # WARNING
+    4: QColor('#d32f2f'),  # ERROR
+    5: QColor('#d32f2f'),  # CRITICAL
+}
+
+
+def index_lines(buffer, start, end, previous_level=0):
+    """
+    Index the complete lines of a byte range. A trailing line without a
+    newline is left for the next call, once it is complete.
+
+    :param buffer: bytes or mmap with the file contents.
+    :param start: Offset of the first line to index.
+    :param end: Offset up to which lines are indexed.
+    :param previous_level: Level code of the line before start, inherited by continuation lines.
+    :return: (array of line start offsets, bytearray of level codes, offset after the last indexed line).
+    """
+    offsets = array('Q')
+    levels = bytearray()
+    find, match = buffer.find, RECORD_START.match
+    position = start
+    while position < end:
+        newline = find(b'\n', position, end)
+        if newline < 0:
+            break
+        record = match(buffer, position, newline)
+        if record is not None:
+            previous_level = LEVEL_CODES[record.group(1) or record.group(2)]
+        offsets.append(position)
+        levels.append(previous_level)
+        position = newline + 1
+    return offsets, levels, position
+
+
+def rows_at_level(levels, min_level, first_line=0):
+    """
+    Return the line numbers whose level is at least min_level.
+
+    :param levels: bytearray of level codes.
+    :param min_level: Minimum level code.
+    :param first_line: Line number of levels[0].
+    :return: An array of line numbers.
+    """
+    mask = bytes(levels).translate(bytes(1 if code >= min_level else 0 for code in range(256)))
+    rows = array('Q')
+    # Runs of consecutive shown lines are added in one step
+    for run in re.finditer(b'\x01+', mask):
+        rows.extend(range(first_line + run.start(), first_line + run.end()))
+    return rows
+
+
+def _map_file(path):
+    """Return a read-only mapping of a file, or None if it is empty."""
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class _ViewerSignals(QObject):
+    """Signals emitted from worker threads and delivered on the GUI thread."""
+    # Byte offsets are passed as objects, as Qt's int is 32-bit
+    indexed = pyqtSignal(int, object, object, object)  # generation, offsets, levels, indexed end
+    index_done = pyqtSignal(int, str)                # generation, error message ('' on success)
+    found = pyqtSignal(int, int)                     # generation, matching line (-1 if none)
+    extracted = pyqtSignal(str, str)                 # backup path, readable file path ('' on failure)
+
+
+class _IndexTask(QRunnable):
+    """Worker that indexes the lines appended to a log file since the last run."""
+
+    def __init__(self, path, generation, start, previous_level, signals):
+        super().__init__()
+        self.path = path
+        self.generation = generation
+        self.start = start
+        self.previous_level = previous_level
+        self.signals = signals
+        self.cancelled = False
+
+    def run(self):
+        error = ''
+        try:
+            buffer = _map_file(self.path)
+            if buffer is not None:
+                with buffer:
+                    position, size = self.start, len(buffer)
+                    while position < size and not self.cancelled:
+                        offsets, levels, end = index_lines(
+                            buffer, position, min(size, position + INDEX_CHUNK_BYTES), self.previous_level)
+                        if not offsets:
+                            if size - position <= INDEX_CHUNK_BYTES:
+                                break  # Only an incomplete last line is left
+                            # A line longer than the chunk: look for its end in the rest of the file
+                            offsets, levels, end = index_lines(buffer, position, size, self.previous_level)
+                            if not offsets:
+                                break
+                        self._emit(self.signals.indexed, offsets, levels, end)
+                        position, self.previous_level = end, levels[-1]
+        except Exception as e:
+            error = str(e)
+        self._emit(self.signals.index_done, error)
+
+    def _emit(self, signal, *values):
+        """Report back to the GUI thread unless the viewer is already gone."""
+        try:
+            signal.emit(self.generation, *values)
+        except RuntimeError:
+            pass  # The application is shutting down
+
+
+class _SearchTask(QRunnable):
+    """Worker that finds the next or previous line matching a regular expression."""
+
+    def __init__(self, path, generation, pattern, offsets, levels, line_count, indexed_end, from_line,
+                 backwards, min_level, signals):
+        super().__init__()
+        self.path = path
+        self.generation = generation
+        self.pattern = pattern
+        self.offsets = offsets
+        self.levels = levels
+        self.line_count = line_count
+        self.indexed_end = indexed_end
+        self.from_line = from_line
+        self.backwards = backwards
+        self.min_level = min_level
+        self.signals = signals
+
+    def run(self):
+        line = -1
+        try:
+            buffer = _map_file(self.path)
+            if buffer is not None and self.line_count:
+                with buffer:
+                    line = self._search_backwards(buffer) if self.backwards else self._search_forwards(buffer)
+        except Exception as e:
+            logging.warning(f"Log search failed: {e}")
+        try:
+            self.signals.found.emit(self.generation, line)
+        except RuntimeError:
+            pass  # The application is shutting down
+
+    def _line_of(self, offset):
+        return bisect.bisect_right(self.offsets, offset, 0, self.line_count) - 1
+
+    def _line_start(self, line):
+        return self.offsets[line] if line < self.line_count else self.indexed_end
+
+    def _search_forwards(self, buffer):
+        """Return the first shown line after from_line containing a match."""
+        position = self._line_start(self.from_line + 1)
+        while position < self.indexed_end:
+            match = self.pattern.search(buffer, position, self.indexed_end)
+            if match is None:
+                return -1
+            line = self._line_of(match.start())
+            if self.levels[line] >= self.min_level:
+                return line
+            position = self._line_start(line + 1)
+        return -1
+
+    def _search_backwards(self, buffer):
+        """Return the last shown line before from_line containing a match, searching window by window."""
+        end = self._line_start(max(0, self.from_line))
+        while end > 0:
+            start = self.offsets[self._line_of(max(0, end - SEARCH_WINDOW_BYTES))]
+            for match in reversed(list(self.pattern.finditer(buffer, start, end))):
+                line = self._line_of(match.start())
+                if self.levels[line] >= self.min_level:
+                    return line
+            end = start
+        return -1
+
+
+class _ExtractTask(QRunnable):
+    """Worker that decompresses a rotated backup into a temporary file."""
+
+    def __init__(self, backup, signals):
+        super().__init__()
+        self.backup = backup
+        self.signals = signals
+
+    def run(self):
+        target = ''
+        try:
+            handle, target = tempfile.mkstemp(prefix='pyqt6ify-log-', suffix='.log')
+            with os.fdopen(handle, 'wb') as destination:
+                if self.backup.endswith(log_rotation.COMPRESSED_SUFFIXES['zstd']):
+                    with open(self.backup, 'rb') as raw:
+                        with log_rotation.zstandard.ZstdDecompressor().stream_reader(raw) as source:
+                            shutil.copyfileobj(source, destination, log_rotation.COPY_CHUNK_BYTES)
+                else:
+                    with gzip.open(self.backup, 'rb') as source:
+                        shutil.copyfileobj(source, destination, log_rotation.COPY_CHUNK_BYTES)
+        except Exception as e:
+            logging.warning(f"Failed to decompress {self.backup}: {e}")
+            if target:
+                os.remove(target)
+            target = ''
+        try:
+            self.signals.extracted.emit(self.backup, target)
+        except RuntimeError:
+            pass  # The application is shutting down
+
+
+class LogListModel(QAbstractListModel):
+    """
+    List model over a log file that is never loaded into memory.
+
+    The file is memory-mapped, and a line offset index (with the level of
+    each line) is built on the global thread pool, incrementally as the file
+    grows, so only the rows a view displays are read and decoded. A live log
+    is polled for new lines and for rotation, after which the model follows
+    the new log file. Lines below min_level are hidden; search finds
+    regular expression matches in the background.
+    """
+
+    progress = pyqtSignal(object, object)  # indexed bytes, file size
+    rotated = pyqtSignal()
+    search_finished = pyqtSignal(int)  # matching row, or -1
+
+    def __init__(self, path, live=True, parent=None):
+        """
+        Initialize the model and start indexing.
+
+        :param path: Path of the log file.
+        :param live: Poll the file for new lines and rotation.
+        :param parent: Parent QObject.
+        """
+        super().__init__(parent)
+        self.path = path
+        self.live = live
+        self.min_level = 0
+        self.generation = 0
+        self._map = None
+        self._signals = _ViewerSignals(self)
+        self._signals.indexed.connect(self._on_indexed)
+        self._signals.index_done.connect(self._on_index_done)
+        self._signals.found.connect(self._on_found)
+        self._index_task = None
+        self._reset_index()
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.timeout.connect(self.poll)
+        if live:
+            self._poll_timer.start(POLL_INTERVAL_MS)
+        self.poll()
+
+    def _reset_index(self):
+        """Forget the index and mapping of the previous file."""
+        if self._index_task is not None:
+            self._index_task.cancelled = True
+            self._index_task = None
+        self.generation += 1
+        if self._map is not None:
+            self._map.close()
+        self._map = None
+        self._inode = None
+        self.offsets = array('Q')
+        self.levels = bytearray()
+        self.indexed_end = 0
+        self._rows = array('Q') if self.min_level > 0 else None  # Shown line numbers when filtering by level
+
+    def close(self):
+        """Stop polling and indexing and release the mapping."""
+        self._poll_timer.stop()
+        self.beginResetModel()
+        self._reset_index()
+        self.endResetModel()
+
+    def poll(self):
+        """Start indexing new lines, or start over when the file was rotated or truncated."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return
+        if self._inode is None:
+            self._inode = stat.st_ino
+        elif stat.st_ino != self._inode or stat.st_size < self.indexed_end:
+            logging.info(f"Log viewer: {self.path} was rotated; following the new file.")
+            self.beginResetModel()
+            self._reset_index()
+            self._inode = stat.st_ino
+            self.endResetModel()
+            self.rotated.emit()
+        if self._index_task is None and stat.st_size > self.indexed_end:
+            self._index_task = _IndexTask(self.path, self.generation, self.indexed_end,
+                                          self.levels[-1] if self.levels else 0, self._signals)
+            QThreadPool.globalInstance().start(self._index_task)
+
+    def _on_indexed(self, generation, offsets, levels, end):
+        if generation != self.generation:
+            return
+        first_line = len(self.offsets)
+        new_rows = None
+        if self._rows is not None:
+            new_rows = rows_at_level(levels, self.min_level, first_line)
+        added = len(new_rows) if new_rows is not None else len(offsets)
+        if added:
+            first_row = self.rowCount()
+            self.beginInsertRows(QModelIndex(), first_row, first_row + added - 1)
+        self.offsets.extend(offsets)
+        self.levels.extend(levels)
+        self.indexed_end = end
+        if new_rows is not None:
+            self._rows.extend(new_rows)
+        if self._map is None or len(self._map) < end:
+            # Map the grown file; the old mapping only covers its previous size
+            if self._map is not None:
+                self._map.close()
+            self._map = _map_file(self.path)
+        if added:
+            self.endInsertRows()
+        self.progress.emit(end, self._file_size())
+
+    def _on_index_done(self, generation, error):
+        if generation != self.generation:
+            return
+        self._index_task = None
+        if error:
+            logging.warning(f"Log viewer failed to index {self.path}: {error}")
+        self.progress.emit(self.indexed_end, self._file_size())
+
+    def _file_size(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return self.indexed_end
+
+    def line_count(self):
+        """Return the number of indexed lines, shown or not."""
+        return len(self.offsets)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows) if self._rows is not None else len(self.offsets)
+
+    def line_of_row(self, row):
+        """Return the line number shown at a row."""
+        return self._rows[row] if self._rows is not None else row
+
+    def row_of_line(self, line):
+        """Return the row showing a line, or the row of the next shown line."""
+        return bisect.bisect_left(self._rows, line) if self._rows is not None else line
+
+    def line_text(self, line):
+        """Read and decode one line from the mapping."""
+        start = self.offsets[line]
+        end = self.offsets[line + 1] if line + 1 < len(self.offsets) else self.indexed_end
+        return self._map[start:end].rstrip(b'\r\n').decode('utf-8', errors='replace')
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or self._map is None:
+            return None
+        line = self.line_of_row(index.row())
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.line_text(line)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return LEVEL_COLORS.get(self.levels[line])
+        return None
+
+    def set_min_level(self, min_level):
+        """
+        Show only lines at or above a level; continuation lines share their record's level.
+
+        :param min_level: A level code (index into LEVEL_NAMES); 0 shows every line.
+        """
+        self.beginResetModel()
+        self.min_level = min_level
+        self._rows = rows_at_level(self.levels, min_level) if min_level > 0 else None
+        self.endResetModel()
+
+    def search(self, pattern, from_row, backwards=False):
+        """
+        Find the next (or previous) shown line matching a pattern in the
+        background; the row arrives via search_finished.
+
+        :param pattern: A compiled bytes regular expression.
+        :param from_row: Row to search from (excluded); -1 searches from the start.
+        :param backwards: Search towards the start of the file.
+        """
+        if from_row < 0:
+            from_line = len(self.offsets) if backwards else -1
+        else:
+            from_line = self.line_of_row(from_row)
+        QThreadPool.globalInstance().start(_SearchTask(
+            self.path, self.generation, pattern, self.offsets, self.levels, len(self.offsets),
+            self.indexed_end, from_line, backwards, self.min_level, self._signals))
+
+    def _on_found(self, generation, line):
+        if generation != self.generation:
+            return
+        self.search_finished.emit(self.row_of_line(line) if line >= 0 else -1)
+
+
+class LogViewer(QDockWidget):
+    """
+    Dock showing the application log or one of its rotated backups, with a
+    level filter, regular expression search and tail-following.
+    """
+
+    def __init__(self, log_file, parent=None):
+        """
+        Initialize the dock.
+
+        :param log_file: Path of the live log file.
+        :param parent: Parent widget (the main window).
+        """
+        super().__init__("Log Viewer", parent)
+        self.setObjectName('log_viewer')
+        self.log_file = log_file
+        self.model = None
+        self._extracted = {}  # backup path -> decompressed temporary file
+        self._signals = _ViewerSignals(self)
+        self._signals.extracted.connect(self._on_extracted)
+
+        self.file_box = QComboBox()
+        self.file_box.setToolTip("Live log or rotated backup")
+        self.file_box.activated.connect(self._on_file_chosen)
+        self.level_box = QComboBox()
+        self.level_box.addItems(["All levels"] + [f"{name}+" for name in LEVEL_NAMES[1:]])
+        self.level_box.currentIndexChanged.connect(self._on_level_chosen)
+        self.search_field = QLineEdit()
+        self.search_field.setPlaceholderText("Search (regular expression)")
+        self.search_field.returnPressed.connect(lambda: self.find(backwards=False))
+        previous_button = QPushButton("Previous")
+        previous_button.clicked.connect(lambda: self.find(backwards=True))
+        next_button = QPushButton("Next")
+        next_button.clicked.connect(lambda: self.find(backwards=False))
+        self.follow_box = QCheckBox("Follow")
+        self.follow_box.setChecked(True)
+        self.status_label = QLabel()
+
+        self.view = QListView()
+        self.view.setUniformItemSizes(True)  # Rows are never measured one by one
+        self.view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.view.setSelectionMode(QListView.SelectionMode.ExtendedSelection)
+
+        controls = QHBoxLayout()
+        controls.addWidget(self.file_box)
+        controls.addWidget(self.level_box)
+        controls.addWidget(self.search_field, 1)
+        controls.addWidget(previous_button)
+        controls.addWidget(next_button)
+        controls.addWidget(self.follow_box)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(4, 4, 4, 4)
+        layout.addLayout(controls)
+        layout.addWidget(self.view)
+        layout.addWidget(self.status_label)
+        container = QWidget()
+        container.setLayout(layout)
+        self.setWidget(container)
+
+    def showEvent(self, event):
+        """Open the live log when the dock is shown."""
+        if self.model is None:
+            self.refresh_files()
+            self.open_file(self.log_file, live=True)
+        super().showEvent(event)
+
+    def _on_level_chosen(self, index):
+        if self.model is not None:
+            self.model.set_min_level(index)
+
+    def refresh_files(self):
+        """List the live log and its rotated backups, newest first."""
+        current = self.file_box.currentData()
+        self.file_box.clear()
+        self.file_box.addItem(f"{os.path.basename(self.log_file)} (live)", self.log_file)
+        for backup in reversed(log_rotation.backup_files(self.log_file)):
+            self.file_box.addItem(os.path.basename(backup), backup)
+        index = self.file_box.findData(current) if current else 0
+        self.file_box.setCurrentIndex(max(0, index))
+
+    def _on_file_chosen(self, index):
+        path = self.file_box.itemData(index)
+        if path == self.log_file:
+            self.open_file(path, live=True)
+        elif not log_rotation.is_compressed(path):
+            self.open_file(path, live=False)
+        elif path in self._extracted:
+            self.open_file(self._extracted[path], live=False)
+        else:
+            self.status_label.setText(f"Decompressing {os.path.basename(path)}...")
+            QThreadPool.globalInstance().start(_ExtractTask(path, self._signals))
+
+    def _on_extracted(self, backup, path):
+        if not path:
+            self.status_label.setText(f"Could not open {os.path.basename(backup)}")
+            return
+        self._extracted[backup] = path
+        if self.file_box.currentData() == backup:
+            self.open_file(path, live=False)
+
+    def open_file(self, path, live):
+        """
+        Show a log file.
+
+        :param path: Path of the (uncompressed) log file.
+        :param live: Whether it is the live log, which is followed as it grows and rotates.
+        """
+        if self.model is not None:
+            self.model.close()
+            self.model.deleteLater()
+        self.model = LogListModel(path, live=live, parent=self)
+        self.model.set_min_level(self.level_box.currentIndex())
+        self.model.progress.connect(self._on_progress)
+        self.model.rowsInserted.connect(self._on_rows_inserted)
+        self.model.rotated.connect(self.refresh_files)
+        self.model.search_finished.connect(self._on_search_finished)
+        self.view.setModel(self.model)
+
+    def _on_progress(self, indexed, size):
+        lines = f"{self.model.line_count():,} lines"
+        if indexed < size:
+            lines += f", indexing {indexed * 100 // max(1, size)}%"
+        self.status_label.setText(lines)
+
+    def _on_rows_inserted(self):
+        if self.follow_box.isChecked() and self.model.live:
+            self.view.scrollToBottom()
+
+    def find(self, backwards=False):
+        """Search for the next (or previous) line matching the search field's regular expression."""
+        text = self.search_field.text()
+        if not text or self.model is None:
+            return
+        try:
+            pattern = re.compile(text.encode('utf-8'), re.IGNORECASE)
+        except re.error as e:
+            self.status_label.setText(f"Invalid regular expression: {e}")
+            return
+        self.follow_box.setChecked(False)
+        current = self.view.currentIndex()
+        self.model.search(pattern, current.row() if current.isValid() else -1, backwards)
+
+    def _on_search_finished(self, row):
+        if row < 0:
+            self.status_label.setText("No more matches")
+            return
+        index = self.model.index(row)
+        self.view.setCurrentIndex(index)
+        self.view.scrollTo(index, QListView.ScrollHint.PositionAtCenter)
+
+    def closeEvent(self, event):
+        """Stop following the log and remove decompressed backups."""
+        if self.model is not None:
+            self.view.setModel(None)
+            self.model.close()
+            self.model.deleteLater()
+            self.model = None
+        for path in self._extracted.values():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._extracted.clear()
+        super().closeEvent(event)
+
+
+def toggle_log_viewer(window):
+    """
+    Show the log viewer dock of a window, creating it on first use, or hide it.
+
+    :param window: The main application window (a QMainWindow).
+    """
+    viewer = getattr(window, 'log_viewer', None)
+    if viewer is not None and viewer.isVisible():
+        viewer.close()
+        return
+    if viewer is None:
+        config = getattr(window, 'config', None)
+        log_file = config.settings.logging.log_file if config is not None else 'logs/app.log'
+        viewer = LogViewer(os.path.normpath(log_file), window)
+        window.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, viewer)
+        window.log_viewer = viewer
+        logging.info("Log viewer opened.")
+    viewer.show()
+    viewer.raise_()
@@ -1,9 +1,18 @@
-import os
+from PyQt6.QtCore import QObject, pyqtSlot
 from PyQt6.QtWidgets import QMenuBar
 from PyQt6.QtGui import QIcon, QAction, QActionGroup
 import logging
-from modules import status_bar, about, themes
-from config.settings_dialog import SettingsDialog  # Ensure the SettingsDialog is correctly imported
+from modules import actions, icons, status_bar, themes, theme_index, theme_previews, tracing
+from modules.lazy_loader import get_subsystem
+from modules.status_bar import get_message_service
+
+# The About and Settings dialogs are only imported when first opened
+about = get_subsystem('about')
+settings_dialog = get_subsystem('settings_dialog')
+
+# Action ids of the File and Edit menus in display order (None is a separator)
+FILE_MENU_LAYOUT = ['file.new', 'file.open', 'file.save', None, 'file.print', None, 'file.exit']
+EDIT_MENU_LAYOUT = ['edit.undo', 'edit.redo', None, 'edit.cut', 'edit.copy', 'edit.paste', 'edit.select_all']
 
 def update_status_bar(status_bar, message):
     """
@@ -13,8 +22,8 @@ def update_status_bar(status_bar, message):
     :param message: The message to display on the status bar.
     """
     if status_bar:
-        status_bar.showMessage(message, 5000)  # Show message for 5 seconds
-        logging.info(f"Status bar updated: {message}")
+        # Coalesced and rate-limited by the status bar's message service
+        get_message_service(status_bar).post(message)
     else:
         logging.warning("Failed to update status bar: Status bar not initialized.")
 
@@ -28,96 +37,44 @@ def create_menu(window, config):
     :param config: The configuration object for the application.
     """
     try:
-        # Define paths for icons and styles to avoid repetition
-        icons_path = 'resources/icons'
-        styles_path = 'resources/styles'
-
         menubar = QMenuBar(window)
         
+        # File and Edit commands are shared with the toolbar
+        registry = actions.get_registry(window)
+
         # ------------------- File Menu -------------------
         file_menu = menubar.addMenu('File')
-        new_action = QAction(QIcon(f'{icons_path}/new.png'), 'New', window)
-        open_action = QAction(QIcon(f'{icons_path}/open.png'), 'Open', window)
-        save_action = QAction(QIcon(f'{icons_path}/save.png'), 'Save', window)
-        print_action = QAction(QIcon(f'{icons_path}/print.png'), 'Print', window)
-        exit_action = QAction(QIcon(f'{icons_path}/exit.png'), 'Exit', window)
-        exit_action.triggered.connect(window.close)
-        
-        file_menu.addAction(new_action)
-        file_menu.addAction(open_action)
-        file_menu.addAction(save_action)
-        file_menu.addSeparator()
-        file_menu.addAction(print_action)
-        file_menu.addSeparator()
-        file_menu.addAction(exit_action)
-        
+        registry.populate(file_menu, FILE_MENU_LAYOUT)
+
         # ------------------- Edit Menu -------------------
         edit_menu = menubar.addMenu('Edit')
-        undo_action = QAction(QIcon(f'{icons_path}/undo.png'), 'Undo', window)
-        redo_action = QAction(QIcon(f'{icons_path}/redo.png'), 'Redo', window)
-        cut_action = QAction(QIcon(f'{icons_path}/cut.png'), 'Cut', window)
-        copy_action = QAction(QIcon(f'{icons_path}/copy.png'), 'Copy', window)
-        paste_action = QAction(QIcon(f'{icons_path}/paste.png'), 'Paste', window)
-        select_all_action = QAction(QIcon(f'{icons_path}/select-all.png'), 'Select All', window)
-
-        edit_menu.addAction(undo_action)
-        edit_menu.addAction(redo_action)
-        edit_menu.addSeparator()
-        edit_menu.addAction(cut_action)
-        edit_menu.addAction(copy_action)
-        edit_menu.addAction(paste_action)
-        edit_menu.addAction(select_all_action)
-        
+        registry.populate(edit_menu, EDIT_MENU_LAYOUT)
+
         # ------------------- Settings Menu -------------------
-        settings_menu = menubar.addMenu(QIcon(f'{icons_path}/settings.png'), 'Settings')
+        settings_menu = menubar.addMenu(icons.get_icon('settings'), 'Settings')
         
         # App Settings (to open Settings Dialog)
-        app_settings_action = QAction(QIcon(f'{icons_path}/defaults.png'), 'Config Defaults', window)
+        app_settings_action = QAction(icons.get_icon('defaults'), 'Config Defaults', window)
         app_settings_action.triggered.connect(lambda: open_settings_dialog(window))
         settings_menu.addAction(app_settings_action)
         
         # Theme submenu
-        theme_menu = settings_menu.addMenu(QIcon(f'{icons_path}/themes.png'), 'Themes')
-
-        # Create a QActionGroup for exclusive selection of themes
-        theme_group = QActionGroup(window)
-        theme_group.setExclusive(True)
-        
-        # Ensure the styles directory exists
-        if not os.path.exists(styles_path):
-            os.makedirs(styles_path)
-
-        # List all .json theme files in the styles folder
-        theme_files = [f for f in os.listdir(styles_path) if f.endswith('.json')]
-
-        # Track the currently selected theme (optional: load it from config or default)
-        selected_theme = config.get_app_setting("theme", None)
-        
-        # Add each theme to the theme_menu with an icon
-        for theme_file in theme_files:
-            theme_name = os.path.splitext(theme_file)[0]  # Get theme name without extension
-            theme_action = QAction(QIcon(f'{icons_path}/{theme_name}.png'), theme_name, window)  # Add theme icon
-            theme_action.setCheckable(True)  # Make the action checkable
-            
-            # Add the theme_action to the theme_group
-            theme_group.addAction(theme_action)
-            
-            # Connect each theme action to apply the selected theme
-            theme_action.triggered.connect(
-                lambda checked, t=os.path.join(styles_path, theme_file), name=theme_name, action=theme_action:
-                apply_selected_theme(window, t, action, name)
-            )
-            
-            # Add the action to the menu
-            theme_menu.addAction(theme_action)
+        theme_menu = settings_menu.addMenu(icons.get_icon('themes'), 'Themes')
 
-            # Mark the theme as selected if it matches the current theme
-            if theme_name == selected_theme:
-                theme_action.setChecked(True)
+        # Theme actions are only created when the submenu is first opened,
+        # and rebuilt when the installed themes change
+        selected_theme = config.settings.app.theme or None
+        DynamicMenu(
+            theme_menu,
+            lambda target: populate_theme_menu(window, target, selected_theme),
+            version=theme_index_version,
+        )
 
         # ------------------- Help Menu -------------------
         help_menu = menubar.addMenu('Help')
-        about_action = QAction(QIcon(f'{icons_path}/about.png'), 'About', window)
+        help_menu.addAction(registry.get('view.log_viewer'))
+        help_menu.addSeparator()
+        about_action = QAction(icons.get_icon('about'), 'About', window)
         help_menu.addAction(about_action)
         
         # Connect to the About dialog
@@ -127,22 +84,118 @@ def create_menu(window, config):
         window.setMenuBar(menubar)
         logging.info("Full menu created successfully.")
         
-        # Connect actions to update the status bar
-        connect_menu_actions(new_action, "New file created", window)
-        connect_menu_actions(open_action, "File opened", window)
-        connect_menu_actions(save_action, "File saved", window)
-        connect_menu_actions(print_action, "Printing file", window)
-        connect_menu_actions(undo_action, "Undo action", window)
-        connect_menu_actions(redo_action, "Redo action", window)
-        connect_menu_actions(cut_action, "Cut action", window)
-        connect_menu_actions(copy_action, "Copy action", window)
-        connect_menu_actions(paste_action, "Paste action", window)
-        connect_menu_actions(select_all_action, "Selected all", window)
+        # Connect the About action to update the status bar
         connect_menu_actions(about_action, "Opened About dialog", window)
 
     except Exception as e:
         logging.error(f"Failed to create menu: {e}", exc_info=True)
 
+class DynamicMenu(QObject):
+    """
+    Fills a submenu on demand: the populate callback runs the first time the
+    menu is about to be shown, and again only after the menu was invalidated
+    or the version reported by the version callback changed.
+    """
+
+    def __init__(self, menu, populate, version=None):
+        """
+        Attach the filler to a menu (it is owned by, and deleted with, the menu).
+
+        :param menu: The QMenu to fill.
+        :param populate: Called with the (cleared) QMenu to add its actions.
+        :param version: Optional callable returning a value that changes
+                        whenever the menu contents are out of date.
+        """
+        super().__init__(menu)
+        self.menu = menu
+        self.populate = populate
+        self.version = version
+        self.built_version = None
+        self.is_built = False
+        menu.aboutToShow.connect(self.ensure_built)
+
+    def invalidate(self):
+        """Rebuild the menu the next time it is shown."""
+        self.is_built = False
+
+    def ensure_built(self):
+        """Populate the menu if it was never built or is out of date."""
+        current_version = self.version() if self.version is not None else None
+        if self.is_built and current_version == self.built_version:
+            return
+        try:
+            self.menu.clear()
+            self.populate(self.menu)
+            self.built_version = current_version
+            self.is_built = True
+        except Exception as e:
+            logging.error(f"Failed to populate menu '{self.menu.title()}': {e}", exc_info=True)
+
+
+def theme_index_version():
+    """
+    Return the theme index version, rescanning the styles directory if it changed.
+    """
+    theme_index.index.refresh()
+    return theme_index.index.version
+
+
+def populate_theme_menu(window, theme_menu, selected_theme=None):
+    """
+    Adds an action for each installed theme in the theme manifest to the
+    Themes submenu, marking the selected theme with a checkmark.
+
+    :param window: The main application window.
+    :param theme_menu: The (empty) Themes QMenu.
+    :param selected_theme: Name of the theme to check when the menu is built
+                           for the first time; afterwards the current choice is kept.
+    """
+    with tracing.span('menu.themes_submenu'):
+        # Keep the checkmark of a previous build of the menu
+        previews = theme_previews.get_provider()
+        theme_group = theme_menu.findChild(QActionGroup)
+        if theme_group is not None:
+            checked_action = theme_group.checkedAction()
+            if checked_action is not None:
+                selected_theme = checked_action.data()
+            receiver = theme_group.findChild(ThemePreviewReceiver)
+            if receiver is not None:
+                previews.preview_ready.disconnect(receiver.set_preview)
+            theme_group.deleteLater()
+
+        # Create a QActionGroup for exclusive selection of themes
+        theme_group = QActionGroup(theme_menu)
+        theme_group.setExclusive(True)
+
+        # Themes without a shipped icon get a preview rendered in the background; the
+        # receiver is owned by the group, so Qt disconnects it when the menu is destroyed
+        receiver = ThemePreviewReceiver(theme_group)
+        previews.preview_ready.connect(receiver.set_preview)
+
+        # Add each installed theme from the theme manifest
+        for entry in theme_index.index.entries():
+            icon = icons.get_icon(entry.icon) if entry.icon else QIcon()
+            theme_action = QAction(icon, entry.display_name, theme_group)
+            theme_action.setCheckable(True)  # Make the action checkable
+            theme_action.setData(entry.name)
+            if not entry.icon:
+                receiver.actions[entry.name] = theme_action
+                previews.request(entry.name, entry.path)
+
+            # Connect each theme action to apply the selected theme
+            theme_action.triggered.connect(
+                lambda checked, t=entry.path, name=entry.display_name, action=theme_action:
+                apply_selected_theme(window, t, action, name)
+            )
+
+            # Add the action to the menu
+            theme_menu.addAction(theme_action)
+
+            # Mark the theme as selected if it matches the current theme
+            if entry.name == selected_theme:
+                theme_action.setChecked(True)
+
+
 def apply_selected_theme(window, theme_file, theme_action, theme_name):
     """
     Applies the selected theme and updates the checkmark in the menu.
@@ -167,6 +220,33 @@ def apply_selected_theme(window, theme_file, theme_action, theme_name):
         logging.error(f"Failed to apply theme: {e}", exc_info=True)
 
 
+class ThemePreviewReceiver(QObject):
+    """
+    Sets rendered previews as the icons of a Themes submenu's actions. It is
+    a child of the submenu's QActionGroup, so its connection to the
+    process-wide preview_ready signal ends when the menu is destroyed.
+    """
+
+    def __init__(self, parent):
+        """
+        Initialize the receiver.
+
+        :param parent: The QActionGroup of the theme actions.
+        """
+        super().__init__(parent)
+        self.actions = {}  # Theme name -> QAction waiting for a preview
+
+    @pyqtSlot(str, str)
+    def set_preview(self, theme_name, preview_file):
+        """
+        Sets a rendered preview as the icon of a theme's menu action.
+
+        :param theme_name: The name of the theme the preview belongs to.
+        :param preview_file: Path to the rendered preview image.
+        """
+        action = self.actions.get(theme_name)
+        if action is not None:
+            action.setIcon(icons.get_icon(preview_file))
 
 def connect_menu_actions(action, message, window):
     """
@@ -181,9 +261,15 @@ def connect_menu_actions(action, message, window):
     except Exception as e:
         logging.error(f"Failed to connect action '{action.text()}': {e}", exc_info=True)
 
-def open_settings_dialog(window):
+def open_settings_dialog(window, tab_title=None, key=None):
     """
     Opens the SettingsDialog window to allow the user to modify application settings.
+
+    :param window: The main application window.
+    :param tab_title: Optional tab to open the dialog at.
+    :param key: Optional settings key on that tab to focus.
     """
-    settings_dialog = SettingsDialog(window)
-    settings_dialog.exec()
+    dialog = settings_dialog.SettingsDialog(window)
+    if tab_title is not None:
+        dialog.focus_field(tab_title, key)
+    dialog.exec()
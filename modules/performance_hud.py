@@ -0,0 +1,166 @@
+import gc
+import logging
+import os
+import sys
+import time
+from collections import deque
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from PyQt6.QtWidgets import QApplication, QLabel
+
+# How often the event loop latency is probed and the HUD text refreshed
+PROBE_INTERVAL_MS = 50
+REFRESH_INTERVAL_MS = 1000
+
+# Counting live QObjects walks the object trees, so it is only done every few refreshes
+QOBJECT_COUNT_EVERY = 5
+
+# Number of latency probes kept for the percentiles
+LATENCY_SAMPLES = 200
+
+
+def current_rss_bytes():
+    """
+    Return the resident set size of the process in bytes, or None if it
+    cannot be determined. Reads /proc on Linux, and falls back to the
+    peak RSS from getrusage elsewhere.
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # Kilobytes on Linux
+
+
+def count_live_qobjects(app):
+    """
+    Count the QObjects reachable from the application and its top-level widgets.
+
+    :param app: The QApplication instance.
+    :return: The number of objects.
+    """
+    count = 1 + len(app.findChildren(QObject))
+    for widget in app.topLevelWidgets():
+        count += 1 + len(widget.findChildren(QObject))
+    return count
+
+
+def percentile(sorted_values, fraction):
+    """Return the value at a fraction (0-1) of a sorted list, or 0.0 if it is empty."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+class PerformanceHud(QLabel):
+    """
+    Status bar label showing event loop latency (p50/p99), frames per
+    second, RSS memory, garbage collections per generation and the number
+    of live QObjects.
+
+    Latency is how late a PROBE_INTERVAL_MS timer fires. Frames are the
+    backing store flushes of the window (its UpdateRequest events), so no
+    application-wide event filter is needed. The text is refreshed every
+    REFRESH_INTERVAL_MS.
+    """
+
+    def __init__(self, window, parent=None):
+        """
+        Initialize the HUD and start sampling.
+
+        :param window: The top-level window whose frames are counted.
+        :param parent: Parent widget (the status bar).
+        """
+        super().__init__(parent)
+        self.watched_window = window
+        self.latencies_ms = deque(maxlen=LATENCY_SAMPLES)
+        self.frame_count = 0
+        self.qobject_count = None
+        self._refresh_count = 0
+        self._last_refresh_ns = time.perf_counter_ns()
+        self._last_frame_count = 0
+        self.setToolTip("Event loop latency p50/p99, frames per second, resident memory, "
+                        "GC collections per generation and live QObjects")
+
+        window.installEventFilter(self)
+
+        self._expected_ns = time.perf_counter_ns() + PROBE_INTERVAL_MS * 1_000_000
+        self._probe_timer = QTimer(self)
+        self._probe_timer.timeout.connect(self._probe)
+        self._probe_timer.start(PROBE_INTERVAL_MS)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self._refresh_timer.start(REFRESH_INTERVAL_MS)
+        self.refresh()
+
+    def eventFilter(self, watched, event):
+        """Count the window's frames."""
+        if watched is self.watched_window and event.type() == QEvent.Type.UpdateRequest:
+            self.frame_count += 1
+        return False
+
+    def _probe(self):
+        """Record how late the probe timer fired."""
+        now_ns = time.perf_counter_ns()
+        self.latencies_ms.append(max(0, now_ns - self._expected_ns) / 1e6)
+        self._expected_ns = now_ns + PROBE_INTERVAL_MS * 1_000_000
+
+    def stats(self):
+        """
+        Return the latest measurements.
+
+        :return: A dict with latency_p50_ms, latency_p99_ms, fps, rss_bytes,
+                 gc_collections (per generation) and qobjects.
+        """
+        now_ns = time.perf_counter_ns()
+        elapsed_s = max(1e-9, (now_ns - self._last_refresh_ns) / 1e9)
+        latencies = sorted(self.latencies_ms)
+        return {
+            'latency_p50_ms': percentile(latencies, 0.50),
+            'latency_p99_ms': percentile(latencies, 0.99),
+            'fps': (self.frame_count - self._last_frame_count) / elapsed_s,
+            'rss_bytes': current_rss_bytes(),
+            'gc_collections': [generation['collections'] for generation in gc.get_stats()],
+            'qobjects': self.qobject_count,
+        }
+
+    def refresh(self):
+        """Sample the measurements and update the text."""
+        if self._refresh_count % QOBJECT_COUNT_EVERY == 0:
+            app = QApplication.instance()
+            if app is not None:
+                self.qobject_count = count_live_qobjects(app)
+        self._refresh_count += 1
+
+        stats = self.stats()
+        self._last_refresh_ns = time.perf_counter_ns()
+        self._last_frame_count = self.frame_count
+
+        rss = stats['rss_bytes']
+        rss_text = f"{rss / (1024 * 1024):.1f} MB" if rss is not None else "n/a"
+        qobjects = stats['qobjects'] if stats['qobjects'] is not None else "n/a"
+        gc_text = '/'.join(str(count) for count in stats['gc_collections'])
+        self.setText(
+            f"Loop {stats['latency_p50_ms']:.1f}/{stats['latency_p99_ms']:.1f} ms | "
+            f"{stats['fps']:.0f} fps | RSS {rss_text} | GC {gc_text} | QObjects {qobjects}"
+        )
+
+
+def create_hud(window, status_bar):
+    """
+    Add a performance HUD to a status bar as a permanent widget.
+
+    :param window: The main application window.
+    :param status_bar: The window's QStatusBar.
+    :return: The PerformanceHud.
+    """
+    hud = PerformanceHud(window, status_bar)
+    status_bar.addPermanentWidget(hud)
+    logging.info("Performance HUD enabled in the status bar.")
+    return hud
@@ -0,0 +1,361 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+
+# Resource paths used throughout the app (e.g. 'resources/icons/new.png') are
+# relative to the project root, independent of the working directory.
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Packed bundle written by tools/build_resources.py
+DEFAULT_BUNDLE_FILE = os.path.join(PROJECT_ROOT, 'resources', 'resources.pak')
+BUNDLE_DIRECTORIES = ['resources/icons', 'resources/styles']
+BUNDLE_MAGIC = b'PQ6RES2\n'
+_HEADER = struct.Struct('<8sQ')  # magic, length of the JSON index
+
+# The packed files are stored as a Qt resource (rcc) image, so Qt can open
+# them lazily through ':/pyqt6ify/...' paths once the bundle is registered.
+QT_RESOURCE_ROOT = '/pyqt6ify'
+_RCC_HEADER = struct.Struct('>4sIIII')  # magic, version, tree, data and names offsets
+_RCC_DIRECTORY = struct.Struct('>IHII')  # name offset, flags, child count, first child
+_RCC_FILE = struct.Struct('>IHhhI')  # name offset, flags, territory, language, data offset
+_RCC_DIRECTORY_FLAG = 0x02
+_RCC_LANGUAGE_C = 1  # QLocale::C, the locale of files without a language
+
+# PYQT6IFY_RESOURCES selects where resources come from: 'auto' (bundle if it
+# exists, default), 'bundle' or 'fs'. PYQT6IFY_BUNDLE overrides the bundle path.
+MODE_ENV_VAR = 'PYQT6IFY_RESOURCES'
+BUNDLE_ENV_VAR = 'PYQT6IFY_BUNDLE'
+
+
+def resource_key(path):
+    """
+    Normalize a resource path to the project-relative, '/'-separated form
+    used as the bundle key.
+
+    :param path: Relative or absolute path.
+    :return: The key, or None if the path lies outside the project.
+    """
+    absolute = os.path.normpath(path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path))
+    relative = os.path.relpath(absolute, PROJECT_ROOT)
+    if relative.startswith('..'):
+        return None
+    return relative.replace(os.sep, '/')
+
+
+def filesystem_path(path):
+    """
+    Resolve a resource path on disk, relative paths against the project root.
+
+    :param path: Relative or absolute path.
+    :return: The absolute path.
+    """
+    return os.path.normpath(path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path))
+
+
+def qt_hash(name):
+    """Return the hash Qt uses to look up resource names (qt_hash in qresource.cpp)."""
+    h = 0
+    for unit in struct.unpack(f'>{len(name.encode("utf-16-be")) // 2}H', name.encode('utf-16-be')):
+        h = (h << 4) + unit
+        h ^= (h & 0xf0000000) >> 23
+        h &= 0x0fffffff
+    return h
+
+
+def build_rcc_image(files):
+    """
+    Build a Qt binary resource image (rcc format version 1), as registered
+    with QResource.registerResourceData.
+
+    :param files: List of (key, data) pairs, keys '/'-separated (e.g. 'resources/icons/new.png').
+    :return: A tuple (image, {key: offset of the file contents in the image}).
+    """
+    root = {}
+    for key, data in files:
+        *directories, name = key.split('/')
+        node = root
+        for directory in directories:
+            node = node.setdefault(directory, {})
+        node[name] = (key, data)
+
+    names, name_offsets = bytearray(), {}
+    payload, payload_offsets = bytearray(), {}
+    nodes = [(0, root)]  # Breadth-first, so the children of a directory are contiguous
+    entries = []
+    for name_offset, content in nodes:
+        if isinstance(content, dict):
+            children = sorted(content.items(), key=lambda item: qt_hash(item[0]))
+            entries.append(_RCC_DIRECTORY.pack(name_offset, _RCC_DIRECTORY_FLAG, len(children), len(nodes)))
+            for child_name, child in children:
+                if child_name not in name_offsets:
+                    encoded = child_name.encode('utf-16-be')
+                    name_offsets[child_name] = len(names)
+                    names += struct.pack('>HI', len(encoded) // 2, qt_hash(child_name)) + encoded
+                nodes.append((name_offsets[child_name], child))
+        else:
+            key, data = content
+            payload_offsets[key] = len(payload)
+            entries.append(_RCC_FILE.pack(name_offset, 0, 0, _RCC_LANGUAGE_C, len(payload)))
+            payload += struct.pack('>I', len(data)) + data
+
+    tree_offset = _RCC_HEADER.size
+    names_offset = tree_offset + sum(len(entry) for entry in entries)
+    data_offset = names_offset + len(names)
+    image = b''.join([_RCC_HEADER.pack(b'qres', 1, tree_offset, data_offset, names_offset),
+                      *entries, bytes(names), bytes(payload)])
+    # The contents follow the 4-byte length prefix of each payload entry
+    return image, {key: data_offset + offset + 4 for key, offset in payload_offsets.items()}
+
+
+def build_bundle(output_file=DEFAULT_BUNDLE_FILE, directories=BUNDLE_DIRECTORIES):
+    """
+    Pack every file of the given directories into a single bundle file:
+    a header, a JSON index of {key: [offset, length, mtime_ns]} and the
+    file contents as a Qt resource image (see build_rcc_image).
+
+    :param output_file: Path of the bundle to write.
+    :param directories: Project-relative directories to include.
+    :return: The number of files packed.
+    """
+    files = []
+    for directory in directories:
+        source_dir = filesystem_path(directory)
+        for name in sorted(os.listdir(source_dir)):
+            path = os.path.join(source_dir, name)
+            if os.path.isfile(path):
+                files.append((f'{directory}/{name}', path))
+
+    contents, index = [], {}
+    for key, path in files:
+        with open(path, 'rb') as file:
+            contents.append((key, file.read()))
+        index[key] = [None, len(contents[-1][1]), os.stat(path).st_mtime_ns]
+    image, offsets = build_rcc_image(contents)
+    for key, offset in offsets.items():
+        index[key][0] = offset
+
+    index_bytes = json.dumps({'files': index, 'directories': list(directories)}).encode('utf-8')
+    temp_file = f'{output_file}.tmp'
+    with open(temp_file, 'wb') as bundle:
+        bundle.write(_HEADER.pack(BUNDLE_MAGIC, len(index_bytes)))
+        bundle.write(index_bytes)
+        bundle.write(image)
+    os.replace(temp_file, output_file)
+    return len(files)
+
+
+class ResourceBundle:
+    """Read-only, memory-mapped view of a bundle written by build_bundle()."""
+
+    def __init__(self, bundle_file):
+        """
+        Open and map the bundle.
+
+        :param bundle_file: Path of the bundle file.
+        :raises ValueError: If the file is not a resource bundle.
+        """
+        self.bundle_file = bundle_file
+        self.bundle_mtime_ns = os.stat(bundle_file).st_mtime_ns
+        with open(bundle_file, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_length = _HEADER.unpack_from(self._map, 0)
+        if magic != BUNDLE_MAGIC:
+            self._map.close()
+            raise ValueError(f"{bundle_file} is not a resource bundle")
+        header = json.loads(self._map[_HEADER.size:_HEADER.size + index_length])
+        self.index = header['files']
+        self.directories = set(header['directories'])
+        self._data_offset = _HEADER.size + index_length
+        self._qt_resource_data = None
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def read(self, key):
+        """Return the contents of a packed file."""
+        offset, length, _ = self.index[key]
+        start = self._data_offset + offset
+        return self._map[start:start + length]
+
+    def mtime_ns(self, key):
+        """Return the modification time the packed file had when bundled."""
+        return self.index[key][2]
+
+    def register_qt_resource(self):
+        """
+        Register the packed files with Qt's resource system under QT_RESOURCE_ROOT.
+        Qt reads from the registered copy directly, so it is kept for the lifetime
+        of the bundle.
+
+        :return: True if the files are registered.
+        """
+        if self._qt_resource_data is None:
+            from PyQt6.QtCore import QResource
+            data = self._map[self._data_offset:]
+            if not QResource.registerResourceData(data, QT_RESOURCE_ROOT):
+                logging.error(f"Failed to register resource bundle {self.bundle_file} with Qt")
+                return False
+            self._qt_resource_data = data
+        return True
+
+    def list_directory(self, directory):
+        """Return the names of the packed files directly inside a directory."""
+        prefix = directory.rstrip('/') + '/'
+        return [key[len(prefix):] for key in self.index if key.startswith(prefix) and '/' not in key[len(prefix):]]
+
+
+class ResourceLoader:
+    """
+    Serves icons and theme files from the packed bundle when one is
+    available, falling back to the files on disk for development. Individual
+    files can be overridden so edits on disk (e.g. theme hot reload) win.
+    """
+
+    def __init__(self, mode=None, bundle_file=None):
+        """
+        Initialize the loader.
+
+        :param mode: 'auto', 'bundle' or 'fs' (defaults to $PYQT6IFY_RESOURCES or 'auto').
+        :param bundle_file: Bundle path (defaults to $PYQT6IFY_BUNDLE or resources/resources.pak).
+        """
+        self.mode = (mode or os.environ.get(MODE_ENV_VAR) or 'auto').lower()
+        self.bundle_file = bundle_file or os.environ.get(BUNDLE_ENV_VAR) or DEFAULT_BUNDLE_FILE
+        self.bundle = None
+        self.bundle_reads = 0
+        self.filesystem_reads = 0
+        self._overrides = set()
+        self._lock = threading.Lock()
+
+        if self.mode in ('auto', 'bundle') and os.path.exists(self.bundle_file):
+            try:
+                self.bundle = ResourceBundle(self.bundle_file)
+                logging.info(f"Using resource bundle {self.bundle_file} ({len(self.bundle.index)} files)")
+            except (OSError, ValueError, KeyError) as e:
+                logging.error(f"Failed to open resource bundle {self.bundle_file}: {e}")
+        if self.mode == 'bundle' and self.bundle is None:
+            logging.warning("Resource bundle requested but not available, using files on disk")
+
+    def _bundle_key(self, path):
+        """Return the bundle key for a path if the bundle should serve it, else None."""
+        if self.bundle is None:
+            return None
+        key = resource_key(path)
+        if key is None or key not in self.bundle or key in self._overrides:
+            return None
+        return key
+
+    def in_bundle(self, path):
+        """Whether the path is served from the bundle."""
+        return self._bundle_key(path) is not None
+
+    def read_bytes(self, path):
+        """
+        Read a resource.
+
+        :param path: Resource path, relative to the project root or absolute.
+        :return: The file contents.
+        :raises OSError: If the resource does not exist.
+        """
+        key = self._bundle_key(path)
+        if key is not None:
+            with self._lock:
+                self.bundle_reads += 1
+            return self.bundle.read(key)
+        with self._lock:
+            self.filesystem_reads += 1
+        with open(filesystem_path(path), 'rb') as file:
+            return file.read()
+
+    def qt_path(self, path):
+        """
+        Return a path Qt can open itself, e.g. to decode an icon lazily: a
+        ':/pyqt6ify/...' resource path for a bundled file, the file path otherwise.
+
+        :param path: Resource path, relative to the project root or absolute.
+        """
+        key = self._bundle_key(path)
+        if key is not None:
+            with self._lock:
+                registered = self.bundle.register_qt_resource()
+            if registered:
+                return f':{QT_RESOURCE_ROOT}/{key}'
+        return filesystem_path(path)
+
+    def read_text(self, path, encoding='utf-8'):
+        """Read a resource as text."""
+        return self.read_bytes(path).decode(encoding)
+
+    def exists(self, path):
+        """Whether the resource exists in the bundle or on disk."""
+        return self._bundle_key(path) is not None or os.path.isfile(filesystem_path(path))
+
+    def mtime_ns(self, path):
+        """
+        Return the modification time of a resource.
+
+        :raises OSError: If the resource does not exist.
+        """
+        key = self._bundle_key(path)
+        if key is not None:
+            return self.bundle.mtime_ns(key)
+        return os.stat(filesystem_path(path)).st_mtime_ns
+
+    def list_files(self, directory, suffix=''):
+        """
+        List the files in a resource directory from the bundle and from disk.
+
+        :param directory: Project-relative directory (e.g. 'resources/styles').
+        :param suffix: Only include names ending with this suffix.
+        :return: A sorted list of file names.
+        """
+        names = set()
+        key = resource_key(directory)
+        if self.bundle is not None and key in self.bundle.directories:
+            names.update(self.bundle.list_directory(key))
+        disk_dir = filesystem_path(directory)
+        if os.path.isdir(disk_dir):
+            names.update(entry.name for entry in os.scandir(disk_dir) if entry.is_file())
+        return sorted(name for name in names if name.endswith(suffix))
+
+    def directory_token(self, directory):
+        """
+        Return a value that changes whenever the directory listing may have
+        changed: the bundle's modification time together with the directory's.
+
+        :param directory: Project-relative directory.
+        :return: A tuple, or None if the directory exists neither in the bundle nor on disk.
+        """
+        key = resource_key(directory)
+        bundle_mtime = self.bundle.bundle_mtime_ns if self.bundle is not None and key in self.bundle.directories else None
+        try:
+            disk_mtime = os.stat(filesystem_path(directory)).st_mtime_ns
+        except OSError:
+            disk_mtime = None
+        if bundle_mtime is None and disk_mtime is None:
+            return None
+        return (bundle_mtime, disk_mtime)
+
+    def override_with_filesystem(self, path):
+        """
+        Serve a resource from disk from now on, e.g. after it was edited.
+
+        :param path: Resource path.
+        """
+        key = resource_key(path)
+        if key is not None:
+            self._overrides.add(key)
+
+    def stats(self):
+        """Return the number of reads served from the bundle and from disk."""
+        return {
+            'bundle': self.bundle_file if self.bundle is not None else None,
+            'bundle_reads': self.bundle_reads,
+            'filesystem_reads': self.filesystem_reads,
+        }
+
+
+# Process-wide loader used by icons, themes and the theme index
+loader = ResourceLoader()
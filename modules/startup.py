@@ -0,0 +1,183 @@
+import logging
+import time
+from PyQt6.QtCore import QObject, QEvent, QTimer, pyqtSignal
+from modules import tracing
+
+
+class StartupStage:
+    """
+    A unit of deferred startup work.
+
+    :param name: Unique stage name, used for dependencies and reporting.
+    :param callback: Callable run on the GUI thread when the stage is due.
+    :param priority: Lower values run first among stages that are ready.
+    :param depends_on: Names of stages that must complete successfully first.
+    """
+
+    def __init__(self, name, callback, priority=0, depends_on=()):
+        self.name = name
+        self.callback = callback
+        self.priority = priority
+        self.depends_on = tuple(depends_on)
+        self.state = 'pending'  # pending, done, failed or skipped
+        self.duration_ms = None
+
+
+class StartupScheduler(QObject):
+    """
+    Runs startup stages one at a time from the Qt event loop so the window
+    can paint between them, and reports time-to-first-paint separately from
+    time-to-fully-interactive.
+    """
+
+    finished = pyqtSignal()
+
+    # How long to wait for the skeleton window to paint before running stages anyway
+    FIRST_PAINT_TIMEOUT_MS = 200
+
+    def __init__(self, window=None, origin_ns=None, parent=None):
+        """
+        Initialize the scheduler.
+
+        :param window: Widget whose first paint event is reported (optional).
+        :param origin_ns: perf_counter_ns() reference for the reported times,
+                          defaults to the process start recorded by the tracer.
+        :param parent: Parent QObject.
+        """
+        super().__init__(parent)
+        self.stages = {}
+        self.origin_ns = origin_ns if origin_ns is not None else tracing.PROCESS_START_NS
+        self.first_paint_ms = None
+        self.interactive_ms = None
+        self._window = window
+        self._started = False
+        self._running = False
+
+        if window is not None:
+            window.installEventFilter(self)
+
+    def add_stage(self, name, callback, priority=0, depends_on=()):
+        """
+        Register a stage to run once the event loop is idle.
+
+        :param name: Unique stage name.
+        :param callback: Callable run on the GUI thread.
+        :param priority: Lower values run first among ready stages.
+        :param depends_on: Names of stages that must complete first.
+        :return: The created StartupStage.
+        """
+        if name in self.stages:
+            raise ValueError(f"Startup stage '{name}' is already registered")
+        stage = StartupStage(name, callback, priority, depends_on)
+        self.stages[name] = stage
+        return stage
+
+    def start(self):
+        """
+        Begin running stages from the event loop. If a visible window is being
+        watched, the first stage waits until it has painted (or the paint
+        timeout expires) so the skeleton appears before any stage runs.
+        """
+        if self._started:
+            return
+        self._started = True
+        if self._window is not None and self._window.isVisible() and self.first_paint_ms is None:
+            QTimer.singleShot(self.FIRST_PAINT_TIMEOUT_MS, self._begin)
+        else:
+            QTimer.singleShot(0, self._begin)
+
+    def _begin(self):
+        """Run the first stage, unless stages are already running."""
+        if self._running or self.interactive_ms is not None:
+            return
+        self._running = True
+        self._run_next()
+
+    def run_until_complete(self):
+        """Run all remaining stages synchronously (for benchmarks and headless use)."""
+        if self.interactive_ms is not None:
+            return
+        self._started = True
+        self._running = True
+        while self._running:
+            self._run_next(schedule=False)
+
+    def is_complete(self):
+        """Whether every registered stage has finished, failed or been skipped."""
+        return all(stage.state != 'pending' for stage in self.stages.values())
+
+    def _next_ready_stage(self):
+        """
+        Pick the pending stage with the lowest priority whose dependencies are
+        done, skipping stages whose dependencies failed or are unknown.
+
+        :return: A StartupStage, or None if no stage is ready.
+        """
+        skipped_any = True
+        while skipped_any:
+            skipped_any = False
+            for stage in self.stages.values():
+                if stage.state != 'pending':
+                    continue
+                dependencies = [self.stages.get(name) for name in stage.depends_on]
+                if any(dep is None or dep.state in ('failed', 'skipped') for dep in dependencies):
+                    stage.state = 'skipped'
+                    skipped_any = True
+                    logging.warning(f"Skipping startup stage '{stage.name}': unmet dependency in {stage.depends_on}")
+
+        ready = [stage for stage in self.stages.values()
+                 if stage.state == 'pending' and all(self.stages[name].state == 'done' for name in stage.depends_on)]
+        return min(ready, key=lambda s: s.priority) if ready else None
+
+    def _run_next(self, schedule=True):
+        """
+        Run the next ready stage, then yield back to the event loop.
+
+        :param schedule: Whether to queue the following stage on the event loop.
+        """
+        if not self._running:
+            return
+        stage = self._next_ready_stage()
+        if stage is None:
+            if any(s.state == 'pending' for s in self.stages.values()):
+                pending = [s.name for s in self.stages.values() if s.state == 'pending']
+                logging.error(f"Startup stages have circular dependencies: {', '.join(pending)}")
+                for name in pending:
+                    self.stages[name].state = 'skipped'
+            self._finish()
+            return
+
+        start_ns = time.perf_counter_ns()
+        try:
+            with tracing.span(f'stage.{stage.name}', priority=stage.priority):
+                stage.callback()
+            stage.state = 'done'
+        except Exception as e:
+            stage.state = 'failed'
+            logging.error(f"Startup stage '{stage.name}' failed: {e}", exc_info=True)
+        stage.duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
+        logging.info(f"Startup stage '{stage.name}' {stage.state} in {stage.duration_ms:.1f} ms")
+
+        if schedule:
+            QTimer.singleShot(0, self._run_next)
+
+    def _finish(self):
+        """Record time-to-fully-interactive and emit finished."""
+        self._running = False
+        self.interactive_ms = (time.perf_counter_ns() - self.origin_ns) / 1e6
+        tracing.instant('fully_interactive')
+        first_paint = f"{self.first_paint_ms:.1f} ms" if self.first_paint_ms is not None else "not painted yet"
+        logging.info(f"Time to first paint: {first_paint}; "
+                     f"time to fully interactive: {self.interactive_ms:.1f} ms")
+        self.finished.emit()
+
+    def eventFilter(self, obj, event):
+        """Record the first paint of the watched window."""
+        if obj is self._window and event.type() == QEvent.Type.Paint and self.first_paint_ms is None:
+            self.first_paint_ms = (time.perf_counter_ns() - self.origin_ns) / 1e6
+            tracing.instant('first_paint')
+            logging.info(f"First paint after {self.first_paint_ms:.1f} ms")
+            self._window.removeEventFilter(self)
+            if self._started:
+                QTimer.singleShot(0, self._begin)
+        return False
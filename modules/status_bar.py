@@ -1,33 +1,264 @@
+import itertools
 import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
 from PyQt6.QtWidgets import QStatusBar, QLabel
+from modules.lazy_loader import get_subsystem
+
+# The performance HUD is only imported when enabled
+performance_hud = get_subsystem('performance_hud')
+
+# Message priorities (see StatusMessageService)
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 1
+PRIORITY_HIGH = 2
+
+DEFAULT_MAX_RATE_HZ = 30
+DEFAULT_TIMEOUT_MS = 5000
+
+# Messages logged per source and second before the rest are logged at DEBUG
+DEFAULT_LOG_BUDGET = 5
+
+
+@dataclass(frozen=True)
+class StatusMessage:
+    """
+    A message posted to the status bar.
+
+    :param text: The text to display.
+    :param source: Name of the sender; a newer message replaces an undisplayed one from the same source.
+    :param priority: PRIORITY_LOW, PRIORITY_NORMAL or PRIORITY_HIGH.
+    :param timeout_ms: How long a non-sticky message is displayed.
+    :param sticky: Keep the message until it is cleared, showing it again after temporary messages.
+    :param sequence: Posting order, used to prefer the newest of equal-priority messages.
+    """
+    text: str
+    source: str
+    priority: int
+    timeout_ms: int
+    sticky: bool
+    sequence: int
+
+
+class StatusMessageService(QObject):
+    """
+    Shows messages posted from anywhere (including worker threads) on a
+    status bar without repainting it for every message.
+
+    Posting only records the message as the latest one of its source; the
+    status bar is updated at most max_rate_hz times per second with the
+    highest-priority (then newest) pending message. A temporary message is
+    not replaced by a lower-priority one until it expires, and sticky
+    messages stay until cleared, reappearing when temporary messages
+    expire. Each source may log log_budget messages per second at their
+    own level; the rest are logged at DEBUG.
+    """
+
+    _wake = pyqtSignal()
+
+    def __init__(self, status_bar, max_rate_hz=DEFAULT_MAX_RATE_HZ, log_budget=DEFAULT_LOG_BUDGET):
+        """
+        Initialize the service.
+
+        :param status_bar: The QStatusBar to show messages on; it becomes the parent.
+        :param max_rate_hz: Maximum number of status bar updates per second (0 for no limit).
+        :param log_budget: Messages logged per source and second before switching to DEBUG.
+        """
+        super().__init__(status_bar)
+        self.status_bar = status_bar
+        self.min_interval_ms = 1000.0 / max_rate_hz if max_rate_hz > 0 else 0.0
+        self.log_budget = log_budget
+        self.posted_count = 0
+        self.repaint_count = 0
+
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._pending = {}      # source -> latest undisplayed StatusMessage
+        self._sticky = {}       # source -> StatusMessage
+        self._log_windows = {}  # source -> (window start in ns, messages logged in the window)
+        self._woken = False     # A flush is already scheduled for the pending messages
+        self._shown = None
+        self._shown_until_ns = 0
+        self._last_flush_ns = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        # Emitted from any thread; Qt delivers it on the thread owning the service
+        self._wake.connect(self._schedule)
+        status_bar.messageChanged.connect(self._on_message_changed)
+
+    def post(self, text, source='default', priority=PRIORITY_NORMAL, timeout_ms=DEFAULT_TIMEOUT_MS,
+             sticky=False, log_level=logging.INFO):
+        """
+        Queue a message for display. Safe to call from any thread.
+
+        :param text: The text to display.
+        :param source: Name of the sender (see StatusMessage).
+        :param priority: PRIORITY_LOW, PRIORITY_NORMAL or PRIORITY_HIGH.
+        :param timeout_ms: How long a non-sticky message is displayed.
+        :param sticky: Keep the message until clear_sticky(source) is called.
+        :param log_level: Level to log the message at, or None to not log it.
+        """
+        now_ns = time.monotonic_ns()
+        with self._lock:
+            message = StatusMessage(text, source, priority, timeout_ms, sticky, next(self._sequence))
+            self.posted_count += 1
+            if sticky:
+                self._sticky[source] = message
+            self._pending[source] = message
+            wake, self._woken = not self._woken, True
+            if log_level is not None:
+                log_level = self._budget_log_level(source, log_level, now_ns)
+
+        if log_level is not None and logging.getLogger().isEnabledFor(log_level):
+            logging.log(log_level, "Status bar updated with message: '%s'", text)
+        if wake:
+            self._wake.emit()
+
+    def _budget_log_level(self, source, log_level, now_ns):
+        """Return the level to log a message of a source at; called with the lock held."""
+        start_ns, count = self._log_windows.get(source, (now_ns, 0))
+        if now_ns - start_ns >= 1_000_000_000:
+            start_ns, count = now_ns, 0
+        count += 1
+        self._log_windows[source] = (start_ns, count)
+        if count <= self.log_budget:
+            return log_level
+        if count == self.log_budget + 1:
+            logging.info(f"Status messages from '{source}' exceed {self.log_budget} per second; "
+                         "logging the rest at DEBUG")
+        return logging.DEBUG
+
+    def clear_sticky(self, source='default'):
+        """
+        Remove the sticky message of a source, clearing it from the status bar if displayed.
+
+        :param source: Name of the sender.
+        """
+        with self._lock:
+            message = self._sticky.pop(source, None)
+            if message is not None and self._pending.get(source) is message:
+                del self._pending[source]
+        if message is not None and self._shown is message:
+            self.status_bar.clearMessage()
+
+    def _schedule(self):
+        """Flush now if the rate limit allows, otherwise when it does."""
+        if self._timer.isActive():
+            return
+        if self._last_flush_ns is None:
+            wait_ms = 0.0
+        else:
+            wait_ms = self.min_interval_ms - (time.monotonic_ns() - self._last_flush_ns) / 1e6
+        if wait_ms <= 0:
+            self.flush()
+        else:
+            self._timer.start(math.ceil(wait_ms))
+
+    def flush(self):
+        """Display the best pending message."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._woken = False
+        if not pending:
+            return
+        now_ns = time.monotonic_ns()
+        self._last_flush_ns = now_ns
+        message = max(pending.values(), key=lambda m: (m.priority, m.sequence))
+
+        shown = self._shown
+        if shown is not None and not shown.sticky and now_ns < self._shown_until_ns \
+                and shown.priority > message.priority:
+            # Keep the pending messages until the higher-priority message expires
+            with self._lock:
+                for source, waiting in pending.items():
+                    self._pending.setdefault(source, waiting)
+                self._woken = True
+            self._timer.start(math.ceil((self._shown_until_ns - now_ns) / 1e6))
+            return
+
+        self._shown = message
+        self._shown_until_ns = 0 if message.sticky else now_ns + message.timeout_ms * 1_000_000
+        self.repaint_count += 1
+        self.status_bar.showMessage(message.text, 0 if message.sticky else message.timeout_ms)
+
+    def _on_message_changed(self, text):
+        """Show the newest sticky message again once a message expires or is cleared."""
+        if text:
+            return
+        self._shown = None
+        with self._lock:
+            if not self._sticky:
+                return
+            message = max(self._sticky.values(), key=lambda m: (m.priority, m.sequence))
+            self._pending.setdefault(message.source, message)
+            wake, self._woken = not self._woken, True
+        if wake:
+            self._schedule()
+
+
+def get_message_service(status_bar):
+    """
+    Return the message service of a status bar. The service is created on
+    the GUI thread by create_status_bar, so this is a plain attribute lookup
+    and safe from any thread. A status bar created elsewhere (e.g. by
+    QMainWindow.statusBar()) gets a service on first use, which must then
+    happen on the GUI thread.
+
+    :param status_bar: The QStatusBar object.
+    :return: The status bar's StatusMessageService.
+    :raises RuntimeError: If the status bar has no service yet and this is not its thread.
+    """
+    service = getattr(status_bar, 'message_service', None)
+    if service is None:
+        if QThread.currentThread() is not status_bar.thread():
+            raise RuntimeError("The status bar's message service must be created on the GUI thread")
+        service = StatusMessageService(status_bar)
+        status_bar.message_service = service
+    return service
+
 
 def create_status_bar(window):
     """
     Creates and sets up the status bar for the main window.
     A permanent label with the text "Ready" is added to the status bar.
-    
+
     :param window: The main application window.
     """
     try:
         status_bar = QStatusBar(window)
         window.setStatusBar(status_bar)
-        
+
         # Adding a permanent label to the status bar
         permanent_label = QLabel("Ready")
         status_bar.addPermanentWidget(permanent_label)
-        
+
+        # Messages are coalesced and shown at most status_max_rate times per second
+        config = getattr(window, 'config', None)
+        max_rate_hz = config.settings.app.status_max_rate if config is not None else DEFAULT_MAX_RATE_HZ
+        status_bar.message_service = StatusMessageService(status_bar, max_rate_hz=max_rate_hz)
+
+        # Optional live performance HUD next to the "Ready" label
+        if config is not None and config.settings.app.performance_hud:
+            window.performance_hud = performance_hud.create_hud(window, status_bar)
+
         logging.info("Status bar initialized successfully.")
         logging.info("Permanent status label set to 'Ready'.")
-        
+
     except Exception as e:
         logging.error(f"Failed to create status bar: {e}")
 
-def update_status_bar(status_bar, message):
+def update_status_bar(status_bar, message, **kwargs):
     """
-    Updates the status bar with a temporary message.
-    
+    Updates the status bar with a temporary message. Updates are coalesced
+    and rate-limited by the status bar's StatusMessageService.
+
     :param status_bar: The QStatusBar object.
     :param message: The message to display in the status bar.
+    :param kwargs: Options for StatusMessageService.post, e.g. source, priority or sticky.
     """
-    status_bar.showMessage(message, 5000)  # Display the message for 5 seconds
-    logging.info(f"Status bar updated with message: '{message}'")
+    get_message_service(status_bar).post(message, **kwargs)
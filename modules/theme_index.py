@@ -0,0 +1,181 @@
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, asdict
+from modules import resources
+
+# Default locations of the theme files, their optional preview icons and
+# the persistent manifest
+STYLES_PATH = 'resources/styles'
+ICONS_PATH = 'resources/icons'
+MANIFEST_FILE = os.path.join(resources.PROJECT_ROOT, 'cache', 'theme_manifest.json')
+
+MANIFEST_VERSION = 2
+
+
+@dataclass(frozen=True)
+class ThemeEntry:
+    """
+    One installed theme as listed in the manifest.
+
+    :param name: Theme name (the file name without extension).
+    :param display_name: Human-readable name from the JSON 'name' field.
+    :param path: Path to the theme JSON file.
+    :param mtime_ns: Modification time of the theme file.
+    :param icon: Path of the preview icon, or None if the theme has none.
+    """
+    name: str
+    display_name: str
+    path: str
+    mtime_ns: int
+    icon: str = None
+
+
+class ThemeIndex:
+    """
+    Persistent manifest of the installed themes. The styles directory (in
+    the resource bundle and on disk) is only rescanned when its modification
+    time changes (a theme was added, removed or replaced), and within a
+    rescan only files whose modification time changed are read again.
+    """
+
+    def __init__(self, styles_path=STYLES_PATH, manifest_file=MANIFEST_FILE, icons_path=ICONS_PATH):
+        """
+        Initialize the index and load the manifest from disk, if present.
+
+        :param styles_path: Directory containing the theme JSON files.
+        :param manifest_file: Path of the manifest JSON file.
+        :param icons_path: Directory searched for '<theme>.png' preview icons.
+        """
+        self.styles_path = styles_path
+        self.manifest_file = manifest_file
+        self.icons_path = icons_path
+        self.version = 0  # Incremented whenever the list of entries changes
+        self._directory_token = None
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._load_manifest()
+
+    def _load_manifest(self):
+        """Load a previously saved manifest, ignoring it if unreadable or outdated."""
+        try:
+            with open(self.manifest_file, 'r') as file:
+                manifest = json.load(file)
+            if manifest.get('version') != MANIFEST_VERSION or manifest.get('styles_path') != self.styles_path:
+                return
+            self._entries = {item['name']: ThemeEntry(**item) for item in manifest['themes']}
+            self._directory_token = manifest['directory_token']
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.warning(f"Ignoring unreadable theme manifest {self.manifest_file}: {e}")
+
+    def _save_manifest(self):
+        """Write the manifest so the next start can skip the directory scan."""
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'styles_path': self.styles_path,
+            'directory_token': self._directory_token,
+            'themes': [asdict(entry) for entry in self._entries.values()],
+        }
+        try:
+            os.makedirs(os.path.dirname(self.manifest_file) or '.', exist_ok=True)
+            temp_file = f"{self.manifest_file}.tmp"
+            with open(temp_file, 'w') as file:
+                json.dump(manifest, file, indent=2)
+            os.replace(temp_file, self.manifest_file)
+        except OSError as e:
+            logging.warning(f"Failed to save theme manifest {self.manifest_file}: {e}")
+
+    def refresh(self, force=False):
+        """
+        Rescan the styles directory if it changed since the last scan.
+
+        :param force: Rescan even if the directory modification time is
+                      unchanged (picks up in-place edits of theme files).
+        :return: True if the list of entries changed.
+        """
+        with self._lock:
+            # JSON stores the token as a list, so compare it as one
+            token = resources.loader.directory_token(self.styles_path)
+            token = list(token) if token is not None else None
+            if token is None:
+                logging.warning(f"Theme directory not found: {self.styles_path}")
+                changed = bool(self._entries)
+                self._entries, self._directory_token = {}, None
+                if changed:
+                    self.version += 1
+                return changed
+
+            if not force and token == self._directory_token:
+                return False
+
+            entries = {}
+            for file_name in resources.loader.list_files(self.styles_path, '.json'):
+                name = os.path.splitext(file_name)[0]
+                path = f'{self.styles_path}/{file_name}'
+                mtime_ns = resources.loader.mtime_ns(path)
+                previous = self._entries.get(name)
+                if previous is not None and previous.mtime_ns == mtime_ns:
+                    entries[name] = previous
+                else:
+                    entries[name] = self._read_entry(name, path, mtime_ns)
+
+            changed = entries != self._entries
+            self._entries = entries
+            self._directory_token = token
+            if changed:
+                self.version += 1
+                logging.info(f"Theme manifest rebuilt: {len(entries)} themes")
+            self._save_manifest()
+            return changed
+
+    def _read_entry(self, name, path, mtime_ns):
+        """
+        Build the manifest entry for a new or modified theme file.
+
+        :param name: Theme name.
+        :param path: Path to the theme JSON file.
+        :param mtime_ns: Modification time of the file.
+        :return: A ThemeEntry.
+        """
+        display_name = name
+        try:
+            display_name = json.loads(resources.loader.read_text(path)).get('name') or name
+        except (OSError, ValueError, AttributeError) as e:
+            logging.warning(f"Could not read display name from theme {path}: {e}")
+
+        icon = f'{self.icons_path}/{name}.png'
+        return ThemeEntry(
+            name=name,
+            display_name=display_name,
+            path=path,
+            mtime_ns=mtime_ns,
+            icon=icon if resources.loader.exists(icon) else None,
+        )
+
+    def entries(self):
+        """
+        Return the installed themes, rescanning only if the directory changed.
+
+        :return: A list of ThemeEntry objects sorted by name.
+        """
+        self.refresh()
+        with self._lock:
+            return list(self._entries.values())
+
+    def get(self, name):
+        """
+        Look up a theme by name.
+
+        :param name: Theme name (file name without extension).
+        :return: The ThemeEntry, or None if no such theme is installed.
+        """
+        self.refresh()
+        with self._lock:
+            return self._entries.get(name)
+
+
+# Process-wide index of the themes in resources/styles
+index = ThemeIndex()
@@ -0,0 +1,167 @@
+import atexit
+import hashlib
+import logging
+import os
+from PyQt6.QtCore import QObject, QRect, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QColor, QImage, QPainter
+from modules import resources, themes
+
+# Rendered previews are stored as '<content hash>.png', so a preview is only
+# rendered again when the theme file's contents change
+PREVIEW_CACHE_DIR = os.path.join(resources.PROJECT_ROOT, 'cache', 'theme_previews')
+PREVIEW_WIDTH = 96
+PREVIEW_HEIGHT = 64
+
+
+def theme_file_hash(theme_file):
+    """
+    Hash the contents of a theme file.
+
+    :param theme_file: Path to the theme JSON file.
+    :return: A hex digest identifying the file contents.
+    """
+    return hashlib.sha256(resources.loader.read_bytes(theme_file)).hexdigest()[:20]
+
+
+def render_preview(theme, width=PREVIEW_WIDTH, height=PREVIEW_HEIGHT):
+    """
+    Paint a miniature window using a compiled theme's colors: a menu bar with
+    a highlighted item, the window background with text lines, and a button.
+    Only QImage and QPainter are used, so this is safe to call off the GUI thread.
+
+    :param theme: The CompiledTheme to preview.
+    :param width: Width of the preview in pixels.
+    :param height: Height of the preview in pixels.
+    :return: The rendered QImage.
+    """
+    colors = theme.colors
+    image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(QColor(colors['window_background']))
+
+    painter = QPainter(image)
+    try:
+        menu_height = height // 5
+        painter.fillRect(QRect(0, 0, width, menu_height), QColor(colors['menu_background']))
+        painter.fillRect(QRect(width // 4, 0, width // 4, menu_height), QColor(colors['highlight_color']))
+        for index in range(3):
+            painter.fillRect(QRect(4 + index * width // 4, menu_height // 2 - 1, width // 8, 2),
+                             QColor(colors['menu_text']))
+
+        for row in range(2):
+            top = menu_height + 6 + row * 7
+            painter.fillRect(QRect(6, top, width * (2 - row) // 3, 3), QColor(colors['window_text']))
+
+        button = QRect(width // 2, height - height // 3, width // 2 - 6, height // 4)
+        painter.fillRect(button, QColor(colors['button_background']))
+        painter.fillRect(QRect(button.left() + 6, button.center().y() - 1, button.width() - 12, 2),
+                         QColor(colors['button_text']))
+        painter.setPen(QColor(colors['window_text']))
+        painter.drawRect(image.rect().adjusted(0, 0, -1, -1))
+    finally:
+        painter.end()
+    return image
+
+
+class _PreviewSignals(QObject):
+    """Signals emitted from worker threads and delivered on the GUI thread."""
+    finished = pyqtSignal(str, str)  # theme name, preview image path
+    failed = pyqtSignal(str, str)    # theme name, error message
+
+
+class _PreviewTask(QRunnable):
+    """Worker that hashes a theme file and renders its preview if not cached."""
+
+    def __init__(self, name, theme_file, cache_dir, signals):
+        super().__init__()
+        self.name = name
+        self.theme_file = theme_file
+        self.cache_dir = cache_dir
+        self.signals = signals
+
+    def run(self):
+        try:
+            self._emit(self.signals.finished, self._render())
+        except Exception as e:
+            self._emit(self.signals.failed, str(e))
+
+    def _render(self):
+        """Return the cached preview path, rendering the preview first if needed."""
+        preview_file = os.path.join(self.cache_dir, f'{theme_file_hash(self.theme_file)}.png')
+        if not os.path.exists(preview_file):
+            image = render_preview(themes.registry.get(self.theme_file))
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_file = f'{preview_file}.{os.getpid()}.tmp.png'
+            if not image.save(temp_file, 'PNG'):
+                raise OSError(f"Could not write {temp_file}")
+            os.replace(temp_file, preview_file)
+            logging.debug(f"Rendered theme preview for {self.name}: {preview_file}")
+        return preview_file
+
+    def _emit(self, signal, value):
+        """Report back to the GUI thread unless the provider is already gone."""
+        try:
+            signal.emit(self.name, value)
+        except RuntimeError:
+            pass  # The application is shutting down
+
+
+class ThemePreviewProvider(QObject):
+    """
+    Renders theme previews on the global thread pool and caches them on disk
+    by content hash. Listen to preview_ready to receive the image paths.
+    """
+
+    preview_ready = pyqtSignal(str, str)  # theme name, preview image path
+
+    def __init__(self, cache_dir=PREVIEW_CACHE_DIR, parent=None):
+        """
+        Initialize the provider.
+
+        :param cache_dir: Directory holding the rendered previews.
+        :param parent: Parent QObject.
+        """
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self._pending = set()
+        self._signals = _PreviewSignals(self)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+
+    def request(self, name, theme_file):
+        """
+        Ask for the preview of a theme. The result arrives via preview_ready;
+        nothing is read or rendered on the calling thread.
+
+        :param name: Theme name, echoed back in preview_ready.
+        :param theme_file: Path to the theme JSON file.
+        """
+        if name in self._pending:
+            return
+        self._pending.add(name)
+        QThreadPool.globalInstance().start(_PreviewTask(name, theme_file, self.cache_dir, self._signals))
+
+    def _on_finished(self, name, preview_file):
+        self._pending.discard(name)
+        self.preview_ready.emit(name, preview_file)
+
+    def _on_failed(self, name, error):
+        self._pending.discard(name)
+        logging.warning(f"Failed to render preview for theme {name}: {error}")
+
+
+_provider = None
+
+
+def get_provider():
+    """
+    Return the shared preview provider, creating it on first use.
+    Requires a QApplication.
+
+    :return: The ThemePreviewProvider.
+    """
+    global _provider
+    if _provider is None:
+        _provider = ThemePreviewProvider()
+        # Let running renders finish before Qt objects are torn down at exit
+        atexit.register(QThreadPool.globalInstance().waitForDone, 2000)
+    return _provider
@@ -1,8 +1,15 @@
 import logging
 from PyQt6.QtWidgets import QToolBar, QMenu
-from PyQt6.QtGui import QIcon, QAction
 from PyQt6.QtCore import Qt
-from modules.status_bar import update_status_bar
+from modules import actions
+
+# Action ids shown on the toolbar in display order (None is a separator)
+TOOLBAR_LAYOUT = [
+    'file.new', 'file.open', 'file.save', None,
+    'edit.undo', 'edit.redo', None,
+    'edit.cut', 'edit.copy', 'edit.paste', None,
+    'file.exit',
+]
 
 def create_toolbar(window):
     """
@@ -14,62 +21,27 @@ def create_toolbar(window):
         toolbar = QToolBar("Main Toolbar")
         window.addToolBar(toolbar)
 
-        # File actions
-        new_action = QAction(QIcon('resources/icons/new.png'), 'New', window)
-        open_action = QAction(QIcon('resources/icons/open.png'), 'Open', window)
-        save_action = QAction(QIcon('resources/icons/save.png'), 'Save', window)
-        
-        toolbar.addAction(new_action)
-        toolbar.addAction(open_action)
-        toolbar.addAction(save_action)
-        toolbar.addSeparator()
-        
-        # Edit actions
-        undo_action = QAction(QIcon('resources/icons/undo.png'), 'Undo', window)
-        redo_action = QAction(QIcon('resources/icons/redo.png'), 'Redo', window)
-        cut_action = QAction(QIcon('resources/icons/cut.png'), 'Cut', window)
-        copy_action = QAction(QIcon('resources/icons/copy.png'), 'Copy', window)
-        paste_action = QAction(QIcon('resources/icons/paste.png'), 'Paste', window)
-        
-        toolbar.addAction(undo_action)
-        toolbar.addAction(redo_action)
-        toolbar.addSeparator()
-        toolbar.addAction(cut_action)
-        toolbar.addAction(copy_action)
-        toolbar.addAction(paste_action)
-        toolbar.addSeparator()
-        
-        # Exit action
-        exit_action = QAction(QIcon('resources/icons/exit.png'), 'Exit', window)
-        exit_action.triggered.connect(window.close)
-        toolbar.addAction(exit_action)
-        
+        # The toolbar shows the same QActions as the menu bar
+        registry = actions.get_registry(window)
+        registry.populate(toolbar, TOOLBAR_LAYOUT)
+
         logging.info("Toolbar created successfully")
 
         # Group actions for visibility toggling
-        file_actions = [new_action, open_action, save_action]
-        edit_actions = [undo_action, redo_action, cut_action, copy_action, paste_action]
+        file_actions = registry.group('file')
+        edit_actions = registry.group('edit')
 
         # Add right-click context menu to toggle File/Edit actions visibility
         toolbar.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         toolbar.customContextMenuRequested.connect(lambda pos: show_toolbar_context_menu(toolbar, pos, file_actions, edit_actions))
 
-        # Connect actions to status bar updates
-        new_action.triggered.connect(lambda: update_status_bar(window.statusBar(), "New file created"))
-        open_action.triggered.connect(lambda: update_status_bar(window.statusBar(), "File opened"))
-        save_action.triggered.connect(lambda: update_status_bar(window.statusBar(), "File saved"))
-        undo_action.triggered.connect(lambda: update_status_bar(window.statusBar(), "Undo action"))
-        redo_action.triggered.connect(lambda: update_status_bar(window.statusBar(), "Redo action"))
-        cut_action.triggered.connect(lambda: update_status_bar(window.statusBar(), "Cut action"))
-        copy_action.triggered.connect(lambda: update_status_bar(window.statusBar(), "Copy action"))
-        paste_action.triggered.connect(lambda: update_status_bar(window.statusBar(), "Paste action"))
-        
     except Exception as e:
         logging.error(f"Failed to create toolbar: {e}")
 
 def show_toolbar_context_menu(toolbar, pos, file_actions, edit_actions):
     """
     Display a context menu for toggling the visibility of File and Edit actions on the toolbar, and an option to reset the toolbar to its default state.
+    Only the toolbar buttons are hidden; the shared actions stay visible in the menu bar.
 
     :param toolbar: The toolbar widget.
     :param pos: The position where the right-click occurred.
@@ -81,42 +53,61 @@ def show_toolbar_context_menu(toolbar, pos, file_actions, edit_actions):
     # Toggle File actions visibility
     file_action_toggle = menu.addAction("Show File Actions")
     file_action_toggle.setCheckable(True)
-    file_action_toggle.setChecked(all(action.isVisible() for action in file_actions))
-    file_action_toggle.triggered.connect(lambda: toggle_action_visibility(file_actions))
+    file_action_toggle.setChecked(all_buttons_visible(toolbar, file_actions))
+    file_action_toggle.triggered.connect(lambda: toggle_action_visibility(toolbar, file_actions))
 
     # Toggle Edit actions visibility
     edit_action_toggle = menu.addAction("Show Edit Actions")
     edit_action_toggle.setCheckable(True)
-    edit_action_toggle.setChecked(all(action.isVisible() for action in edit_actions))
-    edit_action_toggle.triggered.connect(lambda: toggle_action_visibility(edit_actions))
+    edit_action_toggle.setChecked(all_buttons_visible(toolbar, edit_actions))
+    edit_action_toggle.triggered.connect(lambda: toggle_action_visibility(toolbar, edit_actions))
 
     # Reset toolbar action
     reset_action = menu.addAction("Reset Toolbar")
-    reset_action.triggered.connect(lambda: reset_toolbar(file_actions, edit_actions))
+    reset_action.triggered.connect(lambda: reset_toolbar(toolbar, file_actions, edit_actions))
 
     # Show the context menu at the clicked position
     menu.exec(toolbar.mapToGlobal(pos))
 
-def toggle_action_visibility(actions):
+def toolbar_buttons(toolbar, actions):
+    """
+    Return the toolbar widgets showing the given actions, skipping actions that are not on the toolbar.
+
+    :param toolbar: The toolbar widget.
+    :param actions: A list of QAction objects.
+    """
+    widgets = (toolbar.widgetForAction(action) for action in actions)
+    return [widget for widget in widgets if widget is not None]
+
+def all_buttons_visible(toolbar, actions):
     """
-    Toggle the visibility of a list of actions.
+    Check whether every toolbar button of the given actions is shown.
 
+    :param toolbar: The toolbar widget.
+    :param actions: A list of QAction objects.
+    """
+    return all(not widget.isHidden() for widget in toolbar_buttons(toolbar, actions))
+
+def toggle_action_visibility(toolbar, actions):
+    """
+    Toggle the visibility of the toolbar buttons of a list of actions.
+    The actions themselves are left untouched, so the menus still show them.
+
+    :param toolbar: The toolbar widget.
     :param actions: A list of QAction objects to toggle visibility.
     """
-    if all(action.isVisible() for action in actions):
-        for action in actions:
-            action.setVisible(False)
-    else:
-        for action in actions:
-            action.setVisible(True)
-
-def reset_toolbar(file_actions, edit_actions):
+    visible = not all_buttons_visible(toolbar, actions)
+    for widget in toolbar_buttons(toolbar, actions):
+        widget.setVisible(visible)
+
+def reset_toolbar(toolbar, file_actions, edit_actions):
     """
-    Reset the toolbar by making all actions visible.
+    Reset the toolbar by making all action buttons visible.
 
+    :param toolbar: The toolbar widget.
     :param file_actions: The list of file-related actions.
     :param edit_actions: The list of edit-related actions.
     """
-    for action in file_actions + edit_actions:
-        action.setVisible(True)
+    for widget in toolbar_buttons(toolbar, file_actions + edit_actions):
+        widget.setVisible(True)
     logging.info("Toolbar has been reset to default.")
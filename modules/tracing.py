@@ -0,0 +1,237 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Environment variable and command-line flag that turn the startup tracer on.
+# Both accept an optional output path, e.g. PYQT6IFY_TRACE=logs/trace.json
+# or --trace-startup=logs/trace.json.
+TRACE_ENV_VAR = 'PYQT6IFY_TRACE'
+TRACE_CLI_FLAG = '--trace-startup'
+DEFAULT_TRACE_FILE = 'logs/startup_trace.json'
+
+# Captured when this module is first imported so the time spent importing
+# the rest of the application can be reported as its own phase.
+PROCESS_START_NS = time.perf_counter_ns()
+
+_NULL_SPAN = nullcontext()
+
+
+class StartupTracer:
+    """
+    Records nested timing spans with perf_counter_ns and exports them as a
+    Chrome trace (loadable in chrome://tracing or https://ui.perfetto.dev)
+    together with a plain-text summary table.
+    """
+
+    def __init__(self):
+        """Initialize a disabled tracer with no recorded spans."""
+        self.enabled = False
+        self.output_file = DEFAULT_TRACE_FILE
+        self.events = []
+        self._origin_ns = PROCESS_START_NS
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def enable(self, output_file=None):
+        """
+        Enable span recording.
+
+        :param output_file: Path of the Chrome trace JSON file to write on finish.
+        """
+        self.enabled = True
+        if output_file:
+            self.output_file = output_file
+        logging.info(f"Startup tracing enabled, writing trace to {os.path.normpath(self.output_file)}")
+
+    def _stack(self):
+        """Return the span stack of the calling thread."""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def span(self, name, **args):
+        """
+        Return a context manager timing the enclosed block as a span.
+        When tracing is disabled a shared no-op context manager is returned.
+
+        :param name: Name of the phase or step.
+        :param args: Optional values attached to the span in the trace file.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, args)
+
+    @contextmanager
+    def _span(self, name, args):
+        """Record the duration of the enclosed block."""
+        stack = self._stack()
+        stack.append(name)
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end_ns = time.perf_counter_ns()
+            stack.pop()
+            self.add_span(name, start_ns, end_ns, depth=len(stack), args=args)
+
+    def add_span(self, name, start_ns, end_ns, depth=0, args=None):
+        """
+        Record a span whose start and end were measured elsewhere.
+
+        :param name: Name of the phase or step.
+        :param start_ns: Start timestamp from time.perf_counter_ns().
+        :param end_ns: End timestamp from time.perf_counter_ns().
+        :param depth: Nesting level used for the summary table.
+        :param args: Optional values attached to the span in the trace file.
+        """
+        if not self.enabled:
+            return
+        event = {
+            'name': name,
+            'ph': 'X',
+            'ts': (start_ns - self._origin_ns) / 1000.0,
+            'dur': (end_ns - start_ns) / 1000.0,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': dict(args or {}, depth=depth),
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def instant(self, name, **args):
+        """
+        Record a zero-duration marker such as 'first paint'.
+
+        :param name: Name of the marker.
+        :param args: Optional values attached to the marker.
+        """
+        if not self.enabled:
+            return
+        event = {
+            'name': name,
+            'ph': 'i',
+            's': 'p',
+            'ts': (time.perf_counter_ns() - self._origin_ns) / 1000.0,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': args,
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def summary_table(self):
+        """
+        Build a summary table of all recorded spans in start order,
+        indented by nesting level.
+
+        :return: The table as a string.
+        """
+        spans = sorted((e for e in self.events if e['ph'] == 'X'), key=lambda e: (e['ts'], -e['dur']))
+        total_us = max((e['ts'] + e['dur'] for e in spans), default=0.0)
+        lines = [f"{'Phase':<48} {'Start ms':>10} {'Duration ms':>12} {'% total':>8}", '-' * 81]
+        for event in spans:
+            label = '  ' * event['args'].get('depth', 0) + event['name']
+            share = (event['dur'] / total_us * 100) if total_us else 0.0
+            lines.append(f"{label:<48} {event['ts'] / 1000:>10.2f} {event['dur'] / 1000:>12.2f} {share:>7.1f}%")
+        for event in (e for e in self.events if e['ph'] == 'i'):
+            lines.append(f"{'@ ' + event['name']:<48} {event['ts'] / 1000:>10.2f}")
+        lines.append('-' * 81)
+        lines.append(f"{'Total':<48} {'':>10} {total_us / 1000:>12.2f}")
+        return '\n'.join(lines)
+
+    def write_chrome_trace(self, path=None):
+        """
+        Write the recorded spans in Chrome trace event format.
+
+        :param path: Output path, defaults to the configured output file.
+        :return: The path that was written.
+        """
+        path = os.path.normpath(path or self.output_file)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            events = list(self.events)
+        with open(path, 'w') as trace_file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, trace_file)
+        return path
+
+    def finish(self):
+        """
+        Write the Chrome trace and the summary table, then stop recording.
+        Safe to call when tracing is disabled or already finished.
+        """
+        if not self.enabled:
+            return
+        try:
+            trace_path = self.write_chrome_trace()
+            table = self.summary_table()
+            summary_path = os.path.splitext(trace_path)[0] + '.txt'
+            with open(summary_path, 'w') as summary_file:
+                summary_file.write(table + '\n')
+            logging.info(f"Startup trace written to {trace_path}\n{table}")
+        except OSError as e:
+            logging.error(f"Failed to write startup trace: {e}")
+        finally:
+            self.enabled = False
+
+
+tracer = StartupTracer()
+
+
+def enable_from_environment(argv):
+    """
+    Enable the tracer if the command-line flag or environment variable is set.
+    The flag is removed from argv so it is not passed on to QApplication.
+
+    :param argv: The argument list (usually sys.argv), modified in place.
+    :return: True if tracing was enabled.
+    """
+    output_file = None
+    requested = False
+
+    for arg in list(argv):
+        if arg == TRACE_CLI_FLAG or arg.startswith(TRACE_CLI_FLAG + '='):
+            requested = True
+            output_file = arg.partition('=')[2] or output_file
+            argv.remove(arg)
+
+    env_value = os.environ.get(TRACE_ENV_VAR, '')
+    if env_value and env_value.lower() not in ('0', 'false', 'no'):
+        requested = True
+        if not output_file and env_value.lower() not in ('1', 'true', 'yes'):
+            output_file = env_value
+
+    if requested:
+        tracer.enable(output_file)
+        tracer.add_span('imports', PROCESS_START_NS, time.perf_counter_ns())
+    return requested
+
+
+def span(name, **args):
+    """
+    Time the enclosed block as a span on the global tracer.
+
+    :param name: Name of the phase or step.
+    :param args: Optional values attached to the span.
+    """
+    return tracer.span(name, **args)
+
+
+def instant(name, **args):
+    """
+    Record a marker on the global tracer.
+
+    :param name: Name of the marker.
+    :param args: Optional values attached to the marker.
+    """
+    tracer.instant(name, **args)
+
+
+def finish():
+    """Write the trace files for the global tracer and stop recording."""
+    tracer.finish()
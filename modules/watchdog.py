@@ -0,0 +1,161 @@
+import bisect
+import sys
+import threading
+import time
+import traceback
+from PyQt6.QtCore import QObject, QTimer
+from modules import error_handling, tracing
+
+DEFAULT_HEARTBEAT_MS = 50
+DEFAULT_THRESHOLD_MS = 250
+
+# Upper bounds in ms of the stall duration histogram buckets; a last bucket holds longer stalls
+HISTOGRAM_BUCKETS_MS = (250, 500, 1000, 2500, 5000, 10000)
+
+
+class StallWatchdog(QObject):
+    """
+    Detects stalls of the GUI thread's event loop.
+
+    A timer on the GUI thread records a heartbeat every heartbeat_ms. A
+    background thread checks the heartbeat; when it is more than
+    threshold_ms late, the GUI thread's Python stack is captured with
+    sys._current_frames() and logged through error_handling.log_stall,
+    once per stall. When the heartbeat resumes, the stall's duration is
+    logged, counted in a histogram and added to the startup trace.
+
+    Code that blocks in C without releasing the GIL also blocks the
+    watchdog thread; such stalls are still measured when they end.
+    """
+
+    def __init__(self, threshold_ms=DEFAULT_THRESHOLD_MS, heartbeat_ms=DEFAULT_HEARTBEAT_MS, parent=None):
+        """
+        Initialize the watchdog; it must be created on the GUI thread.
+
+        :param threshold_ms: Heartbeat delay treated as a stall.
+        :param heartbeat_ms: Interval of the GUI thread heartbeat.
+        :param parent: Parent QObject.
+        """
+        super().__init__(parent)
+        self.threshold_ms = threshold_ms
+        self.heartbeat_ms = heartbeat_ms
+        self.stall_count = 0
+        self.total_stall_ms = 0.0
+        self.max_stall_ms = 0.0
+        self.histogram = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+
+        self._gui_thread_id = threading.get_ident()
+        self._lock = threading.Lock()
+        self._last_beat_ns = time.perf_counter_ns()
+        self._reported_beat_ns = None  # Heartbeat after which the current stall's stack was logged
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._beat)
+
+    def start(self):
+        """Start the heartbeat and the watchdog thread."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            self._last_beat_ns = time.perf_counter_ns()
+        self._timer.start(self.heartbeat_ms)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._watch, name='stall-watchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the heartbeat and the watchdog thread."""
+        self._timer.stop()
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _beat(self):
+        """Record a heartbeat, and the stall that just ended if the previous one was late."""
+        now_ns = time.perf_counter_ns()
+        with self._lock:
+            last_ns, self._last_beat_ns = self._last_beat_ns, now_ns
+            stack_logged = self._reported_beat_ns == last_ns
+        stall_ms = (now_ns - last_ns) / 1e6 - self.heartbeat_ms
+        if stall_ms >= self.threshold_ms:
+            self._record_stall(stall_ms, now_ns, stack_logged)
+
+    def _record_stall(self, stall_ms, end_ns, stack_logged):
+        """Count a finished stall and report its duration."""
+        self.stall_count += 1
+        self.total_stall_ms += stall_ms
+        self.max_stall_ms = max(self.max_stall_ms, stall_ms)
+        self.histogram[bisect.bisect_left(HISTOGRAM_BUCKETS_MS, stall_ms)] += 1
+        tracing.tracer.add_span('gui.stall', end_ns - int(stall_ms * 1e6), end_ns, args={'duration_ms': stall_ms})
+        if stack_logged:
+            error_handling.log_info("GUI thread recovered after a %.0f ms stall", stall_ms,
+                                    duration_ms=round(stall_ms, 1))
+        else:
+            error_handling.log_stall(stall_ms)
+
+    def _watch(self):
+        """Watchdog thread: log the GUI thread's stack when the heartbeat is late."""
+        interval_s = min(self.heartbeat_ms, self.threshold_ms) / 2000.0
+        while not self._stop_event.wait(interval_s):
+            with self._lock:
+                last_ns = self._last_beat_ns
+                if self._reported_beat_ns == last_ns:
+                    continue  # Already reported this stall
+            late_ms = (time.perf_counter_ns() - last_ns) / 1e6 - self.heartbeat_ms
+            if late_ms < self.threshold_ms:
+                continue
+            frame = sys._current_frames().get(self._gui_thread_id)
+            stack = traceback.format_stack(frame) if frame is not None else None
+            with self._lock:
+                self._reported_beat_ns = last_ns
+            error_handling.log_stall(late_ms, stack)
+
+    def stats(self):
+        """
+        Return the stall statistics.
+
+        :return: A dict with the stall count, total and maximum duration in ms,
+                 and a histogram of durations keyed by bucket label.
+        """
+        labels = [f'<={bound}ms' for bound in HISTOGRAM_BUCKETS_MS] + [f'>{HISTOGRAM_BUCKETS_MS[-1]}ms']
+        return {
+            'stalls': self.stall_count,
+            'total_stall_ms': round(self.total_stall_ms, 1),
+            'max_stall_ms': round(self.max_stall_ms, 1),
+            'histogram': dict(zip(labels, self.histogram)),
+        }
+
+
+watchdog = None
+
+
+def start_watchdog(threshold_ms=DEFAULT_THRESHOLD_MS, heartbeat_ms=DEFAULT_HEARTBEAT_MS):
+    """
+    Start the process-wide stall watchdog (from the GUI thread).
+
+    :param threshold_ms: Heartbeat delay treated as a stall.
+    :param heartbeat_ms: Interval of the GUI thread heartbeat.
+    :return: The running StallWatchdog.
+    """
+    global watchdog
+    if watchdog is None:
+        watchdog = StallWatchdog(threshold_ms, heartbeat_ms)
+        watchdog.start()
+        error_handling.log_info(f"Stall watchdog started (threshold {threshold_ms} ms)")
+    return watchdog
+
+
+def stop_watchdog():
+    """Stop the process-wide stall watchdog if it is running."""
+    global watchdog
+    if watchdog is not None:
+        watchdog.stop()
+        watchdog = None
+
+
+def stats():
+    """Return the statistics of the process-wide watchdog, or None if it is not running."""
+    return watchdog.stats() if watchdog is not None else None
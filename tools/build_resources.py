@@ -0,0 +1,33 @@
+"""
+Pack the icons and theme files into a single memory-mapped resource bundle.
+
+The application reads resources from the bundle when it exists and falls back
+to the files in resources/ otherwise (see modules/resources.py). Rebuild the
+bundle after changing icons or themes; delete it to develop against the files.
+
+Usage:
+    python tools/build_resources.py [--output resources/resources.pak]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules import resources  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the packed resource bundle.")
+    parser.add_argument('--output', default=resources.DEFAULT_BUNDLE_FILE, help="Bundle file to write")
+    args = parser.parse_args(argv)
+
+    count = resources.build_bundle(args.output)
+    size_kb = os.path.getsize(args.output) / 1024
+    print(f"Packed {count} files from {', '.join(resources.BUNDLE_DIRECTORIES)} "
+          f"into {os.path.relpath(args.output)} ({size_kb:.1f} KB)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
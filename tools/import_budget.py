@@ -0,0 +1,112 @@
+"""
+Import-time budget check for application startup.
+
+Runs ``python -X importtime -c "import main"`` in a fresh interpreter, prints a
+report of the slowest imports and exits with a non-zero status when the total
+import time exceeds the budget or when a module that should be lazily loaded
+is imported at startup.
+
+Usage:
+    python tools/import_budget.py --budget-ms 400 --top 15
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules that must only be imported on demand (see modules/lazy_loader.py)
+FORBIDDEN_AT_STARTUP = ['PIL', 'config.settings_dialog', 'modules.about', 'modules.command_palette', 'modules.database',
+                        'modules.performance_hud', 'modules.log_viewer', 'sqlite3', 'zstandard']
+
+DEFAULT_BUDGET_MS = 400.0
+
+
+def measure_imports(entry_module='main'):
+    """
+    Import the entry module in a subprocess with -X importtime.
+
+    :param entry_module: Module whose import represents application startup.
+    :return: A list of (module_name, self_us, cumulative_us, depth) tuples.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {entry_module}'],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen')),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {entry_module} failed:\n{result.stderr}")
+
+    records = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        records.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return records
+
+
+def build_report(records, top=15):
+    """
+    Format the slowest top-level and overall imports as a table.
+
+    :param records: Records returned by measure_imports().
+    :param top: Number of rows to show.
+    :return: The report as a string.
+    """
+    total_us = sum(self_us for _, self_us, _, _ in records)
+    slowest = sorted(records, key=lambda r: r[2], reverse=True)[:top]
+    lines = [f"{'Module':<48} {'Self ms':>9} {'Cumulative ms':>14}", '-' * 73]
+    for name, self_us, cumulative_us, _ in slowest:
+        lines.append(f"{name:<48} {self_us / 1000:>9.2f} {cumulative_us / 1000:>14.2f}")
+    lines.append('-' * 73)
+    lines.append(f"{'Total (' + str(len(records)) + ' modules)':<48} {total_us / 1000:>9.2f}")
+    return '\n'.join(lines)
+
+
+def check_budget(records, budget_ms, forbidden=FORBIDDEN_AT_STARTUP):
+    """
+    Check the measured imports against the budget and the lazy-load list.
+
+    :param records: Records returned by measure_imports().
+    :param budget_ms: Maximum allowed total import time in milliseconds.
+    :param forbidden: Module prefixes that must not be imported at startup.
+    :return: A list of human-readable violations (empty when within budget).
+    """
+    violations = []
+    total_ms = sum(self_us for _, self_us, _, _ in records) / 1000
+    if total_ms > budget_ms:
+        violations.append(f"Total import time {total_ms:.1f} ms exceeds budget of {budget_ms:.1f} ms")
+
+    imported = {name for name, _, _, _ in records}
+    for prefix in forbidden:
+        if any(name == prefix or name.startswith(prefix + '.') for name in imported):
+            violations.append(f"{prefix} is imported at startup but should be loaded lazily")
+    return violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check application import time against a budget.")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"Maximum total import time in ms (default: {DEFAULT_BUDGET_MS:.0f})")
+    parser.add_argument('--top', type=int, default=15, help="Number of slowest imports to list")
+    parser.add_argument('--module', default='main', help="Entry module to import (default: main)")
+    args = parser.parse_args(argv)
+
+    records = measure_imports(args.module)
+    print(build_report(records, top=args.top))
+
+    violations = check_budget(records, args.budget_ms)
+    for violation in violations:
+        print(f"FAIL: {violation}")
+    if not violations:
+        print(f"OK: imports within {args.budget_ms:.0f} ms budget")
+    return 1 if violations else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())